@@ -24,8 +24,8 @@ mkdir -p "$PROJECT_ROOT/.cursor/skills"
 
 # Determine which modules to install
 if [ "$1" == "--all" ] || [ $# -eq 0 ]; then
-    # Install all modules
-    MODULES=$(find "$MODULES_DIR" -maxdepth 1 -type d ! -name "modules" ! -name ".template" -exec basename {} \;)
+    # Install all modules (the MCP host is opt-in: it replaces the git and autotask servers)
+    MODULES=$(find "$MODULES_DIR" -maxdepth 1 -type d ! -name "modules" ! -name ".template" ! -name "host" -exec basename {} \;)
     echo "📦 Installing all modules: $MODULES"
 else
     MODULES="$@"
@@ -0,0 +1,120 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+CacheKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def cache_key(path: str, params: Optional[Dict[str, Any]] = None) -> CacheKey:
+    """Build the cache key for a GET request"""
+    return path, tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
+
+
+def resource_of(path: str) -> str:
+    """Map an API path to the resource name used for TTLs and invalidation"""
+    parts = path.strip("/").split("/")
+    # /api/<collection>[/<id>[/<sub>]]
+    collection = parts[1] if len(parts) > 1 else ""
+    if len(parts) >= 4:
+        return parts[3]
+    if collection == "tasks":
+        return "task"
+    if collection == "projects":
+        return "project"
+    if collection == "sprints":
+        return "sprint"
+    return collection
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """LRU cache of GET responses with per-resource TTLs.
+
+    Entries past their TTL are kept (while there is room) so they can be
+    revalidated with ``If-None-Match``/``If-Modified-Since``; a 304 answer
+    refreshes the entry without transferring the body again. Cached values
+    are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, ttls: Dict[str, float], max_entries: int = 512):
+        self.ttls = ttls
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.invalidations = 0
+
+    def ttl_for(self, path: str) -> float:
+        return self.ttls.get(resource_of(path), 0.0)
+
+    def enabled_for(self, path: str) -> bool:
+        return self.max_entries > 0 and self.ttl_for(path) > 0
+
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: CacheKey, value: Any, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        self._entries[key] = CacheEntry(
+            value=value,
+            expires_at=time.monotonic() + self.ttl_for(key[0]),
+            etag=etag,
+            last_modified=last_modified,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def refresh(self, key: CacheKey) -> None:
+        """Extend an entry's lifetime after a 304 Not Modified"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.expires_at = time.monotonic() + self.ttl_for(key[0])
+
+    def invalidate(self, paths: Iterable[str] = (), prefixes: Iterable[str] = ()) -> None:
+        """Drop entries for exact ``paths`` (any params) and for paths starting with ``prefixes``"""
+        paths = set(paths)
+        prefixes = tuple(prefixes)
+        for key in [k for k in self._entries if k[0] in paths or (prefixes and k[0].startswith(prefixes))]:
+            del self._entries[key]
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+        }
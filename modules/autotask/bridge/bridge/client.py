@@ -1,38 +1,432 @@
+import asyncio
 import httpx
+import importlib.util
 import os
-from typing import Dict, Any, Optional
+import sys
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, Iterable, List, Optional
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
+from bridge.cache import ResponseCache, cache_key
+from bridge.flight import SingleFlight
+from bridge.graph import TaskGraph
+from bridge.mirror import TaskMirror
+from bridge.outbox import Outbox, OutboxEntry
+from bridge.transport import CircuitBreaker, ResilientTransport
+from bridge.paging import HighWaterMark, decode_cursor, encode_cursor, fingerprint
+from bridge.rollup import DONE_STATUSES, summarize_tasks
+from bridge.search import SearchIndex
 
 load_dotenv()
 
+# Related data get_task_with_context can add to a task
+CONTEXT_PARTS = ("notes", "project", "sprint", "dependencies")
+
 class Settings(BaseSettings):
     fastapi_url: str = os.getenv("FASTAPI_URL", "http://localhost:8000")
     api_key: Optional[str] = os.getenv("API_KEY", None)
+    # HTTP transport: connection pool, timeouts (seconds), retries and circuit breaker
+    http_max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    http_max_keepalive: int = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+    http_keepalive_expiry: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    http2: bool = os.getenv("HTTP2", "off").lower() in ("1", "on", "true", "yes")
+    http_connect_timeout: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    http_read_timeout: float = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+    http_retries: int = int(os.getenv("HTTP_RETRIES", "3"))
+    http_retry_backoff: float = float(os.getenv("HTTP_RETRY_BACKOFF", "0.2"))
+    circuit_breaker_threshold: int = int(os.getenv("CIRCUIT_BREAKER_THRESHOLD", "5"))
+    circuit_breaker_reset: float = float(os.getenv("CIRCUIT_BREAKER_RESET", "30"))
+    # Response cache: seconds a cached GET is served without asking the API (0 disables)
+    cache_ttl_task: float = float(os.getenv("CACHE_TTL_TASK", "10"))
+    cache_ttl_notes: float = float(os.getenv("CACHE_TTL_NOTES", "10"))
+    cache_ttl_project: float = float(os.getenv("CACHE_TTL_PROJECT", "300"))
+    cache_ttl_sprint: float = float(os.getenv("CACHE_TTL_SPRINT", "60"))
+    cache_max_entries: int = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+    # Concurrent identical GETs share one request
+    coalesce_reads: bool = os.getenv("COALESCE_READS", "on").lower() not in ("0", "off", "false", "no")
+    # Bulk operations: concurrent requests when fanning out, and whether to try batch endpoints
+    bulk_concurrency: int = int(os.getenv("BULK_CONCURRENCY", "8"))
+    batch_endpoints: bool = os.getenv("BATCH_ENDPOINTS", "auto").lower() not in ("0", "off", "false", "no")
+    # Local SQLite mirror (disabled unless a path is set); reads sync first when older than the bound
+    mirror_db: Optional[str] = os.getenv("MIRROR_DB") or None
+    mirror_max_staleness: float = float(os.getenv("MIRROR_MAX_STALENESS", "30"))
+    mirror_full_sync: float = float(os.getenv("MIRROR_FULL_SYNC", "900"))
+    # Write outbox: queue and coalesce task updates/notes, flushed after the window (0: only on flush)
+    outbox_enabled: bool = os.getenv("OUTBOX", "off").lower() in ("1", "on", "true", "yes")
+    outbox_window: float = float(os.getenv("OUTBOX_WINDOW", "0.5"))
+    outbox_path: str = os.getenv("OUTBOX_PATH", "~/.cache/autotask-bridge/outbox.jsonl")
+    # Sprint board / project summary: days without activity before an open task counts as stale
+    stale_after_days: float = float(os.getenv("STALE_AFTER_DAYS", "7"))
+    # Dependency graph: seconds between polls for tasks changed elsewhere, and between full rebuilds
+    graph_max_staleness: float = float(os.getenv("GRAPH_MAX_STALENESS", "60"))
+    graph_full_rebuild: float = float(os.getenv("GRAPH_FULL_REBUILD", "900"))
+    # Full-text search index (empty SEARCH_DB disables it); synced before a search when older than the bound
+    search_db: Optional[str] = os.getenv("SEARCH_DB", "~/.cache/autotask-bridge/search.db") or None
+    search_max_staleness: float = float(os.getenv("SEARCH_MAX_STALENESS", "30"))
+    search_full_sync: float = float(os.getenv("SEARCH_FULL_SYNC", "3600"))
+    search_notes: bool = os.getenv("SEARCH_NOTES", "on").lower() not in ("0", "off", "false", "no")
     
     class Config:
         env_file = ".env"
 
 settings = Settings()
 
+def build_transport(transport: Optional[httpx.AsyncBaseTransport] = None) -> ResilientTransport:
+    """The pooled (optionally HTTP/2) transport wrapped with retries and a circuit breaker"""
+    if isinstance(transport, ResilientTransport):
+        return transport
+    if transport is None:
+        http2 = settings.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            print("HTTP2 is on but the 'h2' package is not installed; using HTTP/1.1", file=sys.stderr)
+            http2 = False
+        transport = httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            ),
+        )
+    return ResilientTransport(
+        transport,
+        retries=settings.http_retries,
+        backoff=settings.http_retry_backoff,
+        breaker=CircuitBreaker(settings.circuit_breaker_threshold, settings.circuit_breaker_reset),
+    )
+
 class FastAPIClient:
     """HTTP client for communicating with FastAPI"""
     
-    def __init__(self, base_url: str = None, api_key: str = None):
+    def __init__(self, base_url: str = None, api_key: str = None, cache: Optional[ResponseCache] = None,
+                 mirror: Optional[TaskMirror] = None, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.base_url = base_url or settings.fastapi_url
         self.api_key = api_key or settings.api_key
+        self.transport = build_transport(transport)
         self.client = httpx.AsyncClient(
             base_url=self.base_url,
-            timeout=30.0,
+            timeout=httpx.Timeout(settings.http_read_timeout, connect=settings.http_connect_timeout),
+            transport=self.transport,
             headers={"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
         )
+        self.cache = cache or ResponseCache(
+            ttls={
+                "task": settings.cache_ttl_task,
+                "notes": settings.cache_ttl_notes,
+                "project": settings.cache_ttl_project,
+                "sprint": settings.cache_ttl_sprint,
+            },
+            max_entries=settings.cache_max_entries,
+        )
+        self.flights = SingleFlight(enabled=settings.coalesce_reads)
+        # Bumped per path by every invalidation, so a read that was in flight
+        # during a write does not put its (possibly older) response in the cache
+        self._generations: Dict[str, int] = {}
+        # Batch endpoints the API turned out not to have (404/405), so they are not retried
+        self._missing_batch: set[str] = set()
+        # Whether the API honours limit/offset on /api/tasks (None until a page tells)
+        self._server_pages: Optional[bool] = None
+        # "Changes since" high-water marks, per filter set
+        self._marks: Dict[str, HighWaterMark] = {}
+        self.mirror = mirror if mirror is not None else (TaskMirror(settings.mirror_db) if settings.mirror_db else None)
+        self._mirror_lock = asyncio.Lock()
+        # Built on the first dependency query
+        self.graph: Optional[TaskGraph] = None
+        self._graph_lock = asyncio.Lock()
+        # Opened on the first search
+        self.search_index: Optional[SearchIndex] = None
+        self._search_lock = asyncio.Lock()
+        self.outbox = Outbox(
+            settings.outbox_path, settings.outbox_window, self._send_queued, settings.bulk_concurrency
+        ) if settings.outbox_enabled else None
+
+    async def _get(self, path: str, params: Optional[Dict[str, str]] = None, use_cache: bool = True) -> Any:
+        """GET a resource, serving it from the cache while fresh and revalidating it when stale.
+
+        Identical GETs that are already in flight are joined rather than sent again.
+        """
+        key = cache_key(path, params)
+        if not use_cache or not self.cache.enabled_for(path):
+            return await self.flights.do(("GET", *key), lambda: self._fetch(path, params))
+
+        entry = self.cache.get(key)
+        if entry is not None and entry.fresh:
+            self.cache.hits += 1
+            return entry.value
+        return await self.flights.do(("GET", *key), lambda: self._fetch(path, params, cached=True))
+
+    async def _fetch(self, path: str, params: Optional[Dict[str, str]], cached: bool = False) -> Any:
+        """Send the GET; with ``cached``, revalidate the cache entry and store the response"""
+        if not cached:
+            response = await self.client.get(path, params=params)
+            response.raise_for_status()
+            return response.json()
+
+        key = cache_key(path, params)
+        generation = self._generations.get(path, 0)
+        entry = self.cache.get(key)
+        headers = entry.validators() if entry is not None else {}
+        response = await self.client.get(path, params=params, headers=headers)
+        current = self._generations.get(path, 0) == generation
+        if response.status_code == 304 and entry is not None:
+            if not current:
+                # The entry was dropped by a write while this request was out;
+                # the 304 may predate the write, so ask again without validators
+                return await self._fetch(path, params, cached=True)
+            self.cache.revalidated += 1
+            self.cache.refresh(key)
+            return entry.value
+        response.raise_for_status()
+        self.cache.misses += 1
+        value = response.json()
+        if current:
+            self.cache.put(
+                key,
+                value,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+            )
+        return value
+
+    def _invalidate(self, paths: List[str]) -> None:
+        """Drop cached responses for ``paths`` and stop sharing reads of them already in flight"""
+        for path in paths:
+            self._generations[path] = self._generations.get(path, 0) + 1
+        self.cache.invalidate(paths=paths)
+        self.flights.forget(paths=paths)
+
+    def _invalidate_task(self, task_id: Optional[str] = None) -> None:
+        """Forget cached task lists and, if given, the task and its notes"""
+        paths = ["/api/tasks"]
+        if task_id:
+            paths += [f"/api/tasks/{task_id}", f"/api/tasks/{task_id}/notes"]
+        self._invalidate(paths)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the response cache"""
+        return self.cache.stats()
+
+    def coalesce_stats(self) -> Dict[str, Any]:
+        """How many GETs joined an identical request already in flight"""
+        return self.flights.stats()
+
+    def transport_stats(self) -> Dict[str, Any]:
+        """Retry count and circuit breaker state"""
+        breaker = self.transport.breaker
+        return {
+            "retried": self.transport.retried,
+            "circuit": breaker.state,
+            "consecutive_failures": breaker.failures,
+            "rejected": breaker.rejected,
+        }
+
+    async def health(self) -> bool:
+        """True if the API answers its health check"""
+        try:
+            response = await self.client.get("/api/health")
+        except httpx.TransportError:
+            return False
+        return response.is_success
+
+    async def sync_mirror(self, full: bool = False, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Bring the local mirror up to date with the API.
+
+        Tasks are fetched with ``updated_after`` set to the newest
+        ``updated_at`` already mirrored; every ``mirror_full_sync`` seconds
+        (or with ``full``) the whole listing is fetched instead so tasks
+        deleted elsewhere disappear. Projects and sprints have no date
+        filters and are re-listed. Notes are mirrored per task on first read
+        and dropped when the task changes. With ``max_age``, nothing is done
+        if the mirror was synced more recently than that.
+        """
+        if self.mirror is None:
+            raise RuntimeError("Local mirror is disabled; set MIRROR_DB to enable it")
+        async with self._mirror_lock:
+            if max_age is not None and self.mirror.age("tasks") <= max_age:
+                return self.mirror.stats()
+            started = time.time()
+            state = self.mirror.state("tasks")
+            full = (
+                full
+                or not state["high_water"]
+                or not state["full_sync_at"]
+                or started - state["full_sync_at"] > settings.mirror_full_sync
+            )
+            since = None if full else state["high_water"]
+
+            async def fetch_tasks() -> List[Dict[str, Any]]:
+                return [t async for t in self.iter_tasks(page_size=500, fresh=True, updated_after=since)]
+
+            tasks, projects, sprints = await asyncio.gather(
+                fetch_tasks(),
+                self._get("/api/projects", use_cache=False),
+                self._get("/api/sprints", use_cache=False),
+            )
+            stamps = [t.get("updated_at") for t in tasks if t.get("updated_at")]
+            if not full and since:
+                stamps.append(since)
+            self.mirror.apply_tasks(tasks, max(stamps) if stamps else None, started, full=full)
+            self.mirror.replace_projects(projects, started)
+            self.mirror.replace_sprints(sprints, started)
+            return {**self.mirror.stats(), "synced": len(tasks), "full": full}
+
+    async def _mirror_ready(self, resource: str = "tasks") -> bool:
+        """True if reads can be served from the mirror, syncing it first when too old"""
+        if self.mirror is None:
+            return False
+        if self.mirror.age(resource) > settings.mirror_max_staleness:
+            await self.sync_mirror(max_age=settings.mirror_max_staleness)
+        return True
+
+    def _mirror_task(self, task: Any) -> None:
+        """Record a task the API returned after a write"""
+        if not isinstance(task, dict) or "id" not in task:
+            return
+        if self.mirror is not None:
+            self.mirror.upsert_task(task)
+        if self.graph is not None:
+            self.graph.upsert(task)
+        if self.search_index is not None:
+            self.search_index.upsert_task(task)
+
+    def _record_note(self, task_id: str, note: Any) -> None:
+        """Record a note the API returned after a write"""
+        if not isinstance(note, dict):
+            return
+        if self.mirror is not None:
+            self.mirror.add_note(task_id, note)
+        if self.search_index is not None:
+            self.search_index.add_note(task_id, note)
+
+    async def _send_queued(self, entry: OutboxEntry) -> Dict[str, Any]:
+        """Send one outbox entry, reusing its idempotency key"""
+        if entry.kind == "note":
+            return await self.create_task_note(entry.task_id, idempotency_key=entry.key, **entry.data)
+        return await self.update_task(entry.task_id, idempotency_key=entry.key, **entry.data)
+
+    async def _settle(self, task_id: Optional[str] = None) -> None:
+        """Flush queued writes (for one task, or all) before a read that would see them"""
+        if self.outbox is not None and self.outbox.pending(task_id):
+            await self.outbox.flush(task_id)
+
+    def queue_task_update(self, task_id: str, **fields: Any) -> Dict[str, Any]:
+        """Queue field updates for a task in the outbox; returns the pending (merged) update"""
+        entry = self.outbox.enqueue("update", task_id, {k: v for k, v in fields.items() if v is not None})
+        return {"task_id": task_id, "queued": entry.key, "pending": entry.data}
+
+    def queue_task_note(self, task_id: str, content: str, author: Optional[str] = None) -> Dict[str, Any]:
+        """Queue a new note in the outbox"""
+        data = {"content": content}
+        if author:
+            data["author"] = author
+        entry = self.outbox.enqueue("note", task_id, data)
+        return {"task_id": task_id, "queued": entry.key}
+
+    async def flush_outbox(self, task_id: Optional[str] = None) -> Dict[str, Any]:
+        """Send queued writes now; returns per-entry outcomes and outbox counters"""
+        if self.outbox is None:
+            raise RuntimeError("Write outbox is disabled; set OUTBOX=on to enable it")
+        results = await self.outbox.flush(task_id)
+        return {"results": results, "stats": self.outbox.stats()}
+
+    def mirror_stats(self) -> Dict[str, Any]:
+        """Row counts and sync age of the local mirror"""
+        if self.mirror is None:
+            raise RuntimeError("Local mirror is disabled; set MIRROR_DB to enable it")
+        return self.mirror.stats()
     
     async def get_task(self, task_id: str) -> Dict[str, Any]:
         """Get a task by ID"""
-        response = await self.client.get(f"/api/tasks/{task_id}")
-        response.raise_for_status()
-        return response.json()
-    
+        await self._settle(task_id)
+        if await self._mirror_ready():
+            task = self.mirror.get_task(task_id)
+            if task is not None:
+                return task
+        task = await self._get(f"/api/tasks/{task_id}")
+        self._mirror_task(task)
+        return task
+
+    async def get_task_with_context(self, task_id: str,
+                                    include: Iterable[str] = ("notes", "project", "sprint")) -> Dict[str, Any]:
+        """A task plus, as asked in ``include``, its notes, project, sprint and dependencies, fetched concurrently.
+
+        Notes are fetched alongside the task; the project, sprint and
+        dependency tasks as soon as the task says which they are. Related
+        objects are trimmed to their identifying fields. A part that cannot
+        be fetched is reported under ``errors`` instead of failing the call.
+        """
+        include = set(include)
+        unknown = include - set(CONTEXT_PARTS)
+        if unknown:
+            raise ValueError(f"Unknown include values: {sorted(unknown)}; expected {list(CONTEXT_PARTS)}")
+        first = [self.get_task(task_id)]
+        if "notes" in include:
+            first.append(self.list_task_notes(task_id))
+        task, *notes = await asyncio.gather(*first, return_exceptions=True)
+        if isinstance(task, BaseException):
+            raise task
+
+        calls: Dict[str, Awaitable[Any]] = {}
+        if "project" in include and task.get("project_id"):
+            calls["project"] = self.get_project(task["project_id"])
+        if "sprint" in include and task.get("sprint_id"):
+            calls["sprint"] = self.get_sprint(task["sprint_id"])
+        depends_on = [str(d) for d in task.get("depends_on") or ()]
+        if "dependencies" in include:
+            for dep in depends_on:
+                calls[f"dependency:{dep}"] = self.get_task(dep)
+        results = dict(zip(calls, await asyncio.gather(*calls.values(), return_exceptions=True)))
+        if notes:
+            results["notes"] = notes[0]
+
+        document: Dict[str, Any] = {"task": task}
+        errors: Dict[str, str] = {}
+        trims = {"notes": ("author", "content", "created_at"), "project": ("id", "name", "description"),
+                 "sprint": ("id", "name")}
+        for part, value in results.items():
+            if isinstance(value, BaseException):
+                errors[part] = str(value).split("\n", 1)[0]
+        for part, keys in trims.items():
+            value = results.get(part)
+            if value is None or isinstance(value, BaseException):
+                continue
+            if part == "notes":
+                document[part] = [{k: n.get(k) for k in keys} for n in value]
+            else:
+                document[part] = {k: value.get(k) for k in keys}
+        if "dependencies" in include:
+            document["dependencies"] = [
+                {k: results[f"dependency:{dep}"].get(k) for k in ("id", "title", "status")}
+                for dep in depends_on if not isinstance(results[f"dependency:{dep}"], BaseException)
+            ]
+        if errors:
+            document["errors"] = errors
+        return document
+
+    @staticmethod
+    def _task_filters(
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        project_id: Optional[str] = None,
+        sprint_id: Optional[str] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        updated_after: Optional[str] = None,
+        updated_before: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """Query parameters for the given task filters, leaving out unset ones"""
+        filters = {
+            "status": status,
+            "kind": kind,
+            "project_id": project_id,
+            "sprint_id": sprint_id,
+            "created_after": created_after,
+            "created_before": created_before,
+            "updated_after": updated_after,
+            "updated_before": updated_before,
+        }
+        return {k: v for k, v in filters.items() if v}
+
     async def list_tasks(
         self,
         status: Optional[str] = None,
@@ -45,26 +439,96 @@ class FastAPIClient:
         updated_before: Optional[str] = None,
     ) -> list[Dict[str, Any]]:
         """List all tasks, optionally filtered by status, kind, project_id, sprint_id, and/or date range."""
-        params: Dict[str, str] = {}
-        if status:
-            params["status"] = status
-        if kind:
-            params["kind"] = kind
-        if project_id:
-            params["project_id"] = project_id
-        if sprint_id:
-            params["sprint_id"] = sprint_id
-        if created_after:
-            params["created_after"] = created_after
-        if created_before:
-            params["created_before"] = created_before
-        if updated_after:
-            params["updated_after"] = updated_after
-        if updated_before:
-            params["updated_before"] = updated_before
-        response = await self.client.get("/api/tasks", params=params)
-        response.raise_for_status()
-        return response.json()
+        params = self._task_filters(
+            status, kind, project_id, sprint_id, created_after, created_before, updated_after, updated_before
+        )
+        await self._settle()
+        if await self._mirror_ready():
+            return self.mirror.query_tasks(params)
+        return await self._get("/api/tasks", params=params)
+
+    async def list_tasks_page(self, limit: int = 100, cursor: Optional[str] = None,
+                              fresh: bool = False, **filters: Optional[str]) -> Dict[str, Any]:
+        """One page of tasks plus the cursor for the next page (None on the last page).
+
+        ``limit``/``offset`` are passed to the API. An API that ignores them is
+        detected (more rows than asked for on the first page, or a later page
+        starting with the first task again) and then paged locally from one
+        cached listing. With the mirror enabled pages come from SQLite.
+        ``fresh`` always asks the API, bypassing the response cache and mirror.
+        """
+        limit = max(1, limit)
+        params = self._task_filters(**filters)
+        query = fingerprint(params)
+        offset, head = decode_cursor(cursor, query) if cursor else (0, None)
+        await self._settle()
+
+        rows: Optional[list] = None
+        if not fresh and await self._mirror_ready():
+            rows = self.mirror.query_tasks(params, limit=limit + 1, offset=offset)
+        elif self._server_pages is not False:
+            rows = await self._get(
+                "/api/tasks", params={**params, "limit": limit + 1, "offset": offset}, use_cache=not fresh
+            )
+            ignored = len(rows) > limit + 1 or (
+                offset > 0 and head is not None and rows and rows[0].get("id") == head
+            )
+            if ignored:
+                self._server_pages = False
+                rows = rows[offset:offset + limit + 1]
+            elif offset > 0:
+                self._server_pages = True
+        if rows is None:
+            rows = (await self._get("/api/tasks", params=params, use_cache=not fresh))[offset:offset + limit + 1]
+
+        tasks = rows[:limit]
+        if head is None and tasks:
+            head = tasks[0].get("id")
+        next_cursor = encode_cursor(query, offset + limit, head) if len(rows) > limit else None
+        return {"tasks": tasks, "next_cursor": next_cursor, "offset": offset}
+
+    def task_cursor(self, offset: int, **filters: Optional[str]) -> str:
+        """Cursor that continues a task listing with these filters at ``offset``"""
+        return encode_cursor(fingerprint(self._task_filters(**filters)), offset)
+
+    async def iter_tasks(self, page_size: int = 100, fresh: bool = False,
+                         **filters: Optional[str]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield matching tasks one page at a time instead of loading the whole listing at once"""
+        cursor = None
+        while True:
+            page = await self.list_tasks_page(limit=page_size, cursor=cursor, fresh=fresh, **filters)
+            for task in page["tasks"]:
+                yield task
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return
+
+    async def task_changes(self, limit: int = 100, **filters: Optional[str]) -> Dict[str, Any]:
+        """Tasks changed since the previous call with the same filters (everything on the first call).
+
+        Uses ``updated_after`` with a remembered high-water mark, so polling
+        only transfers tasks that changed. At most ``limit`` changes are
+        returned, oldest first; ``more`` says whether another call would
+        return more.
+        """
+        mark = self._marks.setdefault(fingerprint(self._task_filters(**filters)), HighWaterMark())
+        since = filters.get("updated_after")
+        if mark.updated_at and (not since or mark.updated_at > since):
+            filters = {**filters, "updated_after": mark.updated_at}
+        changed = [task async for task in self.iter_tasks(fresh=True, **filters)]
+        tasks, more = mark.select(changed, max(1, limit))
+        return {"tasks": tasks, "high_water": mark.updated_at, "more": more}
+
+    def rewind_changes(self, delivered: List[Dict[str, Any]], **filters: Optional[str]) -> Optional[str]:
+        """Keep only ``delivered`` of the last ``task_changes`` result as seen, so the rest is returned again.
+
+        Returns the resulting high-water mark.
+        """
+        mark = self._marks.get(fingerprint(self._task_filters(**filters)))
+        if mark is None:
+            return None
+        mark.rewind(delivered)
+        return mark.updated_at
     
     async def create_task(
         self,
@@ -74,8 +538,9 @@ class FastAPIClient:
         status: str = "open",
         points: Optional[int] = None,
         project_id: Optional[str] = None,
+        depends_on: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
-        """Create a new task. kind: task, feature, or epic (default task). Optionally set project_id."""
+        """Create a new task. kind: task, feature, or epic (default task). Optionally set project_id and depends_on."""
         data: Dict[str, Any] = {"title": title, "status": status}
         if description:
             data["description"] = description
@@ -85,21 +550,28 @@ class FastAPIClient:
             data["points"] = points
         if project_id:
             data["project_id"] = project_id
+        if depends_on is not None:
+            data["depends_on"] = depends_on
         response = await self.client.post("/api/tasks", json=data)
         response.raise_for_status()
-        return response.json()
+        self._invalidate_task()
+        task = response.json()
+        self._mirror_task(task)
+        return task
 
     async def list_projects(self) -> list[Dict[str, Any]]:
         """List all projects."""
-        response = await self.client.get("/api/projects")
-        response.raise_for_status()
-        return response.json()
+        if await self._mirror_ready("projects"):
+            return self.mirror.list_projects()
+        return await self._get("/api/projects")
 
     async def get_project(self, project_id: str) -> Dict[str, Any]:
         """Get a project by ID."""
-        response = await self.client.get(f"/api/projects/{project_id}")
-        response.raise_for_status()
-        return response.json()
+        if await self._mirror_ready("projects"):
+            project = self.mirror.get_project(project_id)
+            if project is not None:
+                return project
+        return await self._get(f"/api/projects/{project_id}")
 
     async def create_project(
         self,
@@ -112,7 +584,11 @@ class FastAPIClient:
             data["description"] = description
         response = await self.client.post("/api/projects", json=data)
         response.raise_for_status()
-        return response.json()
+        self._invalidate(["/api/projects"])
+        project = response.json()
+        if self.mirror is not None and isinstance(project, dict) and "id" in project:
+            self.mirror.upsert_project(project)
+        return project
 
     async def update_task(
         self,
@@ -122,8 +598,10 @@ class FastAPIClient:
         kind: Optional[str] = None,
         status: Optional[str] = None,
         points: Optional[int] = None,
+        depends_on: Optional[List[str]] = None,
+        idempotency_key: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Update a task. kind: task, feature, or epic."""
+        """Update a task. kind: task, feature, or epic. depends_on replaces the task's dependency list."""
         data: Dict[str, Any] = {}
         if title is not None:
             data["title"] = title
@@ -135,34 +613,58 @@ class FastAPIClient:
             data["status"] = status
         if points is not None:
             data["points"] = points
-        response = await self.client.put(f"/api/tasks/{task_id}", json=data)
+        if depends_on is not None:
+            data["depends_on"] = depends_on
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+        response = await self.client.put(f"/api/tasks/{task_id}", json=data, headers=headers)
         response.raise_for_status()
-        return response.json()
+        self._invalidate_task(task_id)
+        task = response.json()
+        self._mirror_task(task)
+        return task
     
     async def delete_task(self, task_id: str) -> None:
         """Delete a task"""
         response = await self.client.delete(f"/api/tasks/{task_id}")
         response.raise_for_status()
+        self._invalidate_task(task_id)
+        if self.mirror is not None:
+            self.mirror.delete_task(task_id)
+        if self.graph is not None:
+            self.graph.remove(task_id)
+        if self.search_index is not None:
+            self.search_index.remove_task(task_id)
 
     async def list_task_notes(self, task_id: str) -> list[Dict[str, Any]]:
         """List notes for a task."""
-        response = await self.client.get(f"/api/tasks/{task_id}/notes")
-        response.raise_for_status()
-        return response.json()
+        await self._settle(task_id)
+        if self.mirror is not None and self.mirror.notes_age(task_id) <= settings.mirror_max_staleness:
+            return self.mirror.list_notes(task_id)
+        notes = await self._get(f"/api/tasks/{task_id}/notes")
+        if self.mirror is not None:
+            self.mirror.replace_notes(task_id, notes, time.time())
+        if self.search_index is not None:
+            self.search_index.replace_notes(task_id, notes)
+        return notes
 
     async def create_task_note(
         self,
         task_id: str,
         content: str,
         author: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Add a note to a task."""
         data: Dict[str, Any] = {"content": content}
         if author:
             data["author"] = author
-        response = await self.client.post(f"/api/tasks/{task_id}/notes", json=data)
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+        response = await self.client.post(f"/api/tasks/{task_id}/notes", json=data, headers=headers)
         response.raise_for_status()
-        return response.json()
+        self._invalidate([f"/api/tasks/{task_id}/notes"])
+        note = response.json()
+        self._record_note(task_id, note)
+        return note
 
     async def list_sprints(
         self,
@@ -172,16 +674,261 @@ class FastAPIClient:
         params: Dict[str, str] = {}
         if project_id:
             params["project_id"] = project_id
-        response = await self.client.get("/api/sprints", params=params)
-        response.raise_for_status()
-        return response.json()
+        if await self._mirror_ready("sprints"):
+            return self.mirror.list_sprints(project_id)
+        return await self._get("/api/sprints", params=params)
 
     async def get_sprint(self, sprint_id: str) -> Dict[str, Any]:
         """Get a sprint by ID."""
-        response = await self.client.get(f"/api/sprints/{sprint_id}")
+        if await self._mirror_ready("sprints"):
+            sprint = self.mirror.get_sprint(sprint_id)
+            if sprint is not None:
+                return sprint
+        return await self._get(f"/api/sprints/{sprint_id}")
+
+    async def task_graph(self, refresh: bool = False) -> TaskGraph:
+        """The task dependency graph, built from one fetch of every task and then kept current.
+
+        Writes through the bridge update it directly. Tasks changed elsewhere
+        are picked up with an ``updated_after`` poll at most every
+        ``graph_max_staleness`` seconds, and the graph is rebuilt (dropping
+        deleted tasks) every ``graph_full_rebuild`` seconds or on ``refresh``.
+        """
+        async with self._graph_lock:
+            now = time.time()
+            graph = self.graph
+            if refresh or graph is None or now - graph.built_at >= settings.graph_full_rebuild:
+                self.graph = TaskGraph(await self.list_tasks())
+            elif now - graph.refreshed_at >= settings.graph_max_staleness:
+                for task in await self.list_tasks(updated_after=graph.high_water):
+                    graph.upsert(task)
+                graph.refreshed_at = now
+            return self.graph
+
+    def _search(self) -> SearchIndex:
+        if self.search_index is None:
+            if not settings.search_db:
+                raise RuntimeError("Search index is disabled; set SEARCH_DB to enable it")
+            self.search_index = SearchIndex(settings.search_db)
+        return self.search_index
+
+    async def sync_search(self, full: bool = False, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Bring the search index up to date with the API.
+
+        Like ``sync_mirror``: tasks changed since the newest indexed
+        ``updated_at`` are fetched, and every ``search_full_sync`` seconds (or
+        with ``full``) the whole listing, so deleted tasks drop out. Notes are
+        fetched (concurrently) for tasks that are new or changed, unless
+        ``search_notes`` is off; notes read or written through the bridge are
+        indexed as they pass.
+        """
+        async with self._search_lock:
+            index = self._search()
+            if max_age is not None and index.age() <= max_age:
+                return index.stats()
+            started = time.time()
+            state = index.state()
+            full = (
+                full
+                or not state["high_water"]
+                or not state["full_sync_at"]
+                or started - state["full_sync_at"] > settings.search_full_sync
+            )
+            since = None if full else state["high_water"]
+            tasks = [t async for t in self.iter_tasks(page_size=500, fresh=True, updated_after=since)]
+            versions = index.versions()
+            changed = [t for t in tasks if str(t["id"]) not in versions or versions[str(t["id"])] != t.get("updated_at")]
+            notes: Dict[str, List[Dict[str, Any]]] = {}
+            if settings.search_notes and changed:
+                results = await self._fan_out(changed, lambda t: self._get(f"/api/tasks/{t['id']}/notes", use_cache=False))
+                notes = {str(t["id"]): r["result"] for t, r in zip(changed, results) if r["ok"]}
+            stamps = [t.get("updated_at") for t in tasks if t.get("updated_at")]
+            if since:
+                stamps.append(since)
+            index.apply(
+                changed, max(stamps) if stamps else None, started, notes=notes,
+                listed=[str(t["id"]) for t in tasks] if full else None,
+            )
+            return {**index.stats(), "synced": len(changed), "full": full}
+
+    async def search_tasks(self, query: str, limit: int = 20, cursor: Optional[str] = None,
+                           fresh: bool = False, **filters: Optional[str]) -> Dict[str, Any]:
+        """Tasks matching ``query`` in their title, description or notes, best (BM25) first, one page at a time.
+
+        The index is synced first when it is older than ``search_max_staleness``
+        (always with ``fresh``). Filters: status, kind, project_id, sprint_id.
+        """
+        await self._settle()
+        await self.sync_search(max_age=None if fresh else settings.search_max_staleness)
+        filters = {k: v for k, v in filters.items() if v}
+        offset = decode_cursor(cursor, self._search_key(query, filters))[0] if cursor else 0
+        hits, more = self.search_index.search(query, filters, limit=limit, offset=offset)
+        return {
+            "hits": hits,
+            "next_cursor": self.search_cursor(query, offset + len(hits), **filters) if more else None,
+            "offset": offset,
+        }
+
+    @staticmethod
+    def _search_key(query: str, filters: Dict[str, Optional[str]]) -> str:
+        return fingerprint({"query": " ".join(query.split()), **{k: v for k, v in filters.items() if v}})
+
+    def search_cursor(self, query: str, offset: int, **filters: Optional[str]) -> str:
+        """Cursor that continues a search at ``offset``"""
+        return encode_cursor(self._search_key(query, filters), offset)
+
+    async def _open_task_notes(self, tasks: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Notes of the tasks that are not done, fetched concurrently; tasks whose notes fail are left out"""
+        pending = [t for t in tasks if t.get("status") not in DONE_STATUSES]
+        results = await self._fan_out(pending, lambda task: self.list_task_notes(str(task["id"])))
+        return {str(task["id"]): r["result"] for task, r in zip(pending, results) if r["ok"]}
+
+    async def sprint_board(self, sprint_id: str, include_notes: bool = False,
+                           stale_after_days: Optional[float] = None) -> Dict[str, Any]:
+        """Aggregates for one sprint: progress, counts and points by status and kind, blocked and stale tasks.
+
+        The sprint and its tasks are fetched concurrently; with ``include_notes``
+        the notes of unfinished tasks are fetched concurrently too and count
+        as activity.
+        """
+        sprint, tasks = await asyncio.gather(self.get_sprint(sprint_id), self.list_tasks(sprint_id=sprint_id))
+        notes = await self._open_task_notes(tasks) if include_notes else None
+        summary = summarize_tasks(
+            tasks,
+            stale_after_days=settings.stale_after_days if stale_after_days is None else stale_after_days,
+            notes=notes,
+        )
+        return {"sprint": {k: sprint.get(k) for k in ("id", "name", "project_id")}, **summary}
+
+    async def project_summary(self, project_id: str, include_notes: bool = False,
+                              stale_after_days: Optional[float] = None) -> Dict[str, Any]:
+        """Aggregates for a project like ``sprint_board``, plus counts and points per sprint"""
+        project, tasks, sprints = await asyncio.gather(
+            self.get_project(project_id),
+            self.list_tasks(project_id=project_id),
+            self.list_sprints(project_id=project_id),
+        )
+        notes = await self._open_task_notes(tasks) if include_notes else None
+        summary = summarize_tasks(
+            tasks,
+            stale_after_days=settings.stale_after_days if stale_after_days is None else stale_after_days,
+            notes=notes,
+            group_by="sprint_id",
+        )
+        names = {str(s.get("id")): s.get("name") for s in sprints}
+        for sprint_id, group in summary["by_sprint"].items():
+            group["name"] = names.get(sprint_id, "backlog" if sprint_id == "none" else None)
+        return {
+            "project": {k: project.get(k) for k in ("id", "name")},
+            "sprints": len(sprints),
+            **summary,
+        }
+    
+    async def _fan_out(
+        self,
+        items: List[Dict[str, Any]],
+        call: Callable[[Dict[str, Any]], Awaitable[Any]],
+    ) -> List[Dict[str, Any]]:
+        """Run ``call`` for every item, at most ``bulk_concurrency`` at a time, collecting per-item results"""
+        semaphore = asyncio.Semaphore(max(1, settings.bulk_concurrency))
+
+        async def one(index: int, item: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return {"index": index, "ok": True, "result": await call(item)}
+                except Exception as e:
+                    # httpx appends a documentation link on a second line
+                    return {"index": index, "ok": False, "error": str(e).split("\n", 1)[0]}
+
+        return list(await asyncio.gather(*(one(i, item) for i, item in enumerate(items))))
+
+    async def _batch(self, method: str, path: str, items: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """Send ``items`` to a batch endpoint; None if the API does not have it"""
+        if not settings.batch_endpoints or path in self._missing_batch:
+            return None
+        response = await self.client.request(method, path, json={"items": items})
+        if response.status_code in (404, 405):
+            self._missing_batch.add(path)
+            return None
         response.raise_for_status()
-        return response.json()
+        results = []
+        for index, outcome in enumerate(response.json()["results"]):
+            if outcome.get("ok"):
+                results.append({"index": index, "ok": True, "result": outcome.get("data")})
+            else:
+                results.append({"index": index, "ok": False, "error": outcome.get("error", "failed")})
+        return results
+
+    async def bulk_update_tasks(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Update many tasks. Each item has ``id`` plus the fields to change; returns per-item results."""
+        results = await self._batch("PATCH", "/api/tasks/batch", updates)
+        if results is None:
+            return await self._fan_out(updates, lambda u: self.update_task(
+                task_id=u["id"],
+                title=u.get("title"),
+                description=u.get("description"),
+                kind=u.get("kind"),
+                status=u.get("status"),
+                points=u.get("points"),
+                depends_on=u.get("depends_on"),
+            ))
+        for update in updates:
+            self._invalidate_task(update.get("id"))
+        for outcome in results:
+            if outcome["ok"]:
+                self._mirror_task(outcome["result"])
+        return results
+
+    async def bulk_create_tasks(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create many tasks (same fields as ``create_task``); returns per-item results."""
+        items = [{"status": "open", **task} for task in tasks]
+        results = await self._batch("POST", "/api/tasks/batch", items)
+        if results is None:
+            return await self._fan_out(tasks, lambda t: self.create_task(
+                title=t["title"],
+                description=t.get("description"),
+                kind=t.get("kind"),
+                status=t.get("status", "open"),
+                points=t.get("points"),
+                project_id=t.get("project_id"),
+                depends_on=t.get("depends_on"),
+            ))
+        self._invalidate_task()
+        for outcome in results:
+            if outcome["ok"]:
+                self._mirror_task(outcome["result"])
+        return results
+
+    async def bulk_create_task_notes(self, notes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Add many notes. Each item has ``task_id``, ``content`` and optional ``author``."""
+        results = await self._batch("POST", "/api/notes/batch", notes)
+        if results is None:
+            return await self._fan_out(notes, lambda n: self.create_task_note(
+                task_id=n["task_id"],
+                content=n["content"],
+                author=n.get("author"),
+            ))
+        self._invalidate([f"/api/tasks/{n.get('task_id')}/notes" for n in notes])
+        for note, outcome in zip(notes, results):
+            if outcome["ok"]:
+                self._record_note(note.get("task_id"), outcome["result"])
+        return results
     
     async def close(self):
         """Close the HTTP client"""
+        if self.outbox is not None:
+            await self.outbox.close()
         await self.client.aclose()
+        if self.mirror is not None:
+            self.mirror.close()
+        if self.search_index is not None:
+            self.search_index.close()
+
+_shared_client: Optional[FastAPIClient] = None
+
+def get_client() -> FastAPIClient:
+    """The process-wide client, so tools and scripts share one connection pool"""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = FastAPIClient()
+    return _shared_client
@@ -0,0 +1,83 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Tuple
+
+# (method, path, sorted params)
+FlightKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent identical reads into one request.
+
+    The first caller for a key starts the call in its own task; callers that
+    arrive while it is running wait for that task and get the same result
+    (or exception). A cancelled caller only stops waiting: the call goes on
+    for the others, and is cancelled once no caller is left waiting for it.
+    Results are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._flights: Dict[FlightKey, _Flight] = {}
+        self.started = 0
+        self.shared = 0
+        self.abandoned = 0
+
+    async def do(self, key: FlightKey, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``call()``, or join the identical call already in flight"""
+        if not self.enabled:
+            return await call()
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda task: self._done(key, flight))
+            self.started += 1
+        else:
+            self.shared += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller was cancelled; nobody is left to use the result
+                self._drop(key, flight)
+                flight.task.cancel()
+                self.abandoned += 1
+
+    def _done(self, key: FlightKey, flight: _Flight) -> None:
+        self._drop(key, flight)
+        if not flight.task.cancelled():
+            flight.task.exception()  # retrieved here so an unawaited failure is not logged
+
+    def _drop(self, key: FlightKey, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def forget(self, paths: Iterable[str] = (), prefixes: Iterable[str] = ()) -> None:
+        """Stop sharing in-flight reads of these paths, so reads after a write start a new request.
+
+        Matches like ``ResponseCache.invalidate``: exact ``paths`` (any params)
+        and paths starting with ``prefixes``. Callers already waiting keep
+        waiting for their request.
+        """
+        paths = set(paths)
+        prefixes = tuple(prefixes)
+        for key in [k for k in self._flights if k[1] in paths or (prefixes and k[1].startswith(prefixes))]:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "started": self.started,
+            "saved": self.shared,
+            "abandoned": self.abandoned,
+            "in_flight": len(self._flights),
+        }
@@ -0,0 +1,245 @@
+import heapq
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from bridge.rollup import DONE_STATUSES
+
+
+@dataclass
+class _Node:
+    task: Dict[str, Any]
+    depends_on: List[str] = field(default_factory=list)
+
+
+class CycleError(ValueError):
+    """Raised when an ordering or a path is asked for on a graph with cycles"""
+
+    def __init__(self, cycles: List[List[str]]):
+        super().__init__(f"dependency cycles found: {cycles}")
+        self.cycles = cycles
+
+
+def _points(task: Dict[str, Any]) -> int:
+    points = task.get("points")
+    return points if isinstance(points, int) else 0
+
+
+def _done(task: Dict[str, Any]) -> bool:
+    return task.get("status") in DONE_STATUSES
+
+
+class TaskGraph:
+    """In-memory dependency graph of tasks, from their ``depends_on`` lists.
+
+    An edge runs from a task to each task that depends on it. Dependencies on
+    task IDs the graph does not know (deleted, or never fetched) are kept but
+    do not block. Queries never contact the API; ``upsert``/``remove`` keep
+    the graph in step with writes made through the bridge.
+    """
+
+    def __init__(self, tasks: Iterable[Dict[str, Any]] = ()):
+        self._nodes: Dict[str, _Node] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self.high_water: Optional[str] = None
+        self.built_at = time.time()
+        self.refreshed_at = self.built_at
+        for task in tasks:
+            self.upsert(task)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._nodes
+
+    def upsert(self, task: Dict[str, Any]) -> None:
+        """Add a task or replace it, rewiring its edges"""
+        task_id = str(task["id"])
+        old = self._nodes.get(task_id)
+        depends_on = [str(d) for d in task.get("depends_on") or ()]
+        if old is not None:
+            for dep in old.depends_on:
+                self._dependents.get(dep, set()).discard(task_id)
+        self._nodes[task_id] = _Node(task, depends_on)
+        for dep in depends_on:
+            self._dependents.setdefault(dep, set()).add(task_id)
+        updated = task.get("updated_at")
+        if updated and (self.high_water is None or updated > self.high_water):
+            self.high_water = updated
+
+    def remove(self, task_id: str) -> None:
+        node = self._nodes.pop(task_id, None)
+        if node is not None:
+            for dep in node.depends_on:
+                self._dependents.get(dep, set()).discard(task_id)
+
+    def _created(self, task_id: str) -> str:
+        return self._nodes[task_id].task.get("created_at") or ""
+
+    def _scope(self, project_id: Optional[str]) -> List[str]:
+        return [i for i, n in self._nodes.items() if not project_id or n.task.get("project_id") == project_id]
+
+    def blockers(self, task_id: str) -> List[str]:
+        """Unfinished tasks ``task_id`` still waits for"""
+        node = self._nodes[task_id]
+        return [d for d in node.depends_on if d in self._nodes and not _done(self._nodes[d].task)]
+
+    def brief(self, task_id: str, **extra: Any) -> Dict[str, Any]:
+        task = self._nodes[task_id].task
+        return {
+            "id": task.get("id"),
+            "title": task.get("title"),
+            "status": task.get("status"),
+            "kind": task.get("kind"),
+            "points": task.get("points"),
+            **extra,
+        }
+
+    def ready(self, project_id: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Unfinished tasks whose dependencies are all done.
+
+        Tasks at the head of the heaviest chain of waiting work come first
+        (``chain_points``: points of the longest chain of unfinished tasks
+        that depend on it, directly or not), then in creation order.
+        """
+        ready = [
+            i for i in self._scope(project_id)
+            if not _done(self._nodes[i].task) and not self.blockers(i)
+        ]
+        tails = self._tails()
+        ready.sort(key=lambda i: (-tails.get(i, 0), self._created(i)))
+        return [self.brief(i, chain_points=tails.get(i, 0)) for i in ready[:limit]]
+
+    def _tails(self) -> Dict[str, int]:
+        """Points of the heaviest chain of unfinished tasks waiting on each unfinished task.
+
+        One pass from the last tasks backwards; tasks in or before a cycle
+        are left out.
+        """
+        live = {i for i, n in self._nodes.items() if not _done(n.task)}
+        pending = {i: sum(1 for d in self._dependents.get(i, ()) if d in live) for i in live}
+        queue = [i for i in live if pending[i] == 0]
+        tails: Dict[str, int] = {}
+        while queue:
+            current = queue.pop()
+            tails[current] = max(
+                (tails[d] + _points(self._nodes[d].task) for d in self._dependents.get(current, ()) if d in live),
+                default=0,
+            )
+            for dep in set(self._nodes[current].depends_on):
+                if dep in pending:
+                    pending[dep] -= 1
+                    if pending[dep] == 0:
+                        queue.append(dep)
+        return tails
+
+    def cycles(self, project_id: Optional[str] = None) -> List[List[str]]:
+        """Groups of tasks that depend on each other (strongly connected components), including self-dependencies"""
+        scope = set(self._scope(project_id))
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        found: List[List[str]] = []
+        counter = 0
+        # Iterative Tarjan, following task -> dependency edges
+        for root in scope:
+            if root in index:
+                continue
+            work = [(root, iter(self._nodes[root].depends_on))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, edges = work[-1]
+                advanced = False
+                for dep in edges:
+                    if dep not in scope:
+                        continue
+                    if dep not in index:
+                        index[dep] = low[dep] = counter
+                        counter += 1
+                        stack.append(dep)
+                        on_stack.add(dep)
+                        work.append((dep, iter(self._nodes[dep].depends_on)))
+                        advanced = True
+                        break
+                    if dep in on_stack:
+                        low[node] = min(low[node], index[dep])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in self._nodes[node].depends_on:
+                        found.append(sorted(component))
+        return sorted(found)
+
+    def order(self, project_id: Optional[str] = None, include_done: bool = False) -> List[str]:
+        """Task IDs with every task after the tasks it depends on (Kahn's algorithm, creation order on ties).
+
+        Raises CycleError when the scope has cycles.
+        """
+        scope = [i for i in self._scope(project_id) if include_done or not _done(self._nodes[i].task)]
+        waiting = {i: 0 for i in scope}
+        for i in scope:
+            waiting[i] = sum(1 for d in set(self._nodes[i].depends_on) if d in waiting)
+        queue = [(self._created(i), i) for i in scope if waiting[i] == 0]
+        heapq.heapify(queue)
+        ordered: List[str] = []
+        while queue:
+            _, current = heapq.heappop(queue)
+            ordered.append(current)
+            for dependent in self._dependents.get(current, ()):
+                if dependent in waiting:
+                    waiting[dependent] -= 1
+                    if waiting[dependent] == 0:
+                        heapq.heappush(queue, (self._created(dependent), dependent))
+        if len(ordered) < len(scope):
+            raise CycleError(self.cycles(project_id))
+        return ordered
+
+    def critical_path(self, project_id: Optional[str] = None, include_done: bool = False) -> Dict[str, Any]:
+        """The dependency chain with the most points: the least work that must happen one task after another.
+
+        Done tasks are left out unless ``include_done``. Raises CycleError
+        when the scope has cycles.
+        """
+        ordered = self.order(project_id, include_done)
+        members = set(ordered)
+        best: Dict[str, int] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for task_id in ordered:
+            node = self._nodes[task_id]
+            before = max((d for d in node.depends_on if d in members), key=lambda d: best[d], default=None)
+            best[task_id] = _points(node.task) + (best[before] if before is not None else 0)
+            previous[task_id] = before
+        if not best:
+            return {"points": 0, "tasks": []}
+        end = max(ordered, key=lambda i: best[i])
+        path = []
+        current: Optional[str] = end
+        while current is not None:
+            path.append(current)
+            current = previous[current]
+        path.reverse()
+        return {"points": best[end], "tasks": [self.brief(i) for i in path]}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tasks": len(self._nodes),
+            "edges": sum(len(n.depends_on) for n in self._nodes.values()),
+            "high_water": self.high_water,
+            "age_seconds": round(time.time() - self.refreshed_at, 1),
+        }
@@ -0,0 +1,251 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    status TEXT,
+    kind TEXT,
+    project_id TEXT,
+    sprint_id TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, created_at);
+CREATE INDEX IF NOT EXISTS tasks_kind ON tasks (kind, created_at);
+CREATE INDEX IF NOT EXISTS tasks_project ON tasks (project_id, created_at);
+CREATE INDEX IF NOT EXISTS tasks_sprint ON tasks (sprint_id, created_at);
+CREATE INDEX IF NOT EXISTS tasks_created ON tasks (created_at);
+CREATE INDEX IF NOT EXISTS tasks_updated ON tasks (updated_at);
+CREATE TABLE IF NOT EXISTS projects (id TEXT PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS sprints (id TEXT PRIMARY KEY, project_id TEXT, data TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS sprints_project ON sprints (project_id);
+CREATE TABLE IF NOT EXISTS notes (
+    id TEXT PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    created_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS notes_task ON notes (task_id, created_at);
+-- Tasks whose notes have been mirrored, and when
+CREATE TABLE IF NOT EXISTS notes_synced (task_id TEXT PRIMARY KEY, synced_at REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS sync_state (
+    resource TEXT PRIMARY KEY,
+    high_water TEXT,
+    synced_at REAL,
+    full_sync_at REAL
+);
+"""
+
+# Filters that compare a column for equality, and date-range filters as (column, operator)
+_EQUAL_FILTERS = ("status", "kind", "project_id", "sprint_id")
+_RANGE_FILTERS = {
+    "created_after": ("created_at", ">="),
+    "created_before": ("created_at", "<="),
+    "updated_after": ("updated_at", ">="),
+    "updated_before": ("updated_at", "<="),
+}
+
+
+class TaskMirror:
+    """Local SQLite copy of tasks, projects, sprints and notes.
+
+    Rows keep the API's JSON as-is in ``data``; the filterable fields are
+    copied into indexed columns. Dates are ISO strings, compared as text like
+    the API's own ``*_after``/``*_before`` filters.
+    """
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            Path(path).expanduser().parent.mkdir(parents=True, exist_ok=True)
+            path = str(Path(path).expanduser())
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def _write(self, statements: Iterable[tuple]) -> None:
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                for sql, args in statements:
+                    self._db.execute(sql, args)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _read(self, sql: str, args: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    # Sync bookkeeping
+
+    def state(self, resource: str) -> Dict[str, Any]:
+        rows = self._read("SELECT high_water, synced_at, full_sync_at FROM sync_state WHERE resource = ?", (resource,))
+        high_water, synced_at, full_sync_at = rows[0] if rows else (None, None, None)
+        return {"high_water": high_water, "synced_at": synced_at, "full_sync_at": full_sync_at}
+
+    def age(self, resource: str) -> float:
+        """Seconds since ``resource`` was last synced (infinite if never)"""
+        synced_at = self.state(resource)["synced_at"]
+        return time.time() - synced_at if synced_at else float("inf")
+
+    # Tasks
+
+    @staticmethod
+    def _task_row(task: Dict[str, Any]) -> tuple:
+        return (
+            "INSERT OR REPLACE INTO tasks (id, status, kind, project_id, sprint_id, created_at, updated_at, data)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (str(task["id"]), task.get("status"), task.get("kind"), task.get("project_id"), task.get("sprint_id"),
+             task.get("created_at"), task.get("updated_at"), json.dumps(task)),
+        )
+
+    def apply_tasks(self, tasks: List[Dict[str, Any]], high_water: Optional[str], synced_at: float,
+                    full: bool = False) -> None:
+        """Store synced tasks. A full sync replaces the table, dropping tasks deleted elsewhere."""
+        statements = []
+        if full:
+            statements += [("DELETE FROM tasks", ()), ("DELETE FROM notes_synced", ())]
+        else:
+            # Changed tasks may have new notes
+            statements += [("DELETE FROM notes_synced WHERE task_id = ?", (str(t["id"]),)) for t in tasks]
+        statements += [self._task_row(t) for t in tasks]
+        if full:
+            statements.append(("DELETE FROM notes WHERE task_id NOT IN (SELECT id FROM tasks)", ()))
+        statements.append((
+            "INSERT INTO sync_state (resource, high_water, synced_at, full_sync_at) VALUES ('tasks', ?, ?, ?)"
+            " ON CONFLICT (resource) DO UPDATE SET high_water = excluded.high_water, synced_at = excluded.synced_at,"
+            " full_sync_at = COALESCE(excluded.full_sync_at, sync_state.full_sync_at)",
+            (high_water, synced_at, synced_at if full else None),
+        ))
+        self._write(statements)
+
+    def upsert_task(self, task: Dict[str, Any]) -> None:
+        self._write([self._task_row(task)])
+
+    def delete_task(self, task_id: str) -> None:
+        self._write([
+            ("DELETE FROM tasks WHERE id = ?", (task_id,)),
+            ("DELETE FROM notes WHERE task_id = ?", (task_id,)),
+            ("DELETE FROM notes_synced WHERE task_id = ?", (task_id,)),
+        ])
+
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._read("SELECT data FROM tasks WHERE id = ?", (task_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def query_tasks(self, filters: Dict[str, str], limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """Tasks matching the ``list_tasks`` filters, oldest first"""
+        where, args = [], []
+        for name in _EQUAL_FILTERS:
+            if filters.get(name):
+                where.append(f"{name} = ?")
+                args.append(filters[name])
+        for name, (column, op) in _RANGE_FILTERS.items():
+            if filters.get(name):
+                where.append(f"{column} {op} ?")
+                args.append(filters[name])
+        sql = "SELECT data FROM tasks"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created_at, id"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            args += [limit, offset]
+        return [json.loads(data) for data, in self._read(sql, tuple(args))]
+
+    # Projects and sprints
+
+    def replace_projects(self, projects: List[Dict[str, Any]], synced_at: float) -> None:
+        self._write(
+            [("DELETE FROM projects", ())]
+            + [("INSERT INTO projects (id, data) VALUES (?, ?)", (str(p["id"]), json.dumps(p))) for p in projects]
+            + [self._stamp("projects", synced_at)]
+        )
+
+    def upsert_project(self, project: Dict[str, Any]) -> None:
+        self._write([("INSERT OR REPLACE INTO projects (id, data) VALUES (?, ?)",
+                      (str(project["id"]), json.dumps(project)))])
+
+    def list_projects(self) -> List[Dict[str, Any]]:
+        return [json.loads(data) for data, in self._read("SELECT data FROM projects ORDER BY rowid")]
+
+    def get_project(self, project_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._read("SELECT data FROM projects WHERE id = ?", (project_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def replace_sprints(self, sprints: List[Dict[str, Any]], synced_at: float) -> None:
+        self._write(
+            [("DELETE FROM sprints", ())]
+            + [("INSERT INTO sprints (id, project_id, data) VALUES (?, ?, ?)",
+                (str(s["id"]), s.get("project_id"), json.dumps(s))) for s in sprints]
+            + [self._stamp("sprints", synced_at)]
+        )
+
+    def list_sprints(self, project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        if project_id:
+            rows = self._read("SELECT data FROM sprints WHERE project_id = ? ORDER BY rowid", (project_id,))
+        else:
+            rows = self._read("SELECT data FROM sprints ORDER BY rowid")
+        return [json.loads(data) for data, in rows]
+
+    def get_sprint(self, sprint_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._read("SELECT data FROM sprints WHERE id = ?", (sprint_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    @staticmethod
+    def _stamp(resource: str, synced_at: float) -> tuple:
+        return (
+            "INSERT INTO sync_state (resource, synced_at) VALUES (?, ?)"
+            " ON CONFLICT (resource) DO UPDATE SET synced_at = excluded.synced_at",
+            (resource, synced_at),
+        )
+
+    # Notes (mirrored per task, on first read)
+
+    def notes_age(self, task_id: str) -> float:
+        rows = self._read("SELECT synced_at FROM notes_synced WHERE task_id = ?", (task_id,))
+        return time.time() - rows[0][0] if rows else float("inf")
+
+    def replace_notes(self, task_id: str, notes: List[Dict[str, Any]], synced_at: float) -> None:
+        self._write(
+            [("DELETE FROM notes WHERE task_id = ?", (task_id,))]
+            + [("INSERT OR REPLACE INTO notes (id, task_id, created_at, data) VALUES (?, ?, ?, ?)",
+                (str(n.get("id", f"{task_id}:{i}")), task_id, n.get("created_at"), json.dumps(n)))
+               for i, n in enumerate(notes)]
+            + [("INSERT OR REPLACE INTO notes_synced (task_id, synced_at) VALUES (?, ?)", (task_id, synced_at))]
+        )
+
+    def add_note(self, task_id: str, note: Dict[str, Any]) -> None:
+        """Record a note created through the bridge (only if the task's notes are mirrored)"""
+        if self.notes_age(task_id) == float("inf") or "id" not in note:
+            return
+        self._write([("INSERT OR REPLACE INTO notes (id, task_id, created_at, data) VALUES (?, ?, ?, ?)",
+                      (str(note["id"]), task_id, note.get("created_at"), json.dumps(note)))])
+
+    def list_notes(self, task_id: str) -> List[Dict[str, Any]]:
+        rows = self._read("SELECT data FROM notes WHERE task_id = ? ORDER BY rowid", (task_id,))
+        return [json.loads(data) for data, in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        counts = {table: self._read(f"SELECT COUNT(*) FROM {table}")[0][0]
+                  for table in ("tasks", "projects", "sprints", "notes")}
+        return {
+            "path": self.path,
+            **counts,
+            "tasks_high_water": self.state("tasks")["high_water"],
+            "age_seconds": {r: round(self.age(r), 1) for r in ("tasks", "projects", "sprints")},
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
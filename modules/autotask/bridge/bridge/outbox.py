@@ -0,0 +1,298 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Rewrite the journal once it holds this many more records than pending entries
+_COMPACT_AFTER = 256
+
+# Processes sharing an outbox path each lock their own journal: outbox.jsonl, outbox.1.jsonl, ...
+_MAX_JOURNALS = 64
+
+# Longest wait before queued writes are retried after the API failed them
+_MAX_RETRY_DELAY = 60.0
+
+
+@dataclass
+class OutboxEntry:
+    """A queued write: field updates for a task ("update") or a new note ("note")"""
+
+    key: str
+    seq: int
+    kind: str
+    task_id: str
+    data: Dict[str, Any]
+    queued_at: float = field(default_factory=time.time)
+    # Entries that may already have reached the API (in flight, or loaded
+    # after a restart) are never merged into, so their idempotency key keeps
+    # describing exactly what was sent.
+    sealed: bool = False
+
+
+def _journal_path(base: Path, n: int) -> Path:
+    return base if n == 0 else base.with_name(f"{base.stem}.{n}{base.suffix}")
+
+
+def _try_lock(path: Path) -> Optional[int]:
+    """Open and lock ``path`` without waiting; the file descriptor, or None if another process holds it"""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _retryable(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return isinstance(error, httpx.TransportError)
+
+
+class Outbox:
+    """Disk-backed queue that coalesces task writes and replays them in order.
+
+    An update to a task whose last queued write is an unsent update is
+    merged into it (later fields win), so a burst of ``update_task`` calls
+    becomes one PUT; a note queued in between keeps its place. The
+    queue is flushed ``window`` seconds after the first queued write, or on
+    ``flush()``. Each entry carries an idempotency key that is reused if it
+    has to be sent again after a failure or restart. The journal is an
+    append-only JSON-lines file, fsynced per write; entries are removed once
+    the API accepted them. Non-retryable failures (4xx) are dropped and kept
+    in ``failed``; network errors, 5xx and 429 stay queued and are retried
+    with exponential backoff.
+
+    Each process locks its own journal: the first of ``path``,
+    ``<stem>.1<suffix>``, ... that no other process holds. Journals found
+    unlocked on start were left by processes that are gone, and their
+    entries are taken over.
+    """
+
+    def __init__(self, path: str, window: float, send: Callable[[OutboxEntry], Awaitable[Any]],
+                 concurrency: int = 8):
+        base = Path(path).expanduser()
+        base.parent.mkdir(parents=True, exist_ok=True)
+        for n in range(_MAX_JOURNALS):
+            self.path = _journal_path(base, n)
+            self._lock_fd = _try_lock(self.path.with_name(self.path.name + ".lock"))
+            if self._lock_fd is not None:
+                break
+        else:
+            raise RuntimeError(f"All {_MAX_JOURNALS} outbox journals next to {base} are in use")
+        self.window = window
+        self.send = send
+        self.concurrency = max(1, concurrency)
+        self._pending: Dict[str, OutboxEntry] = {}
+        self._seq = 0
+        self._records = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._retries = 0
+        self._flushing: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.failed: deque = deque(maxlen=50)
+        self.queued = 0
+        self.coalesced = 0
+        self.sent = 0
+        self._load(base)
+        self._journal = open(self.path, "a", encoding="utf-8")
+        if self._pending:
+            try:
+                self._schedule()
+            except RuntimeError:
+                pass  # created outside an event loop: sent by the first flush
+
+    @staticmethod
+    def _read(path: Path) -> Dict[str, OutboxEntry]:
+        """Pending entries of a journal; everything found there is replayed as-is"""
+        pending: Dict[str, OutboxEntry] = {}
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return pending
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn last line after a crash
+            if "put" in record:
+                entry = OutboxEntry(**record["put"])
+                entry.sealed = True
+                pending[entry.key] = entry
+            elif "done" in record:
+                pending.pop(record["done"], None)
+        return pending
+
+    def _load(self, base: Path) -> None:
+        """Rebuild the queue from this process's journal and those left unlocked by other processes"""
+        self._pending = self._read(self.path)
+        self._seq = max((e.seq for e in self._pending.values()), default=0)
+        adopted = []
+        for n in range(_MAX_JOURNALS):
+            other = _journal_path(base, n)
+            if other == self.path or not other.exists():
+                continue
+            fd = _try_lock(other.with_name(other.name + ".lock"))
+            if fd is None:
+                continue  # still in use
+            for entry in sorted(self._read(other).values(), key=lambda e: e.seq):
+                self._seq += 1
+                entry.seq = self._seq
+                self._pending[entry.key] = entry
+            adopted.append((other, fd))
+        self._compact()
+        # Only once the entries are in this journal
+        for other, fd in adopted:
+            other.unlink(missing_ok=True)
+            os.close(fd)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        self._journal.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._records += 1
+
+    def _compact(self) -> None:
+        """Rewrite the journal with only the pending entries"""
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as out:
+            for entry in self.pending():
+                out.write(json.dumps({"put": self._record(entry)}, separators=(",", ":")) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, self.path)
+        self._records = len(self._pending)
+        if getattr(self, "_journal", None) is not None:
+            self._journal.close()
+            self._journal = open(self.path, "a", encoding="utf-8")
+
+    @staticmethod
+    def _record(entry: OutboxEntry) -> Dict[str, Any]:
+        record = asdict(entry)
+        del record["sealed"]
+        return record
+
+    def pending(self, task_id: Optional[str] = None) -> List[OutboxEntry]:
+        """Queued entries in replay order, optionally only those for one task"""
+        entries = sorted(self._pending.values(), key=lambda e: e.seq)
+        return [e for e in entries if task_id is None or e.task_id == task_id]
+
+    def enqueue(self, kind: str, task_id: str, data: Dict[str, Any]) -> OutboxEntry:
+        """Queue a write, merging field updates into the task's last entry if that is an unsent update"""
+        if kind == "update":
+            # Only the last entry: merging past a later note would send the fields before it
+            entries = self.pending(task_id)
+            entry = entries[-1] if entries else None
+            if entry is not None and entry.kind == "update" and not entry.sealed:
+                entry.data.update(data)
+                self._append({"put": self._record(entry)})
+                self.coalesced += 1
+                self._schedule()
+                return entry
+        self._seq += 1
+        entry = OutboxEntry(key=str(uuid.uuid4()), seq=self._seq, kind=kind, task_id=task_id, data=dict(data))
+        self._pending[entry.key] = entry
+        self._append({"put": self._record(entry)})
+        self.queued += 1
+        self._schedule()
+        return entry
+
+    def _schedule(self, delay: Optional[float] = None) -> None:
+        if self._timer is not None or self.window <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(self.window if delay is None else delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._flushing = asyncio.ensure_future(self.flush())
+
+    async def flush(self, task_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Send queued entries (all, or one task's) and return per-entry outcomes.
+
+        Different tasks are sent concurrently; a task's own entries go out in
+        the order they were queued, stopping at the first retryable failure.
+        """
+        async with self._lock:
+            groups: Dict[str, List[OutboxEntry]] = {}
+            for entry in self.pending(task_id):
+                entry.sealed = True
+                groups.setdefault(entry.task_id, []).append(entry)
+            if not groups:
+                return []
+            semaphore = asyncio.Semaphore(self.concurrency)
+            outcomes: List[tuple] = []
+
+            async def replay(entries: List[OutboxEntry]) -> None:
+                async with semaphore:
+                    for entry in entries:
+                        outcome = {"key": entry.key, "kind": entry.kind, "task_id": entry.task_id}
+                        try:
+                            outcome.update(ok=True, result=await self.send(entry))
+                        except Exception as e:
+                            outcome.update(ok=False, error=str(e).split("\n", 1)[0])
+                            if _retryable(e):
+                                outcome["retry"] = True
+                                outcomes.append((entry.seq, outcome))
+                                return
+                            self.failed.append(outcome)
+                        self._pending.pop(entry.key, None)
+                        self._append({"done": entry.key})
+                        if outcome["ok"]:
+                            self.sent += 1
+                        outcomes.append((entry.seq, outcome))
+
+            await asyncio.gather(*(replay(entries) for entries in groups.values()))
+            if self._records - len(self._pending) > _COMPACT_AFTER:
+                self._compact()
+            if any(outcome.get("retry") for _, outcome in outcomes):
+                self._retries += 1
+                self._schedule(min(_MAX_RETRY_DELAY, self.window * 2 ** self._retries))
+            else:
+                self._retries = 0
+            return [outcome for _, outcome in sorted(outcomes, key=lambda o: o[0])]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "queued": self.queued,
+            "coalesced": self.coalesced,
+            "sent": self.sent,
+            "failed": list(self.failed),
+            "window": self.window,
+            "path": str(self.path),
+        }
+
+    async def close(self) -> None:
+        """Cancel the timer and try to send what is queued; anything left stays in the journal"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flushing is not None:
+            await asyncio.gather(self._flushing, return_exceptions=True)
+        try:
+            await self.flush()
+        except Exception:
+            pass
+        if self._timer is not None:
+            self._timer.cancel()  # a retry scheduled by the last flush
+            self._timer = None
+        self._journal.close()
+        os.close(self._lock_fd)
@@ -0,0 +1,74 @@
+import base64
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class CursorError(ValueError):
+    """Raised when a cursor is malformed or belongs to a different query"""
+
+
+def fingerprint(params: Dict[str, Any]) -> str:
+    """Short hash identifying a set of list filters"""
+    canonical = json.dumps(sorted((k, str(v)) for k, v in params.items()), separators=(",", ":"))
+    return hashlib.sha1(canonical.encode()).hexdigest()[:12]
+
+
+def encode_cursor(query: str, offset: int, head: Optional[str] = None) -> str:
+    payload = json.dumps({"q": query, "o": offset, "h": head}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, query: str) -> Tuple[int, Optional[str]]:
+    """Return the offset and first task id stored in ``cursor``, checking it was issued for ``query``"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        offset = int(payload["o"])
+        cursor_query = payload["q"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise CursorError(f"Invalid cursor: {e}")
+    if cursor_query != query:
+        raise CursorError("Cursor belongs to a different query (filters changed)")
+    return max(0, offset), payload.get("h")
+
+
+@dataclass
+class HighWaterMark:
+    """Newest ``updated_at`` handed out for a query, plus the task ids already seen at that instant.
+
+    ``updated_after`` is inclusive, so tasks stamped exactly at the mark come
+    back on the next poll; the ids let those be dropped unless they changed.
+    """
+
+    updated_at: Optional[str] = None
+    seen: Set[str] = field(default_factory=set)
+    # The mark before the last select, for rewind
+    _previous: Optional[Tuple[Optional[str], Set[str]]] = field(default=None, repr=False, compare=False)
+
+    def select(self, tasks: List[Dict[str, Any]], limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Pick up to ``limit`` unseen changes in ``updated_at`` order and advance the mark past them"""
+        changed = sorted(
+            (t for t in tasks if not (t.get("updated_at") == self.updated_at and t.get("id") in self.seen)),
+            key=lambda t: (t.get("updated_at") or "", str(t.get("id"))),
+        )
+        taken = changed[:limit]
+        self._previous = (self.updated_at, set(self.seen))
+        self.advance(taken)
+        return taken, len(changed) > len(taken)
+
+    def advance(self, tasks: List[Dict[str, Any]]) -> None:
+        """Move the mark past ``tasks`` (in ``updated_at`` order)"""
+        for task in tasks:
+            stamp = task.get("updated_at")
+            if stamp != self.updated_at:
+                self.updated_at = stamp
+                self.seen = set()
+            self.seen.add(task.get("id"))
+
+    def rewind(self, delivered: List[Dict[str, Any]]) -> None:
+        """Undo the last ``select`` except for the first tasks it returned that were actually delivered"""
+        if self._previous is not None:
+            self.updated_at, self.seen = self._previous[0], set(self._previous[1])
+        self.advance(delivered)
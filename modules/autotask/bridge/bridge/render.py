@@ -0,0 +1,128 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional: pip install "autotask-bridge[fast]"
+    orjson = None
+
+# Default size budget for one tool result, in bytes
+DEFAULT_MAX_BYTES = int(os.getenv("RESULT_MAX_BYTES", "16384"))
+
+# Smallest budget a caller may ask for
+MIN_MAX_BYTES = 256
+
+# Longest table cell before it is cut
+MAX_CELL_CHARS = 80
+
+# Columns used by the table format when no fields are given
+DEFAULT_COLUMNS = {
+    "task": ("id", "title", "status", "kind", "points"),
+    "project": ("id", "name", "description"),
+    "sprint": ("id", "name", "project_id"),
+    "note": ("id", "author", "content", "created_at"),
+    "hit": ("id", "title", "status", "score", "snippet"),
+}
+
+
+# Built once: json.dumps() with options constructs a new encoder per call
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def encode(value: Any) -> str:
+    """Compact JSON; uses orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS, default=str).decode()
+    return _encoder.encode(value)
+
+
+def project(item: Any, fields: Optional[Sequence[str]]) -> Any:
+    """Keep only ``fields`` of a dict (in that order); other values pass through"""
+    if not fields or not isinstance(item, dict):
+        return item
+    return {name: item.get(name) for name in fields}
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    text = value if isinstance(value, str) else encode(value)
+    text = text.replace("\\", "\\\\").replace("|", "\\|").replace("\n", "\\n")
+    return text if len(text) <= MAX_CELL_CHARS else text[:MAX_CELL_CHARS - 3] + "..."
+
+
+def _table(items: List[Dict[str, Any]], columns: Sequence[str], budget: int) -> Tuple[List[str], int]:
+    lines = [" | ".join(columns)]
+    used = len(lines[0]) + 1
+    shown = 0
+    for item in items:
+        row = " | ".join(_cell(item.get(c)) if isinstance(item, dict) else _cell(item) for c in columns)
+        size = len(row.encode()) + 1
+        if used + size > budget:
+            break
+        lines.append(row)
+        used += size
+        shown += 1
+    return lines, shown
+
+
+def render_list(
+    label: str,
+    items: List[Any],
+    kind: str,
+    fields: Optional[Sequence[str]] = None,
+    fmt: str = "json",
+    max_bytes: Optional[int] = None,
+) -> Tuple[str, int]:
+    """Render ``items`` within a byte budget; returns the text and how many items it holds.
+
+    Items that do not fit are left out (never cut in half) and a marker says
+    how many were dropped, so the caller can page on from there.
+    """
+    budget = max(MIN_MAX_BYTES, max_bytes or DEFAULT_MAX_BYTES)
+    # Room for the label and the truncation marker
+    room = budget - len(label) - 80
+    if fmt == "table":
+        columns = list(fields or DEFAULT_COLUMNS.get(kind, ()))
+        if not columns:
+            columns = list(items[0].keys()) if items and isinstance(items[0], dict) else ["value"]
+        lines, shown = _table(items, columns, room)
+        body = "\n" + "\n".join(lines)
+    else:
+        projected = [project(item, fields) for item in items] if fields else items
+        # Estimate from the first item whether the whole list could fit
+        estimate = len(encode(projected[0])) * len(projected) if projected else 0
+        whole = encode(projected) if estimate <= room * 2 else None
+        if whole is not None and len(whole.encode()) <= room:
+            # Common case: everything fits, one encoder call
+            body, shown = " " + whole, len(items)
+        else:
+            parts, used, shown = [], 2, 0
+            for item in projected:
+                part = encode(item)
+                size = len(part.encode()) + 1
+                if used + size > room:
+                    break
+                parts.append(part)
+                used += size
+                shown += 1
+            body = " [" + ",".join(parts) + "]"
+    text = f"{label}:{body}"
+    if shown < len(items):
+        text += f"\n... [truncated: showing {shown} of {len(items)}; use fields, a smaller limit or max_bytes]"
+    return text, shown
+
+
+def render_item(label: str, item: Any, kind: str, fields: Optional[Sequence[str]] = None,
+                fmt: str = "json", max_bytes: Optional[int] = None) -> str:
+    """Render one object; oversized output is cut at the budget with a marker"""
+    budget = max(MIN_MAX_BYTES, max_bytes or DEFAULT_MAX_BYTES)
+    if fmt == "table" and isinstance(item, dict):
+        columns = list(fields or item.keys())
+        text = f"{label}:\n" + "\n".join(f"{c}: {_cell(item.get(c))}" for c in columns)
+    else:
+        text = f"{label}: {encode(project(item, fields))}"
+    if len(text.encode()) > budget:
+        text = text.encode()[:budget - 40].decode(errors="ignore") + "\n... [truncated]"
+    return text
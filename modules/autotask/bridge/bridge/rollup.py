@@ -0,0 +1,111 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# Statuses that count as finished work
+DONE_STATUSES = frozenset({"closed", "done"})
+
+# Longest note excerpt kept in a summary
+NOTE_EXCERPT_CHARS = 120
+
+
+def parse_time(value: Any) -> Optional[datetime]:
+    """Parse an API timestamp (ISO 8601, naive values taken as UTC); None if it is missing or invalid"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _bucket(buckets: Dict[str, Dict[str, int]], name: Any, points: int) -> Dict[str, int]:
+    bucket = buckets.setdefault(str(name) if name is not None else "none", {"count": 0, "points": 0})
+    bucket["count"] += 1
+    bucket["points"] += points
+    return bucket
+
+
+def _brief(task: Dict[str, Any], **extra: Any) -> Dict[str, Any]:
+    return {"id": task.get("id"), "title": task.get("title"), "status": task.get("status"), **extra}
+
+
+def summarize_tasks(
+    tasks: List[Dict[str, Any]],
+    stale_after_days: float = 7.0,
+    notes: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    group_by: Optional[str] = None,
+    top: int = 10,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Aggregate tasks in one pass: counts and points by status and kind, progress, blocked and stale tasks.
+
+    A task that is not done is stale when its last activity (``updated_at``,
+    or its newest note when ``notes`` are given) is older than
+    ``stale_after_days``. ``group_by`` (e.g. ``"sprint_id"``) adds per-group
+    counts, points and done points. Lists of tasks are cut to ``top``
+    entries; the totals always cover every task.
+    """
+    now = now or datetime.now(timezone.utc)
+    by_status: Dict[str, Dict[str, int]] = {}
+    by_kind: Dict[str, Dict[str, int]] = {}
+    groups: Dict[str, Dict[str, int]] = {}
+    blocked: List[Dict[str, Any]] = []
+    stale: List[tuple] = []
+    points = done_points = done = unestimated = 0
+
+    for task in tasks:
+        task_points = task.get("points")
+        if not isinstance(task_points, int):
+            unestimated += 1
+            task_points = 0
+        status = task.get("status")
+        is_done = status in DONE_STATUSES
+        points += task_points
+        if is_done:
+            done += 1
+            done_points += task_points
+        _bucket(by_status, status, task_points)
+        _bucket(by_kind, task.get("kind"), task_points)
+        if group_by is not None:
+            group = _bucket(groups, task.get(group_by), task_points)
+            group["done_points"] = group.get("done_points", 0) + (task_points if is_done else 0)
+        if is_done:
+            continue
+
+        task_notes = notes.get(str(task.get("id"))) if notes is not None else None
+        last = parse_time(task.get("updated_at"))
+        for note in task_notes or ():
+            created = parse_time(note.get("created_at"))
+            if created is not None and (last is None or created > last):
+                last = created
+        extra: Dict[str, Any] = {}
+        if task_notes:
+            extra["notes"] = len(task_notes)
+            extra["last_note"] = str(task_notes[-1].get("content", ""))[:NOTE_EXCERPT_CHARS]
+        if status == "blocked":
+            blocked.append(_brief(task, **extra))
+        if last is not None:
+            idle = (now - last).total_seconds() / 86400
+            if idle >= stale_after_days:
+                stale.append((idle, _brief(task, idle_days=round(idle, 1), **extra)))
+
+    stale.sort(key=lambda s: -s[0])
+    summary: Dict[str, Any] = {
+        "tasks": len(tasks),
+        "points": points,
+        "done": done,
+        "done_points": done_points,
+        "progress": round(done_points / points, 3) if points else (round(done / len(tasks), 3) if tasks else 0.0),
+        "unestimated": unestimated,
+        "by_status": by_status,
+        "by_kind": by_kind,
+        "blocked": blocked[:top],
+        "blocked_count": len(blocked),
+        "stale": [brief for _, brief in stale[:top]],
+        "stale_count": len(stale),
+        "stale_after_days": stale_after_days,
+    }
+    if group_by is not None:
+        summary[f"by_{group_by.removesuffix('_id')}"] = groups
+    return summary
@@ -0,0 +1,241 @@
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc INTEGER PRIMARY KEY,
+    id TEXT UNIQUE NOT NULL,
+    status TEXT,
+    kind TEXT,
+    project_id TEXT,
+    sprint_id TEXT,
+    updated_at TEXT,
+    title TEXT,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS notes (id TEXT PRIMARY KEY, task_id TEXT NOT NULL, content TEXT);
+CREATE INDEX IF NOT EXISTS notes_task ON notes (task_id);
+-- Inverted index; rowid is docs.doc
+CREATE VIRTUAL TABLE IF NOT EXISTS fts USING fts5(
+    title, description, notes,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# BM25 column weights: a match in the title counts most
+_WEIGHTS = (4.0, 1.0, 1.0)
+
+# Filters that compare a docs column for equality
+_EQUAL_FILTERS = ("status", "kind", "project_id", "sprint_id")
+
+_TERM = re.compile(r'"([^"]+)"|(\w+)')
+
+
+class SearchQueryError(ValueError):
+    """Raised when a search query has no searchable terms"""
+
+
+def match_expression(query: str) -> str:
+    """FTS5 query for free text: any of the words (or "quoted phrases"), each taken literally"""
+    terms = []
+    for phrase, word in _TERM.findall(query):
+        text = (phrase or word).replace('"', "").strip()
+        if text:
+            terms.append('"' + text + '"')
+    if not terms:
+        raise SearchQueryError("Search query has no words to look for")
+    return " OR ".join(terms)
+
+
+class SearchIndex:
+    """Full-text index of tasks (title, description, notes) in SQLite FTS5, ranked with BM25.
+
+    Kept on disk so it survives restarts; ``apply`` takes the tasks changed
+    since the last sync, so it is built incrementally. Words are stemmed
+    (Porter) and diacritics folded, so "crashes" finds "crash".
+    """
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            Path(path).expanduser().parent.mkdir(parents=True, exist_ok=True)
+            path = str(Path(path).expanduser())
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def _read(self, sql: str, args: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    def _transaction(self, work) -> None:
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                work(self._db)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    # Sync bookkeeping
+
+    def state(self) -> Dict[str, Any]:
+        values = dict(self._read("SELECT key, value FROM sync_state"))
+        return {
+            "high_water": values.get("high_water"),
+            "synced_at": float(values["synced_at"]) if values.get("synced_at") else None,
+            "full_sync_at": float(values["full_sync_at"]) if values.get("full_sync_at") else None,
+        }
+
+    def age(self) -> float:
+        """Seconds since the last sync (infinite if never)"""
+        synced_at = self.state()["synced_at"]
+        return time.time() - synced_at if synced_at else float("inf")
+
+    def versions(self) -> Dict[str, Optional[str]]:
+        """``updated_at`` of every indexed task, by id"""
+        return dict(self._read("SELECT id, updated_at FROM docs"))
+
+    # Writes
+
+    @staticmethod
+    def _put_task(db: sqlite3.Connection, task: Dict[str, Any]) -> None:
+        task_id = str(task["id"])
+        db.execute(
+            "INSERT INTO docs (id, status, kind, project_id, sprint_id, updated_at, title, description)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET status = excluded.status,"
+            " kind = excluded.kind, project_id = excluded.project_id, sprint_id = excluded.sprint_id,"
+            " updated_at = excluded.updated_at, title = excluded.title, description = excluded.description",
+            (task_id, task.get("status"), task.get("kind"), task.get("project_id"), task.get("sprint_id"),
+             task.get("updated_at"), task.get("title") or "", task.get("description") or ""),
+        )
+        SearchIndex._reindex(db, task_id)
+
+    @staticmethod
+    def _reindex(db: sqlite3.Connection, task_id: str) -> None:
+        row = db.execute("SELECT doc, title, description FROM docs WHERE id = ?", (task_id,)).fetchone()
+        if row is None:
+            return
+        doc, title, description = row
+        notes = "\n".join(c for c, in db.execute(
+            "SELECT content FROM notes WHERE task_id = ? ORDER BY rowid", (task_id,)) if c)
+        db.execute("DELETE FROM fts WHERE rowid = ?", (doc,))
+        db.execute("INSERT INTO fts (rowid, title, description, notes) VALUES (?, ?, ?, ?)",
+                   (doc, title, description, notes))
+
+    @staticmethod
+    def _put_notes(db: sqlite3.Connection, task_id: str, notes: List[Dict[str, Any]]) -> None:
+        db.execute("DELETE FROM notes WHERE task_id = ?", (task_id,))
+        db.executemany(
+            "INSERT OR REPLACE INTO notes (id, task_id, content) VALUES (?, ?, ?)",
+            [(str(n.get("id", f"{task_id}:{i}")), task_id, n.get("content") or "") for i, n in enumerate(notes)],
+        )
+
+    def apply(self, tasks: List[Dict[str, Any]], high_water: Optional[str], synced_at: float,
+              notes: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+              listed: Optional[Iterable[str]] = None) -> None:
+        """Index synced tasks (and, for tasks in ``notes``, their notes).
+
+        ``listed`` holds every task id of a full listing; indexed tasks not in
+        it were deleted and are dropped.
+        """
+        notes = notes or {}
+        full = listed is not None
+
+        def work(db: sqlite3.Connection) -> None:
+            if full:
+                keep = set(listed)
+                gone = [i for i, in db.execute("SELECT id FROM docs") if i not in keep]
+                for task_id in gone:
+                    self._delete(db, task_id)
+            for task in tasks:
+                task_id = str(task["id"])
+                if task_id in notes:
+                    self._put_notes(db, task_id, notes[task_id])
+                self._put_task(db, task)
+            values = [("high_water", high_water), ("synced_at", str(synced_at))]
+            if full:
+                values.append(("full_sync_at", str(synced_at)))
+            db.executemany("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", values)
+
+        self._transaction(work)
+
+    def upsert_task(self, task: Dict[str, Any]) -> None:
+        """Index a task returned by a write, keeping its notes"""
+        self._transaction(lambda db: self._put_task(db, task))
+
+    def replace_notes(self, task_id: str, notes: List[Dict[str, Any]]) -> None:
+        """Index a task's current notes (only if the task is indexed)"""
+        def work(db: sqlite3.Connection) -> None:
+            if db.execute("SELECT 1 FROM docs WHERE id = ?", (task_id,)).fetchone():
+                self._put_notes(db, task_id, notes)
+                self._reindex(db, task_id)
+
+        self._transaction(work)
+
+    def add_note(self, task_id: str, note: Dict[str, Any]) -> None:
+        def work(db: sqlite3.Connection) -> None:
+            if db.execute("SELECT 1 FROM docs WHERE id = ?", (task_id,)).fetchone():
+                db.execute("INSERT OR REPLACE INTO notes (id, task_id, content) VALUES (?, ?, ?)",
+                           (str(note.get("id", f"{task_id}:{time.time()}")), task_id, note.get("content") or ""))
+                self._reindex(db, task_id)
+
+        self._transaction(work)
+
+    @staticmethod
+    def _delete(db: sqlite3.Connection, task_id: str) -> None:
+        row = db.execute("SELECT doc FROM docs WHERE id = ?", (task_id,)).fetchone()
+        if row is not None:
+            db.execute("DELETE FROM fts WHERE rowid = ?", row)
+            db.execute("DELETE FROM docs WHERE doc = ?", row)
+        db.execute("DELETE FROM notes WHERE task_id = ?", (task_id,))
+
+    def remove_task(self, task_id: str) -> None:
+        self._transaction(lambda db: self._delete(db, task_id))
+
+    # Queries
+
+    def search(self, query: str, filters: Optional[Dict[str, str]] = None, limit: int = 20,
+               offset: int = 0) -> Tuple[List[Dict[str, Any]], bool]:
+        """Ranked hits for ``query`` (best first) and whether more follow"""
+        where, args = ["fts MATCH ?"], [match_expression(query)]
+        for name in _EQUAL_FILTERS:
+            if (filters or {}).get(name):
+                where.append(f"d.{name} = ?")
+                args.append(filters[name])
+        rows = self._read(
+            "SELECT d.id, d.title, d.status, d.kind, d.project_id, bm25(fts, ?, ?, ?) AS score,"
+            " snippet(fts, -1, '[', ']', '...', 12)"
+            " FROM fts JOIN docs d ON d.doc = fts.rowid"
+            f" WHERE {' AND '.join(where)} ORDER BY score, d.doc LIMIT ? OFFSET ?",
+            (*_WEIGHTS, *args, limit + 1, offset),
+        )
+        hits = [
+            {"id": i, "title": title, "status": status, "kind": kind, "project_id": project_id,
+             # FTS5 scores are negative, lower is better; flip for readability
+             "score": round(-score, 3), "snippet": snippet}
+            for i, title, status, kind, project_id, score, snippet in rows[:limit]
+        ]
+        return hits, len(rows) > limit
+
+    def stats(self) -> Dict[str, Any]:
+        state = self.state()
+        return {
+            "path": self.path,
+            "tasks": self._read("SELECT COUNT(*) FROM docs")[0][0],
+            "notes": self._read("SELECT COUNT(*) FROM notes")[0][0],
+            "high_water": state["high_water"],
+            "age_seconds": round(self.age(), 1),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
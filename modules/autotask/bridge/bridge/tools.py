@@ -1,12 +1,56 @@
 from mcp.types import Tool, TextContent
-from typing import Any, Dict
-from bridge.client import FastAPIClient
+from typing import Any, Dict, Optional
 
-# Initialize client
-client = FastAPIClient()
+# Output options shared by the read tools
+OUTPUT_PROPERTIES = {
+    "fields": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Only return these fields of each object, e.g. [\"id\", \"title\", \"status\"] (optional)"
+    },
+    "format": {
+        "type": "string",
+        "enum": ["json", "table"],
+        "description": "Compact JSON (default) or a pipe-separated table (optional)"
+    },
+    "max_bytes": {
+        "type": "integer",
+        "description": "Size budget for the result; items that do not fit are left out and marked (optional)"
+    }
+}
+
+# Options shared by the dependency graph tools
+GRAPH_PROPERTIES = {
+    "project_id": {
+        "type": "string",
+        "description": "Only consider tasks of this project (optional)"
+    },
+    "refresh": {
+        "type": "boolean",
+        "description": "Rebuild the dependency graph from the API first (default: false; it is kept current automatically)",
+        "default": False
+    }
+}
+
+def _output(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Rendering options taken from a read tool's arguments"""
+    return {
+        "fields": arguments.get("fields"),
+        "fmt": arguments.get("format", "json"),
+        "max_bytes": arguments.get("max_bytes"),
+    }
+
+# Built on the first list_tools call and reused afterwards
+_tools: Optional[list[Tool]] = None
 
 def get_tools() -> list[Tool]:
     """Return list of available MCP tools"""
+    global _tools
+    if _tools is None:
+        _tools = _build_tools()
+    return _tools
+
+def _build_tools() -> list[Tool]:
     return [
         Tool(
             name="create_project",
@@ -23,20 +67,20 @@ def get_tools() -> list[Tool]:
         Tool(
             name="list_projects",
             description="List all projects",
-            inputSchema={"type": "object", "properties": {}}
+            inputSchema={"type": "object", "properties": {**OUTPUT_PROPERTIES}}
         ),
         Tool(
             name="get_project",
             description="Get a project by its ID",
             inputSchema={
                 "type": "object",
-                "properties": {"id": {"type": "string", "description": "Project UUID"}},
+                "properties": {"id": {"type": "string", "description": "Project UUID"}, **OUTPUT_PROPERTIES},
                 "required": ["id"]
             }
         ),
         Tool(
             name="create_task",
-            description="Create a new task with title, description, kind (task/feature/epic), status, optional points, and optional project_id",
+            description="Create a new task with title, description, kind (task/feature/epic), status, optional points, optional project_id, and optional depends_on (IDs of tasks this one waits for)",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -55,7 +99,12 @@ def get_tools() -> list[Tool]:
                         "default": "open"
                     },
                     "points": {"type": "integer", "description": "Optional story points (non-negative integer)"},
-                    "project_id": {"type": "string", "description": "Project UUID to assign the task to (optional)"}
+                    "project_id": {"type": "string", "description": "Project UUID to assign the task to (optional)"},
+                    "depends_on": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "IDs of tasks that must be done before this one (optional)"
+                    }
                 },
                 "required": ["title"]
             }
@@ -69,14 +118,36 @@ def get_tools() -> list[Tool]:
                     "id": {
                         "type": "string",
                         "description": "Task UUID"
-                    }
+                    },
+                    **OUTPUT_PROPERTIES
+                },
+                "required": ["id"]
+            }
+        ),
+        Tool(
+            name="get_task_with_context",
+            description="Get a task together with its notes, project and sprint (and optionally the tasks it depends on) in one call, fetched in parallel. Use this instead of get_task followed by list_task_notes, get_project and get_sprint",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "id": {
+                        "type": "string",
+                        "description": "Task UUID"
+                    },
+                    "include": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": ["notes", "project", "sprint", "dependencies"]},
+                        "description": "Related data to add (default: [\"notes\", \"project\", \"sprint\"])"
+                    },
+                    "fields": OUTPUT_PROPERTIES["fields"],
+                    "max_bytes": OUTPUT_PROPERTIES["max_bytes"]
                 },
                 "required": ["id"]
             }
         ),
         Tool(
             name="list_tasks",
-            description="List all tasks, optionally filtered by status, kind, project_id, sprint_id, and/or date range (created_after, created_before, updated_after, updated_before; use YYYY-MM-DD or ISO datetime)",
+            description="List tasks, optionally filtered by status, kind, project_id, sprint_id, and/or date range (created_after, created_before, updated_after, updated_before; use YYYY-MM-DD or ISO datetime). Results are paginated: pass the returned cursor to get the next page. With changes_only, only tasks changed since the previous changes_only call are returned",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -113,13 +184,26 @@ def get_tools() -> list[Tool]:
                     "updated_before": {
                         "type": "string",
                         "description": "Filter: updated_at <= this date (YYYY-MM-DD or ISO datetime) (optional)"
-                    }
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum tasks to return (default: 100)"
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Cursor from a previous call to fetch the next page (optional)"
+                    },
+                    "changes_only": {
+                        "type": "boolean",
+                        "description": "Only return tasks changed since the previous changes_only call with the same filters (optional)"
+                    },
+                    **OUTPUT_PROPERTIES
                 }
             }
         ),
         Tool(
             name="update_task",
-            description="Update a task's title, description, kind (task/feature/epic/issue), status, or points",
+            description="Update a task's title, description, kind (task/feature/epic/issue), status, points, or depends_on",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -148,6 +232,11 @@ def get_tools() -> list[Tool]:
                     "points": {
                         "type": "integer",
                         "description": "New story points (optional, non-negative integer)"
+                    },
+                    "depends_on": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "New list of IDs of tasks that must be done before this one; replaces the current list (optional)"
                     }
                 },
                 "required": ["id"]
@@ -176,7 +265,8 @@ def get_tools() -> list[Tool]:
                     "task_id": {
                         "type": "string",
                         "description": "Task UUID"
-                    }
+                    },
+                    **OUTPUT_PROPERTIES
                 },
                 "required": ["task_id"]
             }
@@ -212,7 +302,8 @@ def get_tools() -> list[Tool]:
                     "project_id": {
                         "type": "string",
                         "description": "Filter sprints by project UUID (optional)"
-                    }
+                    },
+                    **OUTPUT_PROPERTIES
                 }
             }
         ),
@@ -225,16 +316,309 @@ def get_tools() -> list[Tool]:
                     "id": {
                         "type": "string",
                         "description": "Sprint UUID"
-                    }
+                    },
+                    **OUTPUT_PROPERTIES
                 },
                 "required": ["id"]
             }
+        ),
+        Tool(
+            name="get_sprint_board",
+            description="Summarize a sprint in one call: progress, task counts and points by status and kind, blocked tasks and stale tasks (no activity for a while). Use this instead of get_sprint + list_tasks + list_task_notes to see how a sprint is going.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "sprint_id": {
+                        "type": "string",
+                        "description": "Sprint UUID"
+                    },
+                    "include_notes": {
+                        "type": "boolean",
+                        "description": "Also fetch the notes of unfinished tasks: note counts and latest note for blocked/stale tasks, and notes count as activity (default: false)",
+                        "default": False
+                    },
+                    "stale_after_days": {
+                        "type": "number",
+                        "description": "Days without activity before an unfinished task is reported as stale (default: STALE_AFTER_DAYS, 7)"
+                    },
+                    "max_bytes": OUTPUT_PROPERTIES["max_bytes"]
+                },
+                "required": ["sprint_id"]
+            }
+        ),
+        Tool(
+            name="get_project_summary",
+            description="Summarize a project in one call: progress, task counts and points by status, kind and sprint, blocked tasks and stale tasks",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "project_id": {
+                        "type": "string",
+                        "description": "Project UUID"
+                    },
+                    "include_notes": {
+                        "type": "boolean",
+                        "description": "Also fetch the notes of unfinished tasks: note counts and latest note for blocked/stale tasks, and notes count as activity (default: false)",
+                        "default": False
+                    },
+                    "stale_after_days": {
+                        "type": "number",
+                        "description": "Days without activity before an unfinished task is reported as stale (default: STALE_AFTER_DAYS, 7)"
+                    },
+                    "max_bytes": OUTPUT_PROPERTIES["max_bytes"]
+                },
+                "required": ["project_id"]
+            }
+        ),
+        Tool(
+            name="search_tasks",
+            description="Full-text search over task titles, descriptions and notes, best matches first (BM25). Use this to find a task by what it is about (e.g. \"shader crash\") instead of listing tasks. Matches any of the words; put \"quoted phrases\" in double quotes. Results are paginated: pass the returned cursor to get the next page",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Words to look for"
+                    },
+                    "status": {
+                        "type": "string",
+                        "enum": ["open", "in_progress", "blocked", "closed"],
+                        "description": "Only tasks with this status (optional)"
+                    },
+                    "kind": {
+                        "type": "string",
+                        "enum": ["task", "feature", "epic", "issue"],
+                        "description": "Only tasks of this kind (optional)"
+                    },
+                    "project_id": {
+                        "type": "string",
+                        "description": "Only tasks of this project (optional)"
+                    },
+                    "sprint_id": {
+                        "type": "string",
+                        "description": "Only tasks of this sprint (optional)"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of hits per page (default: 20)",
+                        "default": 20
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Cursor returned by the previous page (optional)"
+                    },
+                    "fresh": {
+                        "type": "boolean",
+                        "description": "Sync the index with the API before searching (default: false; it is synced when older than SEARCH_MAX_STALENESS)",
+                        "default": False
+                    },
+                    **OUTPUT_PROPERTIES
+                },
+                "required": ["query"]
+            }
+        ),
+        Tool(
+            name="get_next_tasks",
+            description="Tasks that can be started now: not done, and every task in their depends_on is done. Tasks at the head of the longest chain of waiting work (chain_points) come first. Answered from the bridge's in-memory dependency graph, without fetching tasks one by one",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    **GRAPH_PROPERTIES,
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of tasks to return (default: 10)",
+                        "default": 10
+                    },
+                    **OUTPUT_PROPERTIES
+                }
+            }
+        ),
+        Tool(
+            name="get_task_order",
+            description="All unfinished tasks in dependency order (each task after the tasks it depends on), with the unfinished tasks each one still waits for. Reports cycles instead if there are any",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    **GRAPH_PROPERTIES,
+                    "include_done": {
+                        "type": "boolean",
+                        "description": "Include done tasks (default: false)",
+                        "default": False
+                    },
+                    **OUTPUT_PROPERTIES
+                }
+            }
+        ),
+        Tool(
+            name="find_dependency_cycles",
+            description="Find groups of tasks whose depends_on lists form a cycle (so none of them can ever be started)",
+            inputSchema={
+                "type": "object",
+                "properties": {**GRAPH_PROPERTIES}
+            }
+        ),
+        Tool(
+            name="get_critical_path",
+            description="The chain of dependent unfinished tasks with the most story points: the work that has to happen one task after another and bounds how soon everything can be done",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    **GRAPH_PROPERTIES,
+                    "include_done": {
+                        "type": "boolean",
+                        "description": "Include done tasks (default: false)",
+                        "default": False
+                    },
+                    "max_bytes": OUTPUT_PROPERTIES["max_bytes"]
+                }
+            }
+        ),
+        Tool(
+            name="bulk_update_tasks",
+            description="Update many tasks in one call. Requests run concurrently (or through the API's batch endpoint); returns per-item success or error",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "updates": {
+                        "type": "array",
+                        "description": "Updates to apply; each has the task id plus the fields to change",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {"type": "string", "description": "Task UUID"},
+                                "title": {"type": "string"},
+                                "description": {"type": "string"},
+                                "kind": {"type": "string", "enum": ["task", "feature", "epic", "issue"]},
+                                "status": {"type": "string", "enum": ["open", "in_progress", "blocked", "closed"]},
+                                "points": {"type": "integer"},
+                                "depends_on": {"type": "array", "items": {"type": "string"}}
+                            },
+                            "required": ["id"]
+                        }
+                    }
+                },
+                "required": ["updates"]
+            }
+        ),
+        Tool(
+            name="bulk_create_tasks",
+            description="Create many tasks in one call; returns per-item success or error",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "tasks": {
+                        "type": "array",
+                        "description": "Tasks to create (same fields as create_task)",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "title": {"type": "string"},
+                                "description": {"type": "string"},
+                                "kind": {"type": "string", "enum": ["task", "feature", "epic", "issue"]},
+                                "status": {"type": "string", "enum": ["open", "in_progress", "blocked", "closed"]},
+                                "points": {"type": "integer"},
+                                "project_id": {"type": "string"},
+                                "depends_on": {"type": "array", "items": {"type": "string"}}
+                            },
+                            "required": ["title"]
+                        }
+                    }
+                },
+                "required": ["tasks"]
+            }
+        ),
+        Tool(
+            name="bulk_create_task_notes",
+            description="Add many notes (to one or more tasks) in one call; returns per-item success or error",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "notes": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "task_id": {"type": "string", "description": "Task UUID"},
+                                "content": {"type": "string"},
+                                "author": {"type": "string"}
+                            },
+                            "required": ["task_id", "content"]
+                        }
+                    }
+                },
+                "required": ["notes"]
+            }
+        ),
+        Tool(
+            name="run_workflow",
+            description="Run a declarative workflow: a list of steps calling bridge operations (get_task, list_tasks, update_task, create_task_note, ...) with ${step.field} references between them. Independent steps run concurrently and consecutive updates of the same task are sent as one request. Returns each step's status and latency and the workflow output",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "workflow": {
+                        "type": "object",
+                        "description": "Workflow definition: {\"steps\": [{\"id\", \"call\", \"apply\" or \"value\", \"args\", \"fallback\", \"after\", \"when\", \"unless\"}], \"inputs\", \"output\"}"
+                    },
+                    "path": {
+                        "type": "string",
+                        "description": "Path of a JSON or YAML workflow file, instead of workflow"
+                    },
+                    "inputs": {
+                        "type": "object",
+                        "description": "Values for the workflow's inputs (optional)"
+                    },
+                    "dry_run": {
+                        "type": "boolean",
+                        "description": "Make the reads but only report the writes that would be sent (default: false)",
+                        "default": False
+                    },
+                    "max_bytes": OUTPUT_PROPERTIES["max_bytes"]
+                }
+            }
+        ),
+        Tool(
+            name="flush_outbox",
+            description="Send queued task updates and notes now (when OUTBOX is on, update_task and create_task_note are queued and coalesced) and show per-write results",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "task_id": {
+                        "type": "string",
+                        "description": "Only flush writes for this task (optional)"
+                    }
+                }
+            }
+        ),
+        Tool(
+            name="sync_mirror",
+            description="Sync the local task mirror with the API now (incremental unless full is set) and show its row counts and age. Requires MIRROR_DB",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "full": {
+                        "type": "boolean",
+                        "description": "Re-fetch everything instead of only tasks changed since the last sync (optional)"
+                    }
+                }
+            }
+        ),
+        Tool(
+            name="get_cache_stats",
+            description="Show the bridge's response cache counters (hits, misses, revalidations, invalidations, size), how many reads joined an identical request in flight, and HTTP transport state (retries, circuit breaker)",
+            inputSchema={"type": "object", "properties": {}}
         )
     ]
 
 async def handle_tool_call(tool_name: str, arguments: Dict[str, Any]) -> list[TextContent]:
     """Handle tool execution and return results"""
     try:
+        # The client (settings, .env, HTTP pool, mirror) is set up on the first
+        # call rather than at import, so the server starts without it
+        from bridge.client import get_client
+        from bridge.render import project, render_item, render_list
+
+        client = get_client()
+
         if tool_name == "create_project":
             result = await client.create_project(
                 name=arguments["name"],
@@ -243,10 +627,11 @@ async def handle_tool_call(tool_name: str, arguments: Dict[str, Any]) -> list[Te
             return [TextContent(type="text", text=f"Project created successfully: {result}")]
         if tool_name == "list_projects":
             result = await client.list_projects()
-            return [TextContent(type="text", text=f"Projects: {result}")]
+            text, _ = render_list("Projects", result, "project", **_output(arguments))
+            return [TextContent(type="text", text=text)]
         if tool_name == "get_project":
             result = await client.get_project(arguments["id"])
-            return [TextContent(type="text", text=f"Project: {result}")]
+            return [TextContent(type="text", text=render_item("Project", result, "project", **_output(arguments)))]
         if tool_name == "create_task":
             result = await client.create_task(
                 title=arguments["title"],
@@ -255,6 +640,7 @@ async def handle_tool_call(tool_name: str, arguments: Dict[str, Any]) -> list[Te
                 status=arguments.get("status", "open"),
                 points=arguments.get("points"),
                 project_id=arguments.get("project_id"),
+                depends_on=arguments.get("depends_on"),
             )
             return [TextContent(
                 type="text",
@@ -265,23 +651,61 @@ async def handle_tool_call(tool_name: str, arguments: Dict[str, Any]) -> list[Te
             result = await client.get_task(arguments["id"])
             return [TextContent(
                 type="text",
-                text=f"Task: {result}"
+                text=render_item("Task", result, "task", **_output(arguments))
+            )]
+
+        elif tool_name == "get_task_with_context":
+            include = arguments.get("include") or ("notes", "project", "sprint")
+            result = await client.get_task_with_context(arguments["id"], include=include)
+            if arguments.get("fields"):
+                result["task"] = project(result["task"], arguments["fields"])
+            return [TextContent(
+                type="text",
+                text=render_item("Task with context", result, "task", max_bytes=arguments.get("max_bytes"))
             )]
         
         elif tool_name == "list_tasks":
-            result = await client.list_tasks(
-                status=arguments.get("status"),
+            filters = {
+                name: arguments.get(name)
+                for name in ("status", "kind", "project_id", "sprint_id", "created_after",
+                             "created_before", "updated_after", "updated_before")
+            }
+            limit = arguments.get("limit", 100)
+            if arguments.get("changes_only"):
+                result = await client.task_changes(limit=limit, **filters)
+                text, shown = render_list("Changed tasks", result["tasks"], "task", **_output(arguments))
+                if shown < len(result["tasks"]):
+                    # Hand out only what was shown; the rest comes back on the next call
+                    result["high_water"] = client.rewind_changes(result["tasks"][:shown], **filters)
+                text += f"\nHigh-water mark: {result['high_water']}"
+                if result["more"] or shown < len(result["tasks"]):
+                    text += "\nMore changes pending; call again to fetch them."
+            else:
+                page = await client.list_tasks_page(limit=limit, cursor=arguments.get("cursor"), **filters)
+                text, shown = render_list("Tasks", page["tasks"], "task", **_output(arguments))
+                next_cursor = page["next_cursor"]
+                if shown < len(page["tasks"]):
+                    next_cursor = client.task_cursor(page["offset"] + shown, **filters)
+                if next_cursor:
+                    text += f"\nMore tasks available. next cursor: {next_cursor}"
+            return [TextContent(
+                type="text",
+                text=text
+            )]
+        
+        elif tool_name == "update_task" and client.outbox is not None:
+            result = client.queue_task_update(
+                arguments["id"],
+                title=arguments.get("title"),
+                description=arguments.get("description"),
                 kind=arguments.get("kind"),
-                project_id=arguments.get("project_id"),
-                sprint_id=arguments.get("sprint_id"),
-                created_after=arguments.get("created_after"),
-                created_before=arguments.get("created_before"),
-                updated_after=arguments.get("updated_after"),
-                updated_before=arguments.get("updated_before")
+                status=arguments.get("status"),
+                points=arguments.get("points"),
+                depends_on=arguments.get("depends_on")
             )
             return [TextContent(
                 type="text",
-                text=f"Tasks: {result}"
+                text=f"Task update queued: {result}"
             )]
         
         elif tool_name == "update_task":
@@ -291,7 +715,8 @@ async def handle_tool_call(tool_name: str, arguments: Dict[str, Any]) -> list[Te
                 description=arguments.get("description"),
                 kind=arguments.get("kind"),
                 status=arguments.get("status"),
-                points=arguments.get("points")
+                points=arguments.get("points"),
+                depends_on=arguments.get("depends_on")
             )
             return [TextContent(
                 type="text",
@@ -307,9 +732,21 @@ async def handle_tool_call(tool_name: str, arguments: Dict[str, Any]) -> list[Te
         
         elif tool_name == "list_task_notes":
             result = await client.list_task_notes(arguments["task_id"])
+            text, _ = render_list("Notes", result, "note", **_output(arguments))
+            return [TextContent(
+                type="text",
+                text=text
+            )]
+        
+        elif tool_name == "create_task_note" and client.outbox is not None:
+            result = client.queue_task_note(
+                arguments["task_id"],
+                content=arguments["content"],
+                author=arguments.get("author")
+            )
             return [TextContent(
                 type="text",
-                text=f"Notes: {result}"
+                text=f"Note queued: {result}"
             )]
         
         elif tool_name == "create_task_note":
@@ -325,16 +762,130 @@ async def handle_tool_call(tool_name: str, arguments: Dict[str, Any]) -> list[Te
         
         elif tool_name == "list_sprints":
             result = await client.list_sprints(project_id=arguments.get("project_id"))
+            text, _ = render_list("Sprints", result, "sprint", **_output(arguments))
             return [TextContent(
                 type="text",
-                text=f"Sprints: {result}"
+                text=text
             )]
         
         elif tool_name == "get_sprint":
             result = await client.get_sprint(arguments["id"])
             return [TextContent(
                 type="text",
-                text=f"Sprint: {result}"
+                text=render_item("Sprint", result, "sprint", **_output(arguments))
+            )]
+
+        elif tool_name in ("get_sprint_board", "get_project_summary"):
+            options = {
+                "include_notes": arguments.get("include_notes", False),
+                "stale_after_days": arguments.get("stale_after_days"),
+            }
+            if tool_name == "get_sprint_board":
+                result = await client.sprint_board(arguments["sprint_id"], **options)
+                label = "Sprint board"
+            else:
+                result = await client.project_summary(arguments["project_id"], **options)
+                label = "Project summary"
+            return [TextContent(
+                type="text",
+                text=render_item(label, result, "summary", max_bytes=arguments.get("max_bytes"))
+            )]
+
+        elif tool_name == "search_tasks":
+            filters = {k: arguments.get(k) for k in ("status", "kind", "project_id", "sprint_id")}
+            page = await client.search_tasks(
+                arguments["query"],
+                limit=arguments.get("limit", 20),
+                cursor=arguments.get("cursor"),
+                fresh=arguments.get("fresh", False),
+                **filters,
+            )
+            text, shown = render_list("Matches", page["hits"], "hit", **_output(arguments))
+            next_cursor = page["next_cursor"]
+            if shown < len(page["hits"]):
+                next_cursor = client.search_cursor(arguments["query"], page["offset"] + shown, **filters)
+            if not page["hits"]:
+                text = f"No tasks match: {arguments['query']}"
+            elif next_cursor:
+                text += f"\nMore matches available. next cursor: {next_cursor}"
+            return [TextContent(
+                type="text",
+                text=text
+            )]
+
+        elif tool_name in ("get_next_tasks", "get_task_order", "find_dependency_cycles", "get_critical_path"):
+            from bridge.graph import CycleError
+
+            graph = await client.task_graph(refresh=arguments.get("refresh", False))
+            project_id = arguments.get("project_id")
+            try:
+                if tool_name == "get_next_tasks":
+                    result = graph.ready(project_id, limit=arguments.get("limit", 10))
+                    text, _ = render_list("Next tasks", result, "task", **_output(arguments))
+                elif tool_name == "get_task_order":
+                    order = graph.order(project_id, include_done=arguments.get("include_done", False))
+                    result = [graph.brief(task_id, blocked_by=graph.blockers(task_id)) for task_id in order]
+                    text, _ = render_list("Task order", result, "task", **_output(arguments))
+                elif tool_name == "find_dependency_cycles":
+                    cycles = graph.cycles(project_id)
+                    text = render_item("Dependency cycles", [[graph.brief(i) for i in c] for c in cycles], "task") \
+                        if cycles else f"No dependency cycles among {len(graph)} tasks"
+                else:
+                    result = graph.critical_path(project_id, include_done=arguments.get("include_done", False))
+                    text = render_item("Critical path", result, "task", max_bytes=arguments.get("max_bytes"))
+            except CycleError as e:
+                text = f"No order exists until these dependency cycles are broken: {e.cycles}"
+            return [TextContent(
+                type="text",
+                text=text
+            )]
+        
+        elif tool_name in ("bulk_update_tasks", "bulk_create_tasks", "bulk_create_task_notes"):
+            if tool_name == "bulk_update_tasks":
+                results = await client.bulk_update_tasks(arguments["updates"])
+            elif tool_name == "bulk_create_tasks":
+                results = await client.bulk_create_tasks(arguments["tasks"])
+            else:
+                results = await client.bulk_create_task_notes(arguments["notes"])
+            succeeded = sum(1 for r in results if r["ok"])
+            return [TextContent(
+                type="text",
+                text=f"{succeeded}/{len(results)} succeeded: {results}"
+            )]
+        
+        elif tool_name == "run_workflow":
+            from bridge.workflow import Workflow
+
+            if arguments.get("path"):
+                workflow = Workflow.load(arguments["path"])
+            else:
+                workflow = Workflow.from_dict(arguments.get("workflow"))
+            result = await workflow.run(client, arguments.get("inputs"), dry_run=arguments.get("dry_run", False))
+            return [TextContent(
+                type="text",
+                text=render_item("Workflow", result, "workflow", max_bytes=arguments.get("max_bytes"))
+            )]
+        
+        elif tool_name == "flush_outbox":
+            result = await client.flush_outbox(task_id=arguments.get("task_id"))
+            return [TextContent(
+                type="text",
+                text=f"Outbox flushed: {result}"
+            )]
+        
+        elif tool_name == "sync_mirror":
+            result = await client.sync_mirror(full=arguments.get("full", False))
+            return [TextContent(
+                type="text",
+                text=f"Mirror synced: {result}"
+            )]
+        
+        elif tool_name == "get_cache_stats":
+            result = client.cache_stats()
+            return [TextContent(
+                type="text",
+                text=(f"Cache stats: {result}\nCoalesced reads: {client.coalesce_stats()}"
+                      f"\nTransport: {client.transport_stats()}")
             )]
         
         else:
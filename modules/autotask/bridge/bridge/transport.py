@@ -0,0 +1,133 @@
+import asyncio
+import random
+import time
+from typing import Optional
+
+import httpx
+
+# Methods that can be sent again without changing the outcome
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Statuses worth retrying: the request did not reach the application or it asked us to come back
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without contacting the API while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    After ``threshold`` failures in a row (transport errors or 5xx) the
+    circuit opens and calls fail immediately. After ``reset_after`` seconds
+    one trial request is let through: success closes the circuit, failure
+    opens it for another period.
+    """
+
+    def __init__(self, threshold: int = 5, reset_after: float = 30.0):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half-open"
+        return "open"
+
+    def before(self) -> bool:
+        """Raise CircuitOpenError unless a request may be sent now; True if it is the half-open trial"""
+        if self.threshold <= 0:
+            return False
+        state = self.state
+        if state == "open" or (state == "half-open" and self._trial):
+            self.rejected += 1
+            retry_in = max(0.0, self.reset_after - (time.monotonic() - self.opened_at))
+            raise CircuitOpenError(f"API unavailable (circuit open, retrying in {retry_in:.1f}s)")
+        if state == "half-open":
+            self._trial = True
+            return True
+        return False
+
+    def success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def abandon(self) -> None:
+        """The trial request ended without an answer (e.g. cancelled): let the next request be the trial"""
+        self._trial = False
+
+    def failure(self) -> None:
+        self.failures += 1
+        self._trial = False
+        if self.threshold > 0 and (self.failures >= self.threshold or self.opened_at is not None):
+            self.opened_at = time.monotonic()
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """Wraps a transport with jittered retries for idempotent requests and a circuit breaker.
+
+    A request is retried when its method is idempotent or it carries an
+    ``Idempotency-Key`` header, after a transport error or a 429/502/503/504,
+    with "full jitter" exponential backoff (``Retry-After`` is honoured when
+    the API sends it). Other requests are sent once.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, retries: int = 3, backoff: float = 0.2,
+                 max_backoff: float = 5.0, breaker: Optional[CircuitBreaker] = None):
+        self.transport = transport
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.retried = 0
+
+    def _delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None:
+            try:
+                return min(self.max_backoff, float(response.headers.get("retry-after", "")))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        retryable = request.method in IDEMPOTENT_METHODS or "idempotency-key" in request.headers
+        attempts = self.retries + 1 if retryable else 1
+        for attempt in range(attempts):
+            trial = self.breaker.before()
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError:
+                self.breaker.failure()
+                if attempt + 1 >= attempts:
+                    raise
+                await asyncio.sleep(self._delay(attempt, None))
+                self.retried += 1
+                continue
+            except BaseException:
+                # Cancelled, or failed outside the transport: the outcome is
+                # unknown, but a half-open circuit must not keep waiting for it
+                if trial:
+                    self.breaker.abandon()
+                raise
+            if response.status_code >= 500:
+                self.breaker.failure()
+            else:
+                self.breaker.success()
+            if response.status_code not in RETRY_STATUSES or attempt + 1 >= attempts:
+                return response
+            await response.aread()
+            await response.aclose()
+            await asyncio.sleep(self._delay(attempt, response))
+            self.retried += 1
+        raise AssertionError("unreachable")
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -0,0 +1,443 @@
+import asyncio
+import inspect
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+# Client methods a step may call, and whether they change data (not sent on a dry run)
+CALLS = {
+    "get_task": False,
+    "get_task_with_context": False,
+    "list_tasks": False,
+    "list_task_notes": False,
+    "list_projects": False,
+    "get_project": False,
+    "list_sprints": False,
+    "get_sprint": False,
+    "search_tasks": False,
+    "sprint_board": False,
+    "project_summary": False,
+    "create_project": True,
+    "create_task": True,
+    "update_task": True,
+    "delete_task": True,
+    "create_task_note": True,
+    "bulk_update_tasks": True,
+    "bulk_create_tasks": True,
+    "bulk_create_task_notes": True,
+}
+
+
+def append_once(text: Optional[str], suffix: str) -> str:
+    """``text`` (stripped) with ``suffix`` appended unless it already contains it; the bare suffix if empty"""
+    text = (text or "").strip()
+    if suffix in text:
+        return text
+    return f"{text}{suffix}" if text else suffix.strip()
+
+
+# Local functions an "apply" step may compute its result with (no request is made)
+FUNCTIONS = {
+    "append_once": append_once,
+}
+
+_STEP_KEYS = {"id", "call", "apply", "args", "fallback", "value", "after", "when", "unless", "merge"}
+
+# ${step.path.to.value}, with "||" between alternatives
+_REF = re.compile(r"\$\{([^}]*)\}")
+
+
+class WorkflowError(ValueError):
+    """Raised for a workflow definition that cannot be run"""
+
+
+def _alternatives(expression: str) -> List[List[str]]:
+    return [alt.strip().split(".") for alt in expression.split("||")]
+
+
+def _refs(value: Any) -> Set[str]:
+    """Names (step IDs or "inputs") referenced anywhere in ``value``"""
+    if isinstance(value, str):
+        return {path[0] for match in _REF.findall(value) for path in _alternatives(match)}
+    if isinstance(value, dict):
+        return set().union(*(_refs(v) for v in value.values()))
+    if isinstance(value, list):
+        return set().union(*(_refs(v) for v in value))
+    return set()
+
+
+def _lookup(path: List[str], scope: Dict[str, Any]) -> Any:
+    value = scope.get(path[0])
+    for part in path[1:]:
+        if isinstance(value, list):
+            try:
+                value = value[int(part)]
+            except (ValueError, IndexError):
+                return None
+        elif isinstance(value, dict):
+            value = value.get(part)
+        else:
+            return None
+    return value
+
+
+def _evaluate(expression: str, scope: Dict[str, Any]) -> Any:
+    """The first alternative with a value that is not None or empty"""
+    value = None
+    for path in _alternatives(expression):
+        value = _lookup(path, scope)
+        if value not in (None, "", [], {}):
+            return value
+    return value
+
+
+def resolve(value: Any, scope: Dict[str, Any]) -> Any:
+    """Substitute references; a string that is a single reference takes the referenced value as-is"""
+    if isinstance(value, str):
+        whole = _REF.fullmatch(value)
+        if whole:
+            return _evaluate(whole.group(1), scope)
+        return _REF.sub(lambda m: "" if (v := _evaluate(m.group(1), scope)) is None else str(v), value)
+    if isinstance(value, dict):
+        return {k: resolve(v, scope) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve(v, scope) for v in value]
+    return value
+
+
+@dataclass
+class Step:
+    id: str
+    call: Optional[str] = None
+    apply: Optional[str] = None
+    args: Dict[str, Any] = field(default_factory=dict)
+    fallback: Optional[Dict[str, Any]] = None
+    value: Any = None
+    after: List[str] = field(default_factory=list)
+    when: Optional[str] = None
+    unless: Optional[str] = None
+    merge: bool = True
+
+    @property
+    def uses(self) -> Set[str]:
+        """Steps whose results this step reads"""
+        return _refs([self.args, self.fallback, self.value, self.when, self.unless]) - {"inputs"}
+
+    @property
+    def needs(self) -> Set[str]:
+        """Steps that must finish before this one starts"""
+        return self.uses | set(self.after)
+
+    @property
+    def writes(self) -> bool:
+        return bool(self.call and CALLS[self.call])
+
+
+@dataclass
+class _Node:
+    """One unit of execution: a step, or consecutive updates of a task merged into one request"""
+
+    steps: List[Step]
+    needs: Set[str]
+
+    @property
+    def head(self) -> Step:
+        return self.steps[-1]
+
+
+class Workflow:
+    """A declarative list of bridge calls with data dependencies between them.
+
+    A step calls a client method (``call`` with ``args``), computes a
+    ``value``, or applies a local function from ``FUNCTIONS`` (``apply``
+    with ``args``). A call with ``fallback`` args is made once more with
+    them if it fails. Strings in args and values may reference the inputs
+    and earlier results, ``${inputs.name}`` or ``${step.field.0.field}``;
+    ``${a || b}`` takes the first that has a value. A step waits for the
+    steps it references and those named in ``after``, and runs as soon as
+    they are done, so independent steps run concurrently. ``when``/``unless`` skip a
+    step on a falsy/truthy reference; a skipped step's result is None.
+
+    ``update_task`` steps that follow one another on the same task are sent
+    as one request (later fields win) when nothing reads the earlier
+    step's result; ``"merge": false`` keeps a step's update separate.
+    """
+
+    def __init__(self, steps: List[Step], name: str = "workflow", inputs: Optional[Dict[str, Any]] = None,
+                 output: Any = None, description: Optional[str] = None):
+        self.name = name
+        self.description = description
+        self.steps = steps
+        self.inputs = dict(inputs or {})
+        self.output = output
+        self._validate()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Workflow":
+        if not isinstance(data, dict) or not isinstance(data.get("steps"), list) or not data["steps"]:
+            raise WorkflowError("A workflow needs a non-empty 'steps' list")
+        steps = []
+        for i, raw in enumerate(data["steps"]):
+            if not isinstance(raw, dict) or not raw.get("id"):
+                raise WorkflowError(f"Step {i + 1} needs an 'id'")
+            unknown = set(raw) - _STEP_KEYS
+            if unknown:
+                raise WorkflowError(f"Step {raw['id']!r} has unknown keys: {sorted(unknown)}")
+            after = raw.get("after") or []
+            steps.append(Step(
+                id=str(raw["id"]),
+                call=raw.get("call"),
+                apply=raw.get("apply"),
+                args=raw.get("args") or {},
+                fallback=raw.get("fallback"),
+                value=raw.get("value"),
+                after=[after] if isinstance(after, str) else list(after),
+                when=raw.get("when"),
+                unless=raw.get("unless"),
+                merge=raw.get("merge", True),
+            ))
+        return cls(steps, name=data.get("name", "workflow"), inputs=data.get("inputs"),
+                   output=data.get("output"), description=data.get("description"))
+
+    @classmethod
+    def load(cls, path: str) -> "Workflow":
+        """Read a workflow from a JSON or YAML (needs PyYAML) file"""
+        path = Path(path).expanduser()
+        text = path.read_text(encoding="utf-8")
+        if path.suffix in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise WorkflowError("YAML workflows need PyYAML: pip install -e \".[yaml]\"") from None
+            return cls.from_dict(yaml.safe_load(text))
+        return cls.from_dict(json.loads(text))
+
+    def _validate(self) -> None:
+        ids = [s.id for s in self.steps]
+        if len(set(ids)) != len(ids):
+            raise WorkflowError(f"Duplicate step IDs: {sorted({i for i in ids if ids.count(i) > 1})}")
+        if "inputs" in ids:
+            raise WorkflowError("'inputs' cannot be used as a step ID")
+        for step in self.steps:
+            if [step.call, step.apply, step.value].count(None) != 2:
+                raise WorkflowError(f"Step {step.id!r} needs exactly one of 'call', 'apply' or 'value'")
+            if not isinstance(step.args, dict):
+                raise WorkflowError(f"Step {step.id!r}: 'args' must be an object")
+            if step.fallback is not None and (step.call is None or not isinstance(step.fallback, dict)):
+                raise WorkflowError(f"Step {step.id!r}: 'fallback' must be an object of args for its 'call'")
+            if step.call is not None and step.call not in CALLS:
+                raise WorkflowError(f"Step {step.id!r} calls unknown method {step.call!r}; expected one of {sorted(CALLS)}")
+            if step.apply is not None and step.apply not in FUNCTIONS:
+                raise WorkflowError(f"Step {step.id!r} applies unknown function {step.apply!r}; expected one of {sorted(FUNCTIONS)}")
+            missing = step.needs - set(ids)
+            if missing:
+                raise WorkflowError(f"Step {step.id!r} refers to unknown steps: {sorted(missing)}")
+        self.plan()
+
+    def _mergeable(self, step: Step) -> bool:
+        return (step.call == "update_task" and step.merge and step.when is None and step.unless is None
+                and step.fallback is None and isinstance(step.args.get("task_id"), str))
+
+    def plan(self, merge: bool = True) -> List[_Node]:
+        """Execution units in dependency order, with mergeable updates combined.
+
+        Raises WorkflowError when steps wait for each other in a cycle.
+        """
+        by_id = {s.id: s for s in self.steps}
+        used = set().union(*(s.uses for s in self.steps))
+        owner: Dict[str, _Node] = {}
+        nodes: List[_Node] = []
+        for step in self._ordered(by_id):
+            node = None
+            if merge and self._mergeable(step):
+                for dep in step.after:
+                    candidate = owner[dep]
+                    if (candidate.head.id == dep and self._mergeable(candidate.head)
+                            and candidate.head.args["task_id"] == step.args["task_id"]
+                            and not {s.id for s in candidate.steps} & used
+                            and not self._reaches(candidate, step.needs - {dep}, owner)):
+                        node = candidate
+                        break
+            if node is None:
+                node = _Node([step], set(step.needs))
+                nodes.append(node)
+            else:
+                node.steps.append(step)
+                node.needs |= step.needs - {s.id for s in node.steps}
+            owner[step.id] = node
+        return nodes
+
+    @staticmethod
+    def _reaches(target: _Node, starts: Set[str], owner: Dict[str, _Node]) -> bool:
+        """Whether any of ``starts`` is ``target`` or waits for it, directly or not"""
+        seen: Set[int] = set()
+        stack = [owner[s] for s in starts]
+        while stack:
+            node = stack.pop()
+            if node is target:
+                return True
+            if id(node) not in seen:
+                seen.add(id(node))
+                stack.extend(owner[s] for s in node.needs)
+        return False
+
+    def _ordered(self, by_id: Dict[str, Step]) -> List[Step]:
+        """Steps with each after the steps it needs, definition order on ties"""
+        position = {s.id: i for i, s in enumerate(self.steps)}
+        waiting = {s.id: len(s.needs) for s in self.steps}
+        dependents: Dict[str, List[str]] = {}
+        for step in self.steps:
+            for dep in step.needs:
+                dependents.setdefault(dep, []).append(step.id)
+        ready = sorted((i for i, n in waiting.items() if n == 0), key=position.get)
+        ordered = []
+        while ready:
+            current = ready.pop(0)
+            ordered.append(by_id[current])
+            for dependent in dependents.get(current, ()):
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+                    ready.sort(key=position.get)
+        if len(ordered) < len(self.steps):
+            stuck = sorted(i for i, n in waiting.items() if n > 0)
+            raise WorkflowError(f"Steps wait for each other in a cycle: {stuck}")
+        return ordered
+
+    def check_calls(self, client: Any) -> None:
+        """Check every step's arguments against the client method or function it calls"""
+        for step in self.steps:
+            if step.value is not None:
+                continue
+            target = FUNCTIONS[step.apply] if step.apply else getattr(client, step.call)
+            try:
+                for args in (step.args, step.fallback):
+                    if args is not None:
+                        inspect.signature(target).bind(**args)
+            except TypeError as e:
+                raise WorkflowError(f"Step {step.id!r}: {e}") from None
+
+    async def run(self, client: Any, inputs: Optional[Dict[str, Any]] = None, dry_run: bool = False,
+                  merge: bool = True, concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """Run the workflow with ``client`` and report every step's outcome and timing.
+
+        On a dry run reads are made (so later steps see real data) but writes
+        are not sent; their resolved requests are reported instead. A step
+        that fails stops the steps that need it; the others go on.
+        ``concurrency`` caps the requests in flight (default: no cap).
+        """
+        unknown = set(inputs or {}) - set(self.inputs)
+        if unknown:
+            raise WorkflowError(f"Unknown inputs: {sorted(unknown)}; expected {sorted(self.inputs)}")
+        self.check_calls(client)
+        scope: Dict[str, Any] = {"inputs": {**self.inputs, **(inputs or {})}}
+        report: Dict[str, Dict[str, Any]] = {s.id: {"id": s.id, "call": s.call or s.apply or "value"}
+                                             for s in self.steps}
+        semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+        nodes = self.plan(merge)
+        owner = {s.id: node for node in nodes for s in node.steps}
+        tasks: Dict[int, asyncio.Task] = {}
+        started = time.perf_counter()
+
+        def elapsed() -> float:
+            return round((time.perf_counter() - started) * 1000, 1)
+
+        async def send(call: str, args: Dict[str, Any]) -> Any:
+            if semaphore is None:
+                return await getattr(client, call)(**args)
+            async with semaphore:
+                return await getattr(client, call)(**args)
+
+        async def execute(node: _Node) -> bool:
+            """Run a node once its dependencies are done; False if it (or one of them) failed"""
+            deps = {id(owner[s]) for s in node.needs}
+            if not all(await asyncio.gather(*(tasks[d] for d in deps))):
+                for step in node.steps:
+                    report[step.id]["status"] = "blocked"
+                return False
+            head = node.head
+            entry = report[head.id]
+            if (head.when is not None and not resolve(head.when, scope)) or \
+                    (head.unless is not None and resolve(head.unless, scope)):
+                entry["status"] = "skipped"
+                scope[head.id] = None
+                return True
+            if head.value is not None:
+                scope[head.id] = resolve(head.value, scope)
+                entry["status"] = "ok"
+                return True
+            if head.apply is not None:
+                try:
+                    scope[head.id] = FUNCTIONS[head.apply](**resolve(head.args, scope))
+                except Exception as e:
+                    entry.update(status="failed", error=str(e).split("\n", 1)[0])
+                    return False
+                entry["status"] = "ok"
+                return True
+            args: Dict[str, Any] = {}
+            for step in node.steps:
+                args.update(resolve(step.args, scope))
+            if len(node.steps) > 1:
+                entry["merged"] = [s.id for s in node.steps[:-1]]
+            entry["started_ms"] = elapsed()
+            try:
+                if dry_run and head.writes:
+                    entry["request"] = args
+                    result = _stand_in(head, args)
+                else:
+                    try:
+                        result = await send(head.call, args)
+                    except Exception:
+                        if head.fallback is None:
+                            raise
+                        entry["fallback"] = True
+                        result = await send(head.call, resolve(head.fallback, scope))
+            except Exception as e:
+                entry.update(status="failed", error=str(e).split("\n", 1)[0],
+                             ms=round(elapsed() - entry["started_ms"], 1))
+                for step in node.steps[:-1]:
+                    report[step.id].update(status="failed", merged_into=head.id)
+                return False
+            entry.update(status="planned" if dry_run and head.writes else "ok",
+                         ms=round(elapsed() - entry["started_ms"], 1))
+            for step in node.steps[:-1]:
+                report[step.id].update(status=entry["status"], merged_into=head.id)
+            for step in node.steps:
+                scope[step.id] = result
+            return True
+
+        for node in nodes:
+            tasks[id(node)] = asyncio.ensure_future(execute(node))
+        outcomes = await asyncio.gather(*tasks.values())
+        if self.output is not None:
+            output = resolve(self.output, scope)
+        else:
+            sinks = {s.id for s in self.steps} - set().union(*(s.needs for s in self.steps))
+            output = {i: scope.get(i) for i in sinks}
+        return {
+            "workflow": self.name,
+            "ok": all(outcomes),
+            "dry_run": dry_run,
+            "ms": elapsed(),
+            "calls": sum(1 for n in nodes if n.head.call and report[n.head.id].get("status") in ("ok", "failed")),
+            "steps": [report[s.id] for s in self.steps],
+            "output": output,
+        }
+
+
+def _stand_in(step: Step, args: Dict[str, Any]) -> Any:
+    """What a write would probably return, so later steps of a dry run can refer to it"""
+    if step.call == "delete_task":
+        return None
+    if step.call.startswith("bulk_"):
+        items = next(iter(args.values()), [])
+        return [{"ok": True, "result": item} for item in items]
+    fields = {k: v for k, v in args.items() if k not in ("task_id", "idempotency_key")}
+    if step.call == "update_task":
+        return {"id": args.get("task_id"), **fields}
+    if step.call == "create_task_note":
+        return {"id": f"dry-run:{step.id}", "task_id": args.get("task_id"), **fields}
+    return {"id": f"dry-run:{step.id}", **fields}
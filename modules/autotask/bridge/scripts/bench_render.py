@@ -0,0 +1,80 @@
+"""Benchmark: size and serialization time of tool results, repr vs compact output.
+
+Usage:
+    uv run python scripts/bench_render.py [--tasks N] [--iterations K]
+
+Renders a list of N realistic task dicts the old way (``f"Tasks: {result}"``)
+and with bridge.render in each output mode. Install the ``fast`` extra to
+include orjson.
+"""
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Allow importing bridge package when run as script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bridge import render
+
+
+def make_tasks(n: int):
+    project = str(uuid.uuid4())
+    sprint = str(uuid.uuid4())
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"Implement part {i} of the feature",
+            "description": "Longer free-form description of the work, acceptance criteria and links. " * 3,
+            "kind": ("task", "feature", "issue")[i % 3],
+            "status": ("open", "in_progress", "blocked", "closed")[i % 4],
+            "points": i % 8,
+            "project_id": project,
+            "sprint_id": sprint if i % 2 else None,
+            "created_at": "2025-01-01T12:00:00.000000+00:00",
+            "updated_at": "2025-01-02T08:30:00.000000+00:00",
+        }
+        for i in range(n)
+    ]
+
+
+def measure(label: str, fn, iterations: int) -> None:
+    times = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        text = fn()
+        times.append(time.perf_counter() - started)
+    size = len(text.encode())
+    print(f"  {label:<34} {size:>10,} bytes  {statistics.median(times) * 1000:8.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tool result size/time benchmark")
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    tasks = make_tasks(args.tasks)
+    unlimited = 1 << 40
+    fields = ["id", "title", "status", "points"]
+
+    encoders = [("json", None)]
+    if render.orjson is not None:
+        encoders.append(("orjson", render.orjson))
+    print(f"{args.tasks} tasks, median of {args.iterations} runs")
+    measure("repr (before)", lambda: f"Tasks: {tasks}", args.iterations)
+    for name, module in encoders:
+        render.orjson = module
+        measure(f"{name}: full objects", lambda: render.render_list("Tasks", tasks, "task", max_bytes=unlimited)[0],
+                args.iterations)
+        measure(f"{name}: fields={','.join(fields)}",
+                lambda: render.render_list("Tasks", tasks, "task", fields, max_bytes=unlimited)[0], args.iterations)
+        measure(f"{name}: table", lambda: render.render_list("Tasks", tasks, "task", fmt="table",
+                                                            max_bytes=unlimited)[0], args.iterations)
+        measure(f"{name}: default budget ({render.DEFAULT_MAX_BYTES} B)",
+                lambda: render.render_list("Tasks", tasks, "task")[0], args.iterations)
+
+
+if __name__ == "__main__":
+    main()
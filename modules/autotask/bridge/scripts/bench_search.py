@@ -0,0 +1,124 @@
+"""Benchmark: search_tasks index vs scanning the task list, with tens of thousands of tasks.
+
+Usage:
+    uv run python scripts/bench_search.py [--tasks N] [--notes M] [--iterations K]
+
+Builds a synthetic corpus of N tasks (M of them with a note), indexes it
+with bridge.search in a temporary database, then times ranked queries
+(first and later pages), an incremental update of 100 changed tasks, and
+reopening the index, against a naive scan of the full task list (what an
+agent does with a list_tasks dump).
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+# Allow importing bridge package when run as script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bridge.search import SearchIndex
+
+WORDS = (
+    "shader crash vulkan opengl texture physics collision animation tween signal scene node import export "
+    "editor inspector gizmo viewport camera light shadow mesh material particle audio bus stream network "
+    "peer rpc sync lobby menu button label theme font locale save load resource cache memory leak slow "
+    "startup build android ios web desktop input gamepad touch keyboard tilemap navigation path agent"
+).split()
+
+QUERIES = ["shader crash", "memory leak", "gamepad input android", '"save load"', "tilemap navigation agent"]
+
+
+def make_corpus(tasks: int, notes: int):
+    rng = random.Random(7)
+    # Domain words plus filler, drawn with Zipf-like frequencies like real text
+    vocabulary = list(WORDS) + [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9))) for _ in range(5000)
+    ]
+    rng.shuffle(vocabulary)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+
+    def text(n: int) -> str:
+        return " ".join(rng.choices(vocabulary, weights, k=n))
+
+    corpus, task_notes = [], {}
+    for i in range(tasks):
+        task = {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "title": text(6).capitalize(),
+            "description": text(40),
+            "status": ("open", "in_progress", "blocked", "closed")[i % 4],
+            "kind": ("task", "feature", "issue")[i % 3],
+            "updated_at": f"2026-01-01T00:00:{i % 60:02d}.{i:06d}+00:00",
+        }
+        corpus.append(task)
+        if i < notes:
+            task_notes[task["id"]] = [{"id": f"n{i}", "content": text(25)}]
+    return corpus, task_notes
+
+
+def scan(corpus, query: str):
+    """What the model does with a list dump: keep tasks mentioning any word"""
+    words = query.replace('"', "").lower().split()
+    return [t for t in corpus if any(w in (t["title"] + " " + t["description"]).lower() for w in words)]
+
+
+def fmt(samples: list) -> str:
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return f"median {statistics.median(samples) * 1000:8.2f} ms   p95 {p95 * 1000:8.2f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=30000)
+    parser.add_argument("--notes", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    corpus, notes = make_corpus(args.tasks, args.notes)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "search.db")
+        index = SearchIndex(path)
+        start = time.perf_counter()
+        index.apply(corpus, max(t["updated_at"] for t in corpus), time.time(), notes=notes,
+                    listed=[t["id"] for t in corpus])
+        print(f"{args.tasks} tasks, {len(notes)} with notes; full build {time.perf_counter() - start:.2f} s")
+
+        for label, offset in (("first page", 0), ("page 5    ", 80)):
+            samples = []
+            for _ in range(args.iterations):
+                for query in QUERIES:
+                    start = time.perf_counter()
+                    index.search(query, limit=20, offset=offset)
+                    samples.append(time.perf_counter() - start)
+            print(f"search {label}      : {fmt(samples)}")
+
+        samples = []
+        for _ in range(max(1, args.iterations // 4)):
+            for query in QUERIES:
+                start = time.perf_counter()
+                scan(corpus, query)
+                samples.append(time.perf_counter() - start)
+        print(f"scan of the list dump  : {fmt(samples)}   (unranked, no notes)")
+
+        changed = [dict(t, title=t["title"] + " regression", updated_at="2026-02-01T00:00:00+00:00")
+                   for t in corpus[:100]]
+        start = time.perf_counter()
+        index.apply(changed, "2026-02-01T00:00:00+00:00", time.time())
+        print(f"incremental, 100 tasks : {(time.perf_counter() - start) * 1000:8.2f} ms")
+        index.close()
+
+        start = time.perf_counter()
+        reopened = SearchIndex(path)
+        hits, _ = reopened.search("regression", limit=5)
+        print(f"reopen + first search  : {(time.perf_counter() - start) * 1000:8.2f} ms   top hit: {hits[0]['title']!r}")
+        reopened.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark: server cold start, from process spawn to the first list_tools response.
+
+Usage:
+    uv run python scripts/bench_startup.py [--iterations K] [--python PATH]
+
+Starts ``python -m bridge`` the way an MCP client does, sends initialize,
+the initialized notification and tools/list over stdio, and times the
+initialize response and the tools/list response from spawn. Each run is a
+fresh process, so imports are paid every time (bytecode caches are warmed
+by one untimed run first). No API is needed: the client is only created by
+the first tool call.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MODULE = "bridge"
+
+REQUESTS = [
+    {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "bench-startup", "version": "0"},
+    }},
+    {"jsonrpc": "2.0", "method": "notifications/initialized"},
+    {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+]
+
+
+def start_once(python: str) -> tuple:
+    """Spawn the server; returns (seconds to initialize reply, seconds to tools/list reply, tool count)"""
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [python, "-m", MODULE], cwd=ROOT, env=env,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    try:
+        proc.stdin.write("".join(json.dumps(r) + "\n" for r in REQUESTS))
+        proc.stdin.flush()
+        initialized = None
+        for line in proc.stdout:
+            message = json.loads(line)
+            if message.get("id") == 1:
+                initialized = time.perf_counter() - start
+            elif message.get("id") == 2:
+                if "error" in message:
+                    raise RuntimeError(f"tools/list failed: {message['error']}")
+                return initialized, time.perf_counter() - start, len(message["result"]["tools"])
+        raise RuntimeError(f"server exited with {proc.wait()} before answering tools/list")
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def fmt(samples: list) -> str:
+    return (f"median {statistics.median(samples) * 1000:8.1f} ms   min {min(samples) * 1000:8.1f} ms"
+            f"   max {max(samples) * 1000:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--python", default=sys.executable, help="Interpreter to start the server with")
+    args = parser.parse_args()
+
+    start_once(args.python)  # warm the bytecode cache
+    runs = [start_once(args.python) for _ in range(args.iterations)]
+    print(f"{MODULE}: {runs[0][2]} tools, {args.iterations} cold starts ({args.python})")
+    print(f"spawn -> initialize : {fmt([r[0] for r in runs])}")
+    print(f"spawn -> tools/list : {fmt([r[1] for r in runs])}")
+
+
+if __name__ == "__main__":
+    main()
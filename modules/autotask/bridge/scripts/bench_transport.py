@@ -0,0 +1,131 @@
+"""Benchmark: the bridge's HTTP transport against a slow, flaky stand-in API.
+
+Usage:
+    uv run --extra dev python scripts/bench_transport.py [--requests N] [--latency MS] [--failure-rate P]
+
+Starts scripts/stand_in_api.py on a local port and measures:
+  - success rate and latency of concurrent GETs with and without retries
+  - a client per request (the old health check) vs the shared pooled client
+  - how fast calls fail while the API is down, with and without the circuit breaker
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Allow importing bridge package when run as script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import httpx
+import uvicorn
+
+from bridge.client import FastAPIClient
+from bridge.transport import CircuitBreaker, ResilientTransport
+from stand_in_api import Store, create_app
+
+
+def start_server(app) -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="error"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
+
+
+def client_for(base_url: str, retries: int, threshold: int) -> FastAPIClient:
+    transport = ResilientTransport(
+        httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)),
+        retries=retries,
+        backoff=0.05,
+        breaker=CircuitBreaker(threshold, reset_after=30.0),
+    )
+    client = FastAPIClient(base_url=base_url, transport=transport)
+    client.cache.max_entries = 0
+    return client
+
+
+async def concurrent_gets(client: FastAPIClient, task_ids, concurrency: int = 16):
+    semaphore = asyncio.Semaphore(concurrency)
+    times, ok = [], 0
+
+    async def one(task_id):
+        nonlocal ok
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await client.get_task(task_id)
+                ok += 1
+            except httpx.HTTPError:
+                pass
+            times.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(t) for t in task_ids))
+    return ok, times, time.perf_counter() - started
+
+
+def describe(times) -> str:
+    times = sorted(times)
+    p95 = times[int(len(times) * 0.95) - 1] if times else 0.0
+    return f"p50 {statistics.median(times) * 1000:6.1f}ms  p95 {p95 * 1000:6.1f}ms"
+
+
+async def run(args) -> None:
+    store = Store()
+    store.seed(50)
+    app = create_app(store, latency=args.latency / 1000, failure_rate=args.failure_rate)
+    base_url = start_server(app)
+    task_ids = [list(store.tasks)[i % 50] for i in range(args.requests)]
+
+    print(f"{args.requests} concurrent GETs, {args.latency:.0f}ms latency, {args.failure_rate:.0%} injected 503s")
+    for retries in (0, 3):
+        client = client_for(base_url, retries, threshold=0)
+        ok, times, total = await concurrent_gets(client, task_ids)
+        print(f"  retries={retries}: {ok}/{len(task_ids)} ok  {describe(times)}  total {total:.2f}s"
+              f"  (retried {client.transport.retried})")
+        await client.close()
+
+    app.state.failure_rate = 0.0
+    print("\n50 sequential health checks")
+    started = time.perf_counter()
+    for _ in range(50):
+        async with httpx.AsyncClient(base_url=base_url, timeout=5.0) as c:
+            (await c.get("/api/health")).raise_for_status()
+    print(f"  new client per call: {(time.perf_counter() - started) * 1000:7.1f}ms")
+    client = client_for(base_url, retries=3, threshold=5)
+    started = time.perf_counter()
+    for _ in range(50):
+        assert await client.health()
+    print(f"  shared pooled client: {(time.perf_counter() - started) * 1000:6.1f}ms")
+    await client.close()
+
+    app.state.failure_rate = 1.0
+    print("\n50 calls while the API is down (every request 503)")
+    for threshold in (0, 5):
+        client = client_for(base_url, retries=3, threshold=threshold)
+        before = app.state.requests
+        ok, times, total = await concurrent_gets(client, task_ids[:50], concurrency=1)
+        label = "no breaker" if threshold == 0 else f"breaker({threshold})"
+        print(f"  {label:>11}: {total * 1000:7.1f}ms, {app.state.requests - before} requests reached the API"
+              f"  (circuit {client.transport.breaker.state})")
+        await client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTTP transport benchmark against the stand-in API")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=20.0, help="milliseconds per request")
+    parser.add_argument("--failure-rate", type=float, default=0.2)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
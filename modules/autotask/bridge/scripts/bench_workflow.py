@@ -0,0 +1,126 @@
+"""Benchmark: declarative workflows (bridge.workflow) against hand-written sequential calls.
+
+Usage:
+    uv run --extra dev python scripts/bench_workflow.py [--iterations N] [--latency MS]
+
+Starts scripts/stand_in_api.py with added latency on a local port and times:
+  - complete_task: the old script (health check, list, three updates one
+    after another) vs workflows/complete_task.json without and with merged
+    updates
+  - a fan-out workflow (read three tasks, the sprints and the projects, then
+    note each task) run one call at a time vs with independent steps
+    concurrent
+The response cache is off so every call reaches the API.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Allow importing bridge package when run as script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_transport import start_server
+from bridge.client import FastAPIClient
+from bridge.workflow import Workflow, append_once
+from stand_in_api import Store, create_app
+
+DEFINITION = Path(__file__).resolve().parent.parent / "workflows" / "complete_task.json"
+
+FAN_OUT = {
+    "name": "review",
+    "inputs": {"a": None, "b": None, "c": None},
+    "steps": [
+        {"id": "a", "call": "get_task", "args": {"task_id": "${inputs.a}"}},
+        {"id": "b", "call": "get_task", "args": {"task_id": "${inputs.b}"}},
+        {"id": "c", "call": "get_task", "args": {"task_id": "${inputs.c}"}},
+        {"id": "sprints", "call": "list_sprints"},
+        {"id": "projects", "call": "list_projects"},
+        {"id": "note_a", "call": "create_task_note", "args": {"task_id": "${a.id}", "content": "Reviewed: ${a.title}"}},
+        {"id": "note_b", "call": "create_task_note", "args": {"task_id": "${b.id}", "content": "Reviewed: ${b.title}"}},
+        {"id": "note_c", "call": "create_task_note", "args": {"task_id": "${c.id}", "content": "Reviewed: ${c.title}"}},
+    ],
+}
+
+
+async def legacy_complete_task(client: FastAPIClient) -> None:
+    """What scripts/complete_task_workflow.py used to do: every call waits for the previous one"""
+    assert await client.health()
+    tasks = await client.list_tasks(status="open")
+    task = tasks[0]
+    await client.update_task(task["id"], status="in_progress")
+    task = await client.update_task(task["id"], status="closed")
+    await client.update_task(
+        task["id"], description=append_once(task.get("description"), " [Progress updated after completion.]")
+    )
+
+
+def describe(samples: list) -> str:
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return f"median {statistics.median(samples) * 1000:7.1f} ms   p95 {p95 * 1000:7.1f} ms"
+
+
+async def timed(iterations: int, call) -> tuple:
+    samples, requests = [], 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        requests += await call()
+        samples.append(time.perf_counter() - started)
+    return samples, requests / iterations
+
+
+async def run(args) -> None:
+    store = Store()
+    # Enough open tasks for every complete_task run to close a different one
+    store.seed(args.iterations * 16)
+    app = create_app(store, latency=args.latency / 1000)
+    client = FastAPIClient(base_url=start_server(app))
+    client.cache.max_entries = 0
+
+    async def counted(coro) -> int:
+        before = app.state.requests
+        result = await coro
+        if isinstance(result, dict):
+            assert result["ok"], result
+        return app.state.requests - before
+
+    complete_task = Workflow.load(str(DEFINITION))
+    print(f"complete_task, {args.latency:.0f} ms latency, {args.iterations} runs")
+    cases = [
+        ("sequential calls", lambda: counted(legacy_complete_task(client))),
+        ("workflow, no merging", lambda: counted(complete_task.run(client, merge=False))),
+        ("workflow", lambda: counted(complete_task.run(client))),
+    ]
+    for label, call in cases:
+        samples, requests = await timed(args.iterations, call)
+        print(f"  {label:<22} {describe(samples)}   {requests:.0f} requests")
+
+    review = Workflow.from_dict(FAN_OUT)
+    ids = list(store.tasks)
+    inputs = {"a": ids[0], "b": ids[1], "c": ids[2]}
+    print(f"\nfan-out workflow ({len(FAN_OUT['steps'])} steps), {args.iterations} runs")
+    for label, concurrency in (("one call at a time", 1), ("concurrent", None)):
+        samples, requests = await timed(
+            args.iterations, lambda: counted(review.run(client, inputs, concurrency=concurrency))
+        )
+        print(f"  {label:<22} {describe(samples)}   {requests:.0f} requests")
+
+    result = await complete_task.run(client, dry_run=True)
+    print(f"\ndry run of complete_task: {result['calls']} call(s) made, "
+          f"would send {[s['request'] for s in result['steps'] if 'request' in s]}")
+    await client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Workflow runner benchmark against the stand-in API")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=20.0, help="milliseconds per request")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
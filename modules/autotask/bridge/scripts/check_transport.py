@@ -0,0 +1,98 @@
+"""Check: the circuit breaker's behaviour against the stand-in API, with assertions.
+
+Usage:
+    uv run --extra dev python scripts/check_transport.py
+
+Runs the stand-in in-process and asserts that the circuit opens after
+consecutive failures, rejects calls while open, closes after a successful
+trial request, and recovers when the trial request is cancelled (a caller
+timeout) instead of staying half-open. Exits non-zero on the first failed
+check.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Allow importing bridge package when run as script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import httpx
+
+from bridge.client import FastAPIClient
+from bridge.transport import CircuitBreaker, CircuitOpenError, ResilientTransport
+from stand_in_api import Store, create_app
+
+RESET_AFTER = 0.2
+
+
+def make_client(app) -> FastAPIClient:
+    transport = ResilientTransport(
+        httpx.ASGITransport(app=app), retries=0, breaker=CircuitBreaker(threshold=2, reset_after=RESET_AFTER)
+    )
+    client = FastAPIClient(base_url="http://stand-in", transport=transport)
+    client.cache.max_entries = 0
+    return client
+
+
+async def open_circuit(app, client: FastAPIClient, task_id: str) -> None:
+    app.state.failure_rate = 1.0
+    for _ in range(2):
+        try:
+            await client.get_task(task_id)
+        except httpx.HTTPStatusError:
+            pass
+    app.state.failure_rate = 0.0
+    assert client.transport.breaker.state == "open", client.transport.breaker.state
+
+
+async def check_open_and_close(app, client: FastAPIClient, task_id: str) -> None:
+    await open_circuit(app, client, task_id)
+    requests = app.state.requests
+    try:
+        await client.get_task(task_id)
+    except CircuitOpenError:
+        pass
+    else:
+        raise AssertionError("a call went through while the circuit was open")
+    assert app.state.requests == requests, "an open circuit contacted the API"
+    await asyncio.sleep(RESET_AFTER)
+    assert client.transport.breaker.state == "half-open"
+    assert (await client.get_task(task_id))["id"] == task_id
+    assert client.transport.breaker.state == "closed"
+
+
+async def check_cancelled_trial(app, client: FastAPIClient, task_id: str) -> None:
+    await open_circuit(app, client, task_id)
+    await asyncio.sleep(RESET_AFTER)
+    app.state.latency = 1.0
+    try:
+        await asyncio.wait_for(client.get_task(task_id), timeout=0.05)
+    except asyncio.TimeoutError:
+        pass
+    else:
+        raise AssertionError("the slow trial request was expected to time out")
+    app.state.latency = 0.0
+    # The abandoned request is cancelled on the next turns of the loop
+    await asyncio.sleep(0.01)
+    # The API is healthy again: the next call must be let through as the new trial
+    assert (await client.get_task(task_id))["id"] == task_id
+    assert client.transport.breaker.state == "closed"
+
+
+async def main() -> None:
+    store = Store()
+    store.seed(4)
+    app = create_app(store)
+    task_id = next(iter(store.tasks))
+    for check in (check_open_and_close, check_cancelled_trial):
+        client = make_client(app)
+        try:
+            await check(app, client, task_id)
+        finally:
+            await client.close()
+        print(f"ok  {check.__name__}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
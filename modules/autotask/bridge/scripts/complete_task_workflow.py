@@ -1,69 +1,62 @@
-"""Workflow: fetch a task, update progress, complete it, update progress again."""
+"""Workflow: fetch a task, update progress, complete it, update progress again.
+
+Runs workflows/complete_task.json (or another definition given with
+--workflow) through bridge.workflow. The three task updates are merged into
+one request, so the workflow takes two round trips instead of five:
+
+    python scripts/complete_task_workflow.py [--dry-run] [--no-merge] [--input name=value ...]
+"""
+import argparse
 import asyncio
-import os
 import sys
 from pathlib import Path
 
 # Allow importing bridge package when run as script
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-import httpx
-from bridge.client import FastAPIClient
+from bridge.client import get_client
+from bridge.workflow import Workflow
 
-
-async def check_health(base_url: str) -> bool:
-    """Verify API is up before running workflow."""
-    async with httpx.AsyncClient(base_url=base_url, timeout=5.0) as c:
-        r = await c.get("/api/health")
-        return r.is_success
+DEFINITION = Path(__file__).resolve().parent.parent / "workflows" / "complete_task.json"
 
 
 async def main() -> None:
-    base_url = os.getenv("FASTAPI_URL", "http://localhost:8000")
-    if not await check_health(base_url):
-        print(f"API not reachable at {base_url}. Start the API and Postgres first.")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workflow", default=str(DEFINITION), help="workflow definition (JSON or YAML)")
+    parser.add_argument("--dry-run", action="store_true", help="make the reads but do not send any write")
+    parser.add_argument("--no-merge", action="store_true", help="send each task update separately")
+    parser.add_argument("--input", action="append", default=[], metavar="NAME=VALUE", help="workflow input")
+    args = parser.parse_args()
 
-    client = FastAPIClient()
+    workflow = Workflow.load(args.workflow)
+    inputs = dict(item.split("=", 1) for item in args.input)
+    # One shared client (and connection pool) for the whole workflow
+    client = get_client()
     try:
-        # 1. Fetch a task (list open tasks, or any task)
-        print("1. Fetching tasks...")
-        try:
-            tasks = await client.list_tasks(status="open")
-        except Exception:
-            tasks = await client.list_tasks()
-        if not tasks:
-            print("   No tasks found. Creating one...")
-            task = await client.create_task(
-                "Workflow demo task",
-                "Created for fetch → progress → complete → progress workflow",
-            )
-            tasks = [task]
-
-        task = tasks[0]
-        tid = task["id"]
-        print(f"   Fetched task: {task['title']!r} (id={tid}, status={task['status']})")
-
-        # 2. Update progress → in_progress
-        print("\n2. Updating progress (status → in_progress)...")
-        task = await client.update_task(tid, status="in_progress")
-        print(f"   Updated: status={task['status']}")
-
-        # 3. Complete the task
-        print("\n3. Completing task (status → closed)...")
-        task = await client.update_task(tid, status="closed")
-        print(f"   Completed: status={task['status']}")
-
-        # 4. Update progress again (e.g. add completion note to description)
-        print("\n4. Updating progress again (description)...")
-        desc = (task.get("description") or "").strip()
-        suffix = " [Progress updated after completion.]"
-        if suffix not in desc:
-            desc = f"{desc}{suffix}" if desc else suffix.strip()
-        task = await client.update_task(tid, description=desc)
-        d = task.get("description") or ""
-        print(f"   Updated: description={d[:80]}{'...' if len(d) > 80 else ''}")
-
+        result = await workflow.run(client, inputs, dry_run=args.dry_run, merge=not args.no_merge)
+        for step in result["steps"]:
+            line = f"  {step['id']:<10} {step['call']:<12} {step.get('status', '-'):<8}"
+            if "ms" in step:
+                line += f" {step['ms']:7.1f} ms (at {step['started_ms']:.1f} ms)"
+            if step.get("fallback"):
+                line += "  (retried with fallback args)"
+            if "merged_into" in step:
+                line += f"  merged into {step['merged_into']}"
+            if "error" in step:
+                line += f"  {step['error']}"
+            if "request" in step:
+                line += f"  would send {step['request']}"
+            print(line)
+        print(f"\n{result['calls']} calls, {result['ms']:.1f} ms")
+        task = result["output"]
+        if isinstance(task, dict):
+            d = task.get("description") or ""
+            print(f"Task {task.get('id')}: status={task.get('status')} "
+                  f"description={d[:80]}{'...' if len(d) > 80 else ''}")
+        if not result["ok"]:
+            if not await client.health():
+                print(f"API not reachable at {client.base_url}. Start the API and Postgres first.")
+            sys.exit(1)
         print("\nDone.")
     finally:
         await client.close()
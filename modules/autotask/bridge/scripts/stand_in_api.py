@@ -0,0 +1,300 @@
+"""In-memory stand-in for the AutoTask API, for trying the bridge without Postgres.
+
+Implements the endpoints the bridge uses (projects, tasks, notes, sprints,
+health) plus the optional batch endpoints. Requires the dev extras:
+
+    pip install -e ".[dev]"
+    python scripts/stand_in_api.py --port 8000 --seed 50
+    python scripts/stand_in_api.py --no-batch   # exercise the bridge's fan-out path
+    python scripts/stand_in_api.py --latency 50 --failure-rate 0.1   # slow, flaky API
+
+``create_app()`` can also be mounted in-process with ``httpx.ASGITransport``.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, HTTPException, Request, Response
+
+KINDS = {"task", "feature", "epic", "issue"}
+STATUSES = {"open", "in_progress", "blocked", "closed"}
+TASK_FIELDS = ("title", "description", "kind", "status", "points", "project_id", "sprint_id", "depends_on")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _json(request: Request, data: Any, status_code: int = 200) -> Response:
+    """JSON response with an ETag; answers 304 when the client's copy is current"""
+    body = json.dumps(data, separators=(",", ":")).encode()
+    etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, status_code=status_code, media_type="application/json", headers={"ETag": etag})
+
+
+class Store:
+    """All API state, kept in dicts"""
+
+    def __init__(self) -> None:
+        self.projects: Dict[str, Dict[str, Any]] = {}
+        self.sprints: Dict[str, Dict[str, Any]] = {}
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.notes: Dict[str, List[Dict[str, Any]]] = {}
+
+    def create_project(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if not data.get("name"):
+            raise ValueError("name is required")
+        project = {"id": str(uuid.uuid4()), "name": data["name"],
+                   "description": data.get("description"), "created_at": _now()}
+        self.projects[project["id"]] = project
+        return project
+
+    def create_sprint(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        sprint = {"id": str(uuid.uuid4()), "name": data.get("name", "Sprint"),
+                  "project_id": data.get("project_id"), "created_at": _now()}
+        self.sprints[sprint["id"]] = sprint
+        return sprint
+
+    def _validate(self, data: Dict[str, Any]) -> None:
+        if "kind" in data and data["kind"] is not None and data["kind"] not in KINDS:
+            raise ValueError(f"invalid kind: {data['kind']}")
+        if "status" in data and data["status"] not in STATUSES:
+            raise ValueError(f"invalid status: {data['status']}")
+        if data.get("points") is not None and (not isinstance(data["points"], int) or data["points"] < 0):
+            raise ValueError("points must be a non-negative integer")
+        if data.get("depends_on") is not None and (
+            not isinstance(data["depends_on"], list) or not all(isinstance(d, str) for d in data["depends_on"])
+        ):
+            raise ValueError("depends_on must be a list of task IDs")
+
+    def create_task(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if not data.get("title"):
+            raise ValueError("title is required")
+        self._validate(data)
+        now = _now()
+        task = {field: data.get(field) for field in TASK_FIELDS}
+        task.update(id=str(uuid.uuid4()), kind=data.get("kind") or "task", status=data.get("status", "open"),
+                    depends_on=list(data.get("depends_on") or []), created_at=now, updated_at=now)
+        self.tasks[task["id"]] = task
+        return task
+
+    def update_task(self, task_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        task = self.tasks.get(task_id)
+        if task is None:
+            raise KeyError(task_id)
+        changes = {k: v for k, v in data.items() if k in TASK_FIELDS}
+        self._validate(changes)
+        task.update(changes)
+        task["updated_at"] = _now()
+        return task
+
+    def create_note(self, task_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        if task_id not in self.tasks:
+            raise KeyError(task_id)
+        if not data.get("content"):
+            raise ValueError("content is required")
+        note = {"id": str(uuid.uuid4()), "task_id": task_id, "content": data["content"],
+                "author": data.get("author"), "created_at": _now()}
+        self.notes.setdefault(task_id, []).append(note)
+        return note
+
+    def seed(self, tasks: int) -> None:
+        project = self.create_project({"name": "Demo project"})
+        sprint = self.create_sprint({"name": "Sprint 1", "project_id": project["id"]})
+        for i in range(tasks):
+            self.create_task({
+                "title": f"Task {i + 1}",
+                "description": f"Seeded task number {i + 1}",
+                "kind": ("task", "feature", "issue")[i % 3],
+                "status": ("open", "in_progress", "blocked", "closed")[i % 4],
+                "points": i % 8,
+                "project_id": project["id"],
+                "sprint_id": sprint["id"] if i % 2 == 0 else None,
+            })
+
+
+def _outcome(call) -> Dict[str, Any]:
+    try:
+        return {"ok": True, "data": call()}
+    except KeyError as e:
+        return {"ok": False, "error": f"not found: {e.args[0]}"}
+    except ValueError as e:
+        return {"ok": False, "error": str(e)}
+
+
+def create_app(store: Optional[Store] = None, batch: bool = True, paging: bool = True,
+               latency: float = 0.0, failure_rate: float = 0.0) -> FastAPI:
+    """Build the app.
+
+    ``batch=False`` leaves out the batch endpoints and ``paging=False``
+    ignores limit/offset. Every request is delayed by ``latency`` seconds
+    (+/- 50%) and answered with a 503 with probability ``failure_rate``;
+    both can be changed at runtime through ``app.state``.
+    """
+    store = store or Store()
+    app = FastAPI(title="AutoTask stand-in API")
+    app.state.store = store
+    app.state.latency = latency
+    app.state.failure_rate = failure_rate
+    app.state.requests = 0
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        app.state.requests += 1
+        if app.state.latency > 0:
+            await asyncio.sleep(app.state.latency * random.uniform(0.5, 1.5))
+        if random.random() < app.state.failure_rate:
+            return Response('{"detail":"injected failure"}', status_code=503, media_type="application/json")
+        return await call_next(request)
+    # Responses by Idempotency-Key, so a replayed write is not applied twice
+    replies: Dict[str, Any] = {}
+    app.state.writes = 0
+
+    def once(request: Request, call):
+        key = request.headers.get("idempotency-key")
+        if key and key in replies:
+            return replies[key]
+        result = run(call)
+        app.state.writes += 1
+        if key:
+            replies[key] = result
+        return result
+
+    def run(call):
+        try:
+            return call()
+        except KeyError as e:
+            raise HTTPException(status_code=404, detail=f"Not found: {e.args[0]}")
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    @app.get("/api/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/api/projects")
+    async def list_projects(request: Request):
+        return _json(request, list(store.projects.values()))
+
+    @app.post("/api/projects", status_code=201)
+    async def create_project(request: Request):
+        data = await request.json()
+        return run(lambda: store.create_project(data))
+
+    @app.get("/api/projects/{project_id}")
+    async def get_project(project_id: str, request: Request):
+        return _json(request, run(lambda: store.projects[project_id]))
+
+    @app.get("/api/sprints")
+    async def list_sprints(request: Request, project_id: Optional[str] = None):
+        sprints = [s for s in store.sprints.values() if not project_id or s["project_id"] == project_id]
+        return _json(request, sprints)
+
+    @app.get("/api/sprints/{sprint_id}")
+    async def get_sprint(sprint_id: str, request: Request):
+        return _json(request, run(lambda: store.sprints[sprint_id]))
+
+    @app.get("/api/tasks")
+    async def list_tasks(request: Request):
+        params = request.query_params
+        tasks = []
+        for task in store.tasks.values():
+            if any(params.get(f) and task.get(f) != params[f] for f in ("status", "kind", "project_id", "sprint_id")):
+                continue
+            if params.get("created_after") and task["created_at"] < params["created_after"]:
+                continue
+            if params.get("created_before") and task["created_at"] > params["created_before"]:
+                continue
+            if params.get("updated_after") and task["updated_at"] < params["updated_after"]:
+                continue
+            if params.get("updated_before") and task["updated_at"] > params["updated_before"]:
+                continue
+            tasks.append(task)
+        if paging and params.get("limit"):
+            offset = int(params.get("offset") or 0)
+            tasks = tasks[offset:offset + int(params["limit"])]
+        return _json(request, tasks)
+
+    @app.post("/api/tasks", status_code=201)
+    async def create_task(request: Request):
+        data = await request.json()
+        return run(lambda: store.create_task(data))
+
+    if batch:
+        @app.post("/api/tasks/batch")
+        async def create_tasks_batch(request: Request):
+            items = (await request.json())["items"]
+            return {"results": [_outcome(lambda i=item: store.create_task(i)) for item in items]}
+
+        @app.patch("/api/tasks/batch")
+        async def update_tasks_batch(request: Request):
+            items = (await request.json())["items"]
+            return {"results": [_outcome(lambda i=item: store.update_task(i.get("id"), i)) for item in items]}
+
+        @app.post("/api/notes/batch")
+        async def create_notes_batch(request: Request):
+            items = (await request.json())["items"]
+            return {"results": [_outcome(lambda i=item: store.create_note(i.get("task_id"), i)) for item in items]}
+
+    @app.get("/api/tasks/{task_id}")
+    async def get_task(task_id: str, request: Request):
+        return _json(request, run(lambda: store.tasks[task_id]))
+
+    @app.put("/api/tasks/{task_id}")
+    async def update_task(task_id: str, request: Request):
+        data = await request.json()
+        return once(request, lambda: dict(store.update_task(task_id, data)))
+
+    @app.delete("/api/tasks/{task_id}", status_code=204)
+    async def delete_task(task_id: str):
+        run(lambda: store.tasks.pop(task_id))
+        store.notes.pop(task_id, None)
+        return Response(status_code=204)
+
+    @app.get("/api/tasks/{task_id}/notes")
+    async def list_notes(task_id: str, request: Request):
+        run(lambda: store.tasks[task_id])
+        return _json(request, store.notes.get(task_id, []))
+
+    @app.post("/api/tasks/{task_id}/notes", status_code=201)
+    async def create_note(task_id: str, request: Request):
+        data = await request.json()
+        return once(request, lambda: store.create_note(task_id, data))
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--seed", type=int, default=0, help="create a project, a sprint and this many tasks")
+    parser.add_argument("--no-batch", action="store_true", help="leave out the batch endpoints")
+    parser.add_argument("--no-paging", action="store_true", help="ignore limit/offset on /api/tasks")
+    parser.add_argument("--latency", type=float, default=0.0, help="added latency per request in milliseconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    store = Store()
+    if args.seed:
+        store.seed(args.seed)
+    uvicorn.run(create_app(
+        store,
+        batch=not args.no_batch,
+        paging=not args.no_paging,
+        latency=args.latency / 1000,
+        failure_rate=args.failure_rate,
+    ), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
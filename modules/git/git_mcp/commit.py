@@ -0,0 +1,305 @@
+"""Commit pipeline built on git plumbing: stage changed paths, write the tree, move HEAD"""
+
+import asyncio
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from git_mcp.config import ConfigUnsupported, config_bool, read_config
+from git_mcp.log import LogUnsupported
+from git_mcp.objects import ObjectStoreError
+from git_mcp.repo import RepoContext
+from git_mcp.runner import get_runner
+from git_mcp.status import StatusUnsupported
+
+# Hooks that `git commit` runs and the plumbing pipeline would skip
+_COMMIT_HOOKS = ("pre-commit", "prepare-commit-msg", "commit-msg", "post-commit")
+
+# Files marking an operation that `git commit` has to finish (extra parents, messages)
+_IN_PROGRESS = ("MERGE_HEAD", "CHERRY_PICK_HEAD", "REVERT_HEAD", "SQUASH_MSG")
+
+_ZERO_OID = "0" * 40
+
+# Known to git without being stored; the "before" side of a root commit
+_EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+
+class CommitError(Exception):
+    """Raised when there is nothing to commit or the message is empty"""
+
+
+@dataclass
+class CommitResult:
+    """Outcome of a commit pipeline run"""
+
+    oid: str
+    branch: Optional[str]
+    subject: str
+    root: bool
+    files: int
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    def summary(self, abbrev: int = 7) -> str:
+        if self.branch:
+            where = f"{self.branch} (root-commit)" if self.root else self.branch
+        else:
+            where = "detached HEAD"
+        noun = "file" if self.files == 1 else "files"
+        timings = ", ".join(f"{stage} {seconds * 1000:.1f}ms" for stage, seconds in self.timings.items())
+        return (
+            f"[{where} {self.oid[:abbrev]}] {self.subject}\n"
+            f" {self.files} {noun} changed\n"
+            f"Timings: {timings}\n"
+        )
+
+
+def clean_message(message: str) -> str:
+    """Normalise whitespace like ``git commit --cleanup=whitespace`` (the default for -m)"""
+    lines = [line.rstrip() for line in message.replace("\r\n", "\n").split("\n")]
+    out: List[str] = []
+    for line in lines:
+        if not line and (not out or not out[-1]):
+            continue
+        out.append(line)
+    while out and not out[-1]:
+        out.pop()
+    return "\n".join(out) + "\n" if out else ""
+
+
+def parse_porcelain_z(output: bytes) -> List[Tuple[str, bytes]]:
+    """Parse ``git status --porcelain -z`` into ``(XY, path)`` pairs"""
+    entries = []
+    records = output.split(b"\0")
+    i = 0
+    while i < len(records):
+        record = records[i]
+        i += 1
+        if len(record) < 4:
+            continue
+        xy = record[:2].decode()
+        entries.append((xy, record[3:]))
+        if xy[0] in "RC":
+            i += 1  # the rename/copy source follows
+    return entries
+
+
+async def status_entries(ctx: RepoContext, use_engine: bool = True) -> List[Tuple[str, bytes]]:
+    """Return ``(XY, path)`` status pairs.
+
+    The in-process engine is only used when its watcher can answer from
+    events; a cold engine parsing a freshly rewritten index is slower than
+    ``git status``, and every commit rewrites the index.
+    """
+    if use_engine and ctx.status_engine.is_incremental():
+        try:
+            return await asyncio.to_thread(ctx.status_engine.status)
+        except StatusUnsupported:
+            pass
+    # Without rename detection both sides of a staged rename are listed, so
+    # selecting paths for a commit sees the deletion too
+    output = await get_runner().run_bytes(
+        ctx.worktree, ["status", "--porcelain", "-z", "--untracked-files=normal", "--no-renames"]
+    )
+    return parse_porcelain_z(output)
+
+
+async def worktree_signature(ctx: RepoContext) -> tuple:
+    """Identify the worktree content, for caches of ``git diff``/``git grep`` results.
+
+    The worktree has no oid; together with the index checksum this identifies
+    the content ``git diff``/``git grep`` would see in the worktree. With the
+    file watcher it is the watcher's event generation, so nothing is scanned;
+    otherwise it is the stat data of tracked files that differ from the index.
+    """
+    generation = await asyncio.to_thread(ctx.status_engine.worktree_generation)
+    if generation is not None:
+        return ("watch", generation)
+    dirty = []
+    root = os.fsencode(ctx.worktree) + b"/"
+    for xy, path in await status_entries(ctx):
+        if xy[1] in " ?!":
+            continue
+        try:
+            st = os.lstat(root + path)
+            dirty.append((path, st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino, st.st_mode))
+        except OSError:
+            dirty.append((path, None))
+    return tuple(dirty)
+
+
+def _under(path: bytes, specs: List[bytes]) -> bool:
+    for spec in specs:
+        if not spec or spec == path or path.startswith(spec + b"/"):
+            return True
+    return False
+
+
+def _needs_porcelain(ctx: RepoContext) -> bool:
+    """Return True if `git commit` itself must create the commit (hooks, signing, merges)"""
+    if any((ctx.git_dir / name).exists() for name in _IN_PROGRESS):
+        return True
+    try:
+        config = read_config(ctx.common_dir)
+    except (ConfigUnsupported, OSError):
+        return True
+    if config_bool(config, "commit.gpgsign", False):
+        return True
+    hooks_path = config.get("core.hookspath")
+    if hooks_path:
+        hooks_dir = ctx.worktree / os.path.expanduser(hooks_path)
+    else:
+        hooks_dir = ctx.common_dir / "hooks"
+    return any(os.access(hooks_dir / hook, os.X_OK) for hook in _COMMIT_HOOKS)
+
+
+async def _count_changed(root, old: Optional[str], new: str) -> int:
+    """Number of paths that differ between two trees or commits (``old`` None: the empty tree)"""
+    output = await get_runner().run_bytes(
+        root, ["diff-tree", "-r", "--name-only", "-z", "--no-renames", old or _EMPTY_TREE, new]
+    )
+    return sum(1 for path in output.split(b"\0") if path)
+
+
+async def _stage(root, paths: List[bytes], env: Optional[Dict[str, str]] = None) -> None:
+    """Update the index (or the one named in ``env``) from the worktree for ``paths``"""
+    runner = get_runner()
+    if any(p.endswith(b"/") for p in paths):
+        # Embedded repositories are added as gitlinks by `git add`
+        await runner.run_bytes(root, ["add", "--"] + [os.fsdecode(p) for p in paths], env=env)
+    elif paths:
+        await runner.run_bytes(
+            root, ["update-index", "--add", "--remove", "-z", "--stdin"], input=b"\0".join(paths) + b"\0", env=env
+        )
+
+
+async def create_commit(
+    ctx: RepoContext,
+    message: str,
+    stage_all: bool = True,
+    paths: Optional[List[str]] = None,
+    use_engine: bool = True,
+) -> CommitResult:
+    """Stage changes and commit them, timing each stage.
+
+    The worktree is scanned once (by the status engine when it can be used)
+    and only the changed paths are handed to ``git update-index``. The commit
+    is then made with ``write-tree``, ``commit-tree`` and ``update-ref``. When
+    hooks, commit signing or an in-progress merge are involved the final step
+    is delegated to ``git commit`` so their behaviour is preserved.
+
+    With ``paths`` only those paths are committed, like ``git commit --
+    <paths>``: the tree is built from a temporary index holding HEAD plus
+    the selected paths, so changes staged elsewhere stay staged but are not
+    part of the commit.
+    """
+    runner = get_runner()
+    root = ctx.worktree
+    timings: Dict[str, float] = {}
+    message = clean_message(message)
+    if not message:
+        raise CommitError("Aborting commit due to empty commit message")
+
+    started = time.perf_counter()
+    entries = await status_entries(ctx, use_engine)
+    timings["status"] = time.perf_counter() - started
+
+    specs = None
+    if paths:
+        specs = [os.fsencode(p.strip("/")) if p.strip("/") != "." else b"" for p in paths]
+    to_stage: List[bytes] = []
+    untracked_dirs: List[bytes] = []
+    # Selected paths whose change is already staged and matches the worktree
+    staged_only: List[bytes] = []
+    if stage_all or specs is not None:
+        for xy, path in entries:
+            if specs is not None and not _under(path.rstrip(b"/"), specs):
+                continue
+            if xy == "??" and path.endswith(b"/"):
+                untracked_dirs.append(path)
+            elif xy == "??" or xy[1] != " ":
+                to_stage.append(path)
+            elif xy[0] not in " !":
+                staged_only.append(path)
+
+    started = time.perf_counter()
+    if untracked_dirs:
+        listed = await runner.run_bytes(
+            root, ["ls-files", "--others", "--exclude-standard", "-z", "--"] + [os.fsdecode(d) for d in untracked_dirs]
+        )
+        to_stage.extend(p for p in listed.split(b"\0") if p)
+    await _stage(root, to_stage)
+    timings["stage"] = time.perf_counter() - started
+
+    symref, head = ctx.head()
+    branch = symref[len("refs/heads/"):] if symref and symref.startswith("refs/heads/") else None
+    subject = message.split("\n", 1)[0]
+
+    env = None
+    if specs is None:
+        staged = {path for xy, path in entries if xy[0] not in " ?!"} | set(to_stage)
+    else:
+        staged = set(to_stage) | set(staged_only)
+        if not staged:
+            raise CommitError("Nothing to commit, working tree clean" if not entries else "No changes added to commit")
+        started = time.perf_counter()
+        fd, index_file = tempfile.mkstemp(prefix="index.git-mcp-", dir=ctx.git_dir)
+        os.close(fd)
+        env = {"GIT_INDEX_FILE": index_file}
+    try:
+        if env is not None:
+            await runner.run_bytes(root, ["read-tree", head or "--empty"], env=env)
+            await _stage(root, to_stage + staged_only, env=env)
+            timings["index"] = time.perf_counter() - started
+
+        if _needs_porcelain(ctx):
+            started = time.perf_counter()
+            await runner.run_bytes(
+                root, ["commit", "-q", "--cleanup=verbatim", "-F", "-"], input=message.encode(), env=env
+            )
+            timings["commit"] = time.perf_counter() - started
+            symref, oid = ctx.head()
+            files = await _count_changed(root, head, oid) if oid else 0
+            return CommitResult(oid=oid or "", branch=branch, subject=subject, root=head is None,
+                                files=files, timings=timings)
+
+        started = time.perf_counter()
+        tree = (await runner.run(root, ["write-tree"], env=env)).strip()
+        timings["write-tree"] = time.perf_counter() - started
+    finally:
+        if env is not None:
+            os.unlink(env["GIT_INDEX_FILE"])
+    if head is None:
+        unchanged = not staged
+    else:
+        try:
+            head_tree = ctx.store.peel_to_tree(bytes.fromhex(head)).hex()
+        except ObjectStoreError:
+            head_tree = (await runner.run(root, ["rev-parse", f"{head}^{{tree}}"])).strip()
+        unchanged = head_tree == tree
+    if unchanged:
+        raise CommitError("Nothing to commit, working tree clean" if not entries else "No changes added to commit")
+
+    started = time.perf_counter()
+    args = ["commit-tree", tree]
+    if head is not None:
+        args += ["-p", head]
+    oid = (await runner.run(root, args + ["-F", "-"], input=message.encode())).strip()
+    timings["commit-tree"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    reflog = f"commit (initial): {subject}" if head is None else f"commit: {subject}"
+    await runner.run(root, ["update-ref", "-m", reflog, "HEAD", oid, head or _ZERO_OID])
+    timings["update-ref"] = time.perf_counter() - started
+
+    return CommitResult(oid=oid, branch=branch, subject=subject, root=head is None,
+                        files=await _count_changed(root, head_tree if head else None, tree), timings=timings)
+
+
+def abbrev_length(ctx: RepoContext) -> int:
+    """Abbreviation length matching ``git_log`` output"""
+    try:
+        return ctx.commit_walker.abbrev_length()
+    except LogUnsupported:
+        return 7
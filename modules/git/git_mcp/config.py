@@ -0,0 +1,95 @@
+"""Minimal reader for git config files (system, global and repository)"""
+
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class ConfigUnsupported(Exception):
+    """Raised for config features the in-process reader does not evaluate"""
+
+
+def _unquote(value: str) -> str:
+    out = []
+    in_quotes = False
+    i = 0
+    while i < len(value):
+        c = value[i]
+        if c == '"':
+            in_quotes = not in_quotes
+        elif c == "\\" and i + 1 < len(value):
+            i += 1
+            out.append({"n": "\n", "t": "\t", "b": "\b"}.get(value[i], value[i]))
+        elif c in "#;" and not in_quotes:
+            break
+        else:
+            out.append(c)
+        i += 1
+    return "".join(out).strip()
+
+
+def parse_config(text: str, values: Dict[str, str]) -> None:
+    """Parse config ``text`` into ``values`` (``section[.subsection].key`` -> value)"""
+    section = ""
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line.startswith("["):
+            end = line.index("]")
+            header = line[1:end].strip()
+            if '"' in header:
+                name, _, sub = header.partition(" ")
+                section = f"{name.lower()}.{sub.strip().strip(chr(34))}"
+            else:
+                name, _, sub = header.partition(".")
+                section = f"{name.lower()}.{sub}" if sub else name.lower()
+            if section.startswith("include") or section.startswith("includeif"):
+                raise ConfigUnsupported("Config includes are not evaluated in-process")
+            line = line[end + 1:].strip()
+            if not line:
+                continue
+        key, sep, value = line.partition("=")
+        key = key.strip().lower()
+        values[f"{section}.{key}"] = _unquote(value) if sep else "true"
+
+
+def config_files(git_dir: Path) -> List[Path]:
+    """Return the config files git reads, lowest precedence first"""
+    files = [Path(os.getenv("GIT_CONFIG_SYSTEM", "/etc/gitconfig"))]
+    xdg = os.getenv("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    files.append(Path(xdg) / "git" / "config")
+    files.append(Path(os.getenv("GIT_CONFIG_GLOBAL", os.path.join(os.path.expanduser("~"), ".gitconfig"))))
+    files.append(Path(git_dir) / "config")
+    return files
+
+
+def read_config(git_dir: Path) -> Dict[str, str]:
+    """Read and merge all config files that apply to a repository"""
+    if os.getenv("GIT_CONFIG_PARAMETERS") or os.getenv("GIT_CONFIG_COUNT"):
+        raise ConfigUnsupported("Config passed through the environment is not evaluated in-process")
+    values: Dict[str, str] = {}
+    for path in config_files(git_dir):
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        parse_config(text, values)
+    return values
+
+
+def config_bool(values: Dict[str, str], key: str, default: bool) -> bool:
+    """Interpret a config value as a boolean"""
+    value = values.get(key)
+    if value is None:
+        return default
+    return value.lower() in ("true", "yes", "on", "1")
+
+
+def excludes_file(values: Dict[str, str]) -> Optional[Path]:
+    """Return the effective ``core.excludesFile`` path"""
+    value = values.get("core.excludesfile")
+    if value:
+        return Path(os.path.expanduser(value))
+    xdg = os.getenv("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return Path(xdg) / "git" / "ignore"
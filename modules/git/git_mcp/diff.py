@@ -0,0 +1,285 @@
+"""Budgeted, paginated diffs streamed from ``git diff``"""
+
+import base64
+import fnmatch
+import hashlib
+import json
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple
+
+from git_mcp.limits import DEFAULT_MAX_BYTES, DEFAULT_MAX_LINES
+from git_mcp.runner import get_runner
+
+# Paths that are almost always machine-written and rarely worth reading
+GENERATED_PATTERNS = [
+    "*.lock",
+    "package-lock.json",
+    "npm-shrinkwrap.json",
+    "pnpm-lock.yaml",
+    "go.sum",
+    "*.min.js",
+    "*.min.css",
+    "*.map",
+    "*.pb.go",
+    "*_pb2.py",
+    "vendor/*",
+    "node_modules/*",
+    "dist/*",
+    "*.generated.*",
+]
+
+_TRUNCATED = b"... [hunk truncated to fit the page budget]\n"
+
+
+class CursorError(Exception):
+    """Raised when a diff cursor is malformed or belongs to a different diff"""
+
+
+def is_generated(path: str) -> bool:
+    """Return True if ``path`` matches one of the generated-file patterns"""
+    name = path.rsplit("/", 1)[-1]
+    for pattern in GENERATED_PATTERNS:
+        if pattern.endswith("/*"):
+            prefix = pattern[:-1]
+            if path.startswith(prefix) or f"/{prefix}" in path:
+                return True
+        elif fnmatch.fnmatchcase(name, pattern):
+            return True
+    return False
+
+
+def generated_excludes() -> List[str]:
+    """Pathspecs that keep generated files out of ``git diff`` output"""
+    specs = []
+    for pattern in GENERATED_PATTERNS:
+        if pattern.endswith("/*"):
+            specs.append(f":(exclude,glob)**/{pattern[:-2]}/**")
+        else:
+            specs.append(f":(exclude,glob)**/{pattern}")
+    return specs
+
+
+def diff_revisions(staged: bool = False, commit: Optional[str] = None) -> List[str]:
+    """Return the revision arguments selecting what ``git_diff`` compares"""
+    if commit:
+        # A commit such as "--output=file" must not be taken for an option
+        return ["--end-of-options", commit]
+    if staged:
+        return ["--staged"]
+    return []
+
+
+def pathspec_args(paths: Optional[List[str]], skip_generated: bool) -> List[str]:
+    """Build the ``-- <pathspec>...`` tail of a diff command"""
+    specs = list(paths or [])
+    if skip_generated:
+        specs = (specs or ["."]) + generated_excludes()
+    return ["--"] + specs if specs else []
+
+
+@dataclass
+class FileStat:
+    """Per-file line counts from ``git diff --numstat``"""
+
+    path: str
+    added: int
+    deleted: int
+    binary: bool
+    generated: bool
+
+
+async def diff_numstat(repo_root: Path, revisions: List[str], paths: Optional[List[str]] = None) -> List[FileStat]:
+    """Return per-file added/deleted line counts without producing patch text"""
+    args = ["diff", "--numstat", "-z", "--no-renames", "--no-ext-diff"] + revisions
+    args += pathspec_args(paths, skip_generated=False)
+    output = await get_runner().run_bytes(repo_root, args)
+    stats = []
+    for record in output.split(b"\0"):
+        if not record:
+            continue
+        added, deleted, path_bytes = record.split(b"\t", 2)
+        path = path_bytes.decode("utf-8", errors="replace")
+        binary = added == b"-"
+        stats.append(FileStat(
+            path=path,
+            added=0 if binary else int(added),
+            deleted=0 if binary else int(deleted),
+            binary=binary,
+            generated=is_generated(path),
+        ))
+    return stats
+
+
+def format_numstat(stats: List[FileStat]) -> str:
+    """Render a per-file overview of a diff"""
+    if not stats:
+        return ""
+    added = sum(s.added for s in stats)
+    deleted = sum(s.deleted for s in stats)
+    lines = [f"Diff overview: {len(stats)} files changed, +{added} -{deleted}"]
+    for s in stats:
+        counts = "binary" if s.binary else f"+{s.added} -{s.deleted}"
+        note = " (generated)" if s.generated else ""
+        lines.append(f"  {counts:>14}  {s.path}{note}")
+    return "\n".join(lines) + "\n"
+
+
+# -- paging -----------------------------------------------------------------
+
+def _fingerprint(args: List[str]) -> str:
+    return hashlib.sha1("\0".join(args).encode()).hexdigest()[:12]
+
+
+def encode_cursor(args: List[str], file_index: int, hunk_index: int) -> str:
+    payload = json.dumps({"d": _fingerprint(args), "f": file_index, "h": hunk_index}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, args: List[str]) -> Tuple[int, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        position = int(payload["f"]), int(payload["h"])
+        fingerprint = payload["d"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise CursorError(f"Invalid diff cursor: {e}")
+    if fingerprint != _fingerprint(args):
+        raise CursorError("Cursor belongs to a different diff (arguments changed)")
+    return position
+
+
+@dataclass
+class DiffUnit:
+    """A file header plus one hunk (or a header alone for hunk-less files)"""
+
+    file_index: int
+    hunk_index: int
+    header: bytes
+    body: bytearray = field(default_factory=bytearray)
+    lines: int = 0
+    added: int = 0
+    deleted: int = 0
+    truncated: bool = False
+    binary: bool = False
+
+
+async def iter_units(lines: AsyncIterator[bytes], cap: int) -> AsyncIterator[DiffUnit]:
+    """Group streamed diff lines into header+hunk units, bounding each body to ``cap`` bytes"""
+    file_index = -1
+    header = bytearray()
+    unit: Optional[DiffUnit] = None
+    in_header = False
+
+    async for line in lines:
+        if line.startswith(b"diff --git "):
+            if unit is not None:
+                yield unit
+            elif in_header:
+                yield DiffUnit(file_index, 0, bytes(header), binary=b"\nBinary files " in b"\n" + header)
+            file_index += 1
+            header = bytearray(line)
+            unit = None
+            in_header = True
+        elif line.startswith(b"@@") and file_index >= 0:
+            if unit is not None:
+                yield unit
+            hunk_index = unit.hunk_index + 1 if unit is not None else 0
+            unit = DiffUnit(file_index, hunk_index, bytes(header))
+            unit.body += line
+            unit.lines = 1
+            in_header = False
+        elif in_header:
+            header += line
+        elif unit is not None:
+            unit.lines += 1
+            if line.startswith(b"+"):
+                unit.added += 1
+            elif line.startswith(b"-"):
+                unit.deleted += 1
+            if len(unit.body) + len(line) <= cap:
+                unit.body += line
+            else:
+                unit.truncated = True
+    if unit is not None:
+        yield unit
+    elif in_header:
+        yield DiffUnit(file_index, 0, bytes(header), binary=b"\nBinary files " in b"\n" + header)
+
+
+@dataclass
+class DiffPage:
+    """One page of a paginated diff"""
+
+    text: str
+    next_cursor: Optional[str]
+    files: int
+    hunks: int
+    skipped_binary: List[str]
+
+
+async def diff_page(
+    repo_root: Path,
+    revisions: List[str],
+    paths: Optional[List[str]] = None,
+    cursor: Optional[str] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    max_lines: int = DEFAULT_MAX_LINES,
+    skip_generated: bool = True,
+) -> DiffPage:
+    """Stream ``git diff`` and return the hunks that fit in the byte/line budget.
+
+    Hunks before ``cursor`` are read and discarded without being kept; once the
+    budget is used up the git process is killed and a cursor for the next hunk
+    is returned. Each page repeats the file header of any file it resumes, so
+    every page is a valid patch on its own. A single hunk larger than the whole
+    budget is truncated rather than blocking progress.
+    """
+    max_bytes = max(1024, max_bytes)
+    max_lines = max(10, max_lines)
+    args = ["diff", "--no-color", "--no-ext-diff", "--no-renames"] + revisions
+    args += pathspec_args(paths, skip_generated)
+    start = decode_cursor(cursor, args) if cursor else (0, 0)
+
+    out = bytearray()
+    used_lines = 0
+    files = set()
+    hunks = 0
+    skipped_binary: List[str] = []
+    next_cursor = None
+    last_file = -1
+
+    async with aclosing(get_runner().stream(repo_root, args)) as lines:
+        async for unit in iter_units(lines, cap=max_bytes):
+            if (unit.file_index, unit.hunk_index) < start:
+                continue
+            if unit.binary:
+                first = unit.header.split(b"\n", 1)[0].decode("utf-8", errors="replace")
+                skipped_binary.append(first[len("diff --git "):])
+                continue
+            chunk = bytearray()
+            if unit.file_index != last_file:
+                chunk += unit.header
+            chunk += unit.body
+            if unit.truncated:
+                chunk += _TRUNCATED
+            chunk_lines = chunk.count(b"\n")
+            if out and (len(out) + len(chunk) > max_bytes or used_lines + chunk_lines > max_lines):
+                next_cursor = encode_cursor(args, unit.file_index, unit.hunk_index)
+                break
+            if not out and len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - len(_TRUNCATED)] + _TRUNCATED
+            out += chunk
+            used_lines += chunk_lines
+            files.add(unit.file_index)
+            hunks += 1
+            last_file = unit.file_index
+
+    return DiffPage(
+        text=out.decode("utf-8", errors="replace"),
+        next_cursor=next_cursor,
+        files=len(files),
+        hunks=hunks,
+        skipped_binary=skipped_binary,
+    )
@@ -0,0 +1,192 @@
+"""In-process evaluation of .gitignore / info/exclude rules"""
+
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+
+@dataclass
+class IgnorePattern:
+    """One compiled line of an ignore file"""
+
+    regex: "re.Pattern[str]"
+    negated: bool
+    dir_only: bool
+    # Basename patterns (no slash) match at any depth below the ignore file
+    basename_only: bool
+
+
+def _translate(glob: str) -> str:
+    """Translate a gitignore glob (already stripped of ``!`` and ``/``) to a regex"""
+    out = []
+    i = 0
+    n = len(glob)
+    while i < n:
+        c = glob[i]
+        if c == "*":
+            if glob.startswith("**", i):
+                at_start = i == 0 or glob[i - 1] == "/"
+                at_end = i + 2 == n or glob[i + 2] == "/"
+                if at_start and at_end:
+                    if i + 2 == n:
+                        out.append(".*")
+                        i += 2
+                    else:
+                        # "**/" matches zero or more leading directories
+                        out.append("(?:.*/)?")
+                        i += 3
+                    continue
+            out.append("[^/]*")
+            while i < n and glob[i] == "*":
+                i += 1
+            continue
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = glob.find("]", i + 2 if glob.startswith("[!", i) or glob.startswith("[^", i) else i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = glob[i + 1:end]
+                if body[:1] in ("!", "^"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(glob[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def parse_ignore_lines(lines: List[str], ignore_case: bool = False) -> List[IgnorePattern]:
+    """Compile the lines of one ignore file"""
+    flags = re.IGNORECASE if ignore_case else 0
+    patterns = []
+    for line in lines:
+        line = line.rstrip("\n").rstrip("\r")
+        # Trailing spaces are ignored unless escaped with a backslash
+        while line.endswith(" ") and not line.endswith("\\ "):
+            line = line[:-1]
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith("\\!") or line.startswith("\\#"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        if dir_only:
+            line = line.rstrip("/")
+        if not line:
+            continue
+        basename_only = "/" not in line
+        line = line.lstrip("/")
+        regex = re.compile(_translate(line) + r"\Z", flags)
+        patterns.append(IgnorePattern(regex, negated, dir_only, basename_only))
+    return patterns
+
+
+def read_ignore_file(path: Path, ignore_case: bool = False) -> List[IgnorePattern]:
+    """Compile an ignore file; a missing file yields no patterns"""
+    try:
+        text = Path(path).read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return []
+    return parse_ignore_lines(text.splitlines(), ignore_case)
+
+
+def _match_list(patterns: List[IgnorePattern], rel: str, is_dir: bool) -> Optional[bool]:
+    """Return True/False if the last matching pattern decides ``rel``, else None"""
+    basename = rel.rsplit("/", 1)[-1]
+    for pattern in reversed(patterns):
+        if pattern.dir_only and not is_dir:
+            continue
+        target = basename if pattern.basename_only else rel
+        if pattern.regex.match(target):
+            return not pattern.negated
+    return None
+
+
+class IgnoreMatcher:
+    """Decides whether worktree paths are ignored.
+
+    Per-directory ``.gitignore`` files are loaded lazily and cached together
+    with their mtimes, so edits to an ignore file are picked up. Inside a pass
+    started with ``begin_pass`` each file is stat'ed at most once. Precedence
+    follows git: deeper ``.gitignore`` files win over shallower ones, which win
+    over ``info/exclude`` and ``core.excludesFile``.
+    """
+
+    def __init__(self, worktree: Path, git_dir: Path, excludes_file: Optional[Path] = None,
+                 ignore_case: bool = False):
+        self.worktree = Path(worktree)
+        self.ignore_case = ignore_case
+        # Lowest precedence first
+        self.global_files = [Path(git_dir) / "info" / "exclude"]
+        if excludes_file is not None:
+            self.global_files.insert(0, Path(excludes_file))
+        self._root = str(self.worktree)
+        self._files: Dict[str, Tuple[Optional[int], List[IgnorePattern]]] = {}
+        self._checked: Optional[Set[str]] = None
+
+    def begin_pass(self) -> None:
+        """Start a query pass; ignore files are stat'ed once until the next pass"""
+        self._checked = set()
+
+    def _file_patterns(self, path: str) -> List[IgnorePattern]:
+        """Return the compiled patterns of ``path``, re-reading it if it changed"""
+        cached = self._files.get(path)
+        if self._checked is not None:
+            if cached is not None and path in self._checked:
+                return cached[1]
+            self._checked.add(path)
+        try:
+            mtime: Optional[int] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        patterns = read_ignore_file(Path(path), self.ignore_case) if mtime is not None else []
+        self._files[path] = (mtime, patterns)
+        return patterns
+
+    def _dir_patterns(self, rel_dir: str) -> List[IgnorePattern]:
+        base = self._root + "/" + rel_dir if rel_dir else self._root
+        return self._file_patterns(base + "/.gitignore")
+
+    def is_ignored(self, rel: str, is_dir: bool) -> bool:
+        """Return True if ``rel`` (relative to the worktree, ``/``-separated) is ignored.
+
+        Callers walking the tree top-down should stop descending into ignored
+        directories; this method only evaluates the path itself, matching git's
+        rule that files inside an excluded directory cannot be re-included.
+        """
+        parts = rel.split("/")
+        # Deepest .gitignore first: it has the highest precedence
+        for depth in range(len(parts) - 1, -1, -1):
+            base = "/".join(parts[:depth])
+            patterns = self._dir_patterns(base)
+            if not patterns:
+                continue
+            sub = "/".join(parts[depth:])
+            decided = _match_list(patterns, sub, is_dir)
+            if decided is not None:
+                return decided
+        for path in reversed(self.global_files):
+            decided = _match_list(self._file_patterns(str(path)), rel, is_dir)
+            if decided is not None:
+                return decided
+        return False
+
+    def is_path_excluded(self, rel: str, is_dir: bool) -> bool:
+        """Return True if ``rel`` or any of its parent directories is ignored"""
+        parts = rel.split("/")
+        for i in range(1, len(parts)):
+            if self.is_ignored("/".join(parts[:i]), True):
+                return True
+        return self.is_ignored(rel, is_dir)
@@ -0,0 +1,181 @@
+"""Parser for the git index (``.git/index``) file, versions 2 to 4"""
+
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Entry flags
+FLAG_ASSUME_VALID = 0x8000
+FLAG_EXTENDED = 0x4000
+FLAG_STAGE_MASK = 0x3000
+FLAG_NAME_MASK = 0x0FFF
+
+# Extended entry flags (index v3+)
+FLAG_SKIP_WORKTREE = 0x4000
+FLAG_INTENT_TO_ADD = 0x2000
+
+# Object type bits of an entry mode
+MODE_TYPE_MASK = 0o170000
+MODE_REGULAR = 0o100000
+MODE_SYMLINK = 0o120000
+MODE_GITLINK = 0o160000
+
+_ENTRY_HEAD = struct.Struct(">10I20sH")
+
+
+class IndexParseError(Exception):
+    """Raised when the index cannot be parsed"""
+
+
+@dataclass
+class IndexEntry:
+    """One cached path in the index, with the stat data recorded at staging time"""
+
+    path: bytes
+    oid: bytes
+    mode: int
+    size: int
+    mtime_s: int
+    mtime_ns: int
+    ctime_s: int
+    ctime_ns: int
+    dev: int
+    ino: int
+    uid: int
+    gid: int
+    flags: int
+    extended_flags: int = 0
+
+    @property
+    def stage(self) -> int:
+        return (self.flags & FLAG_STAGE_MASK) >> 12
+
+    @property
+    def assume_valid(self) -> bool:
+        return bool(self.flags & FLAG_ASSUME_VALID)
+
+    @property
+    def skip_worktree(self) -> bool:
+        return bool(self.extended_flags & FLAG_SKIP_WORKTREE)
+
+    @property
+    def intent_to_add(self) -> bool:
+        return bool(self.extended_flags & FLAG_INTENT_TO_ADD)
+
+
+@dataclass
+class Index:
+    """A parsed index file"""
+
+    version: int
+    entries: List[IndexEntry]
+    extensions: Dict[bytes, bytes]
+    checksum: bytes
+    # Root tree oid from the cache-tree extension, if it is valid
+    cache_tree_root: Optional[bytes] = None
+
+    def by_path(self) -> Dict[bytes, IndexEntry]:
+        """Return stage-0 entries keyed by path"""
+        return {e.path: e for e in self.entries if e.stage == 0}
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Decode the offset-style varint used by index v4 path compression"""
+    c = data[pos]
+    pos += 1
+    value = c & 0x7F
+    while c & 0x80:
+        c = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (c & 0x7F)
+    return value, pos
+
+
+def _parse_cache_tree_root(data: bytes) -> Optional[bytes]:
+    """Return the root tree oid recorded by a ``TREE`` extension, if valid"""
+    nul = data.find(b"\0")
+    if nul != 0:
+        return None
+    newline = data.find(b"\n", nul)
+    counts = data[nul + 1:newline].split(b" ")
+    if int(counts[0]) < 0:
+        return None
+    return data[newline + 1:newline + 21]
+
+
+def parse_index(data: bytes) -> Index:
+    """Parse the raw bytes of an index file"""
+    if len(data) < 32 or data[:4] != b"DIRC":
+        raise IndexParseError("Not an index file")
+    version, count = struct.unpack(">II", data[4:12])
+    if version not in (2, 3, 4):
+        raise IndexParseError(f"Unsupported index version {version}")
+
+    entries: List[IndexEntry] = []
+    pos = 12
+    prev_path = b""
+    unpack = _ENTRY_HEAD.unpack_from
+    head_size = _ENTRY_HEAD.size
+    for _ in range(count):
+        start = pos
+        (ctime_s, ctime_ns, mtime_s, mtime_ns, dev, ino, mode,
+         uid, gid, size, oid, flags) = unpack(data, pos)
+        pos += head_size
+        extended = 0
+        if flags & FLAG_EXTENDED:
+            if version < 3:
+                raise IndexParseError("Extended flags in a version 2 index")
+            extended = struct.unpack_from(">H", data, pos)[0]
+            pos += 2
+
+        if version == 4:
+            strip, pos = _read_varint(data, pos)
+            nul = data.index(b"\0", pos)
+            path = prev_path[:len(prev_path) - strip] + data[pos:nul]
+            pos = nul + 1
+        else:
+            name_len = flags & FLAG_NAME_MASK
+            if name_len == FLAG_NAME_MASK:
+                nul = data.index(b"\0", pos)
+            else:
+                nul = pos + name_len
+            path = data[pos:nul]
+            # Entries are NUL-padded to a multiple of 8 bytes (at least one NUL)
+            pos = start + ((nul - start + 8) & ~7)
+        prev_path = path
+
+        entries.append(IndexEntry(
+            path=path, oid=oid, mode=mode, size=size,
+            mtime_s=mtime_s, mtime_ns=mtime_ns, ctime_s=ctime_s, ctime_ns=ctime_ns,
+            dev=dev, ino=ino, uid=uid, gid=gid, flags=flags, extended_flags=extended,
+        ))
+
+    extensions: Dict[bytes, bytes] = {}
+    end = len(data) - 20
+    while pos + 8 <= end:
+        sig = data[pos:pos + 4]
+        ext_size = struct.unpack_from(">I", data, pos + 4)[0]
+        extensions[sig] = data[pos + 8:pos + 8 + ext_size]
+        pos += 8 + ext_size
+
+    cache_tree_root = None
+    if b"TREE" in extensions:
+        cache_tree_root = _parse_cache_tree_root(extensions[b"TREE"])
+
+    return Index(
+        version=version,
+        entries=entries,
+        extensions=extensions,
+        checksum=data[-20:],
+        cache_tree_root=cache_tree_root,
+    )
+
+
+def read_index(path: Path) -> Optional[Index]:
+    """Read and parse an index file; returns None if it does not exist"""
+    try:
+        data = Path(path).read_bytes()
+    except FileNotFoundError:
+        return None
+    return parse_index(data)
@@ -0,0 +1,12 @@
+"""Default result sizes, kept apart so tool schemas can be built without the git engine"""
+
+# Diff pages
+DEFAULT_MAX_BYTES = 64 * 1024
+DEFAULT_MAX_LINES = 2000
+
+# Search results per page
+DEFAULT_PAGE_SIZE = 50
+
+# Diff summaries
+DEFAULT_SUMMARY_BYTES = 8 * 1024
+DEFAULT_TOP_HUNKS = 5
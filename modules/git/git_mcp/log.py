@@ -0,0 +1,424 @@
+"""In-process commit walker backing ``git_log`` (loose objects, packs, commit-graph)"""
+
+import base64
+import hashlib
+import heapq
+import json
+import math
+import re
+import struct
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from git_mcp.objects import OBJ_COMMIT, OBJ_TAG, OBJ_TREE, TREE_MODE, ObjectStore, ObjectStoreError, parse_tree
+
+_GRAPH_PARENT_NONE = 0x70000000
+_GRAPH_EXTRA_EDGES = 0x80000000
+
+
+class LogUnsupported(Exception):
+    """Raised when the walker cannot faithfully reproduce ``git log``"""
+
+
+@dataclass
+class Signature:
+    """Author or committer line of a commit"""
+
+    name: str
+    email: str
+    timestamp: int
+    tz: str
+
+    @classmethod
+    def parse(cls, raw: bytes) -> "Signature":
+        text = raw.decode("utf-8", errors="replace")
+        name, _, rest = text.partition(" <")
+        email, _, when = rest.partition("> ")
+        timestamp, _, tz = when.partition(" ")
+        return cls(name=name, email=email, timestamp=int(timestamp or 0), tz=tz or "+0000")
+
+    def datetime(self) -> datetime:
+        sign = -1 if self.tz.startswith("-") else 1
+        offset = timedelta(hours=int(self.tz[1:3] or 0), minutes=int(self.tz[3:5] or 0)) * sign
+        return datetime.fromtimestamp(self.timestamp, timezone(offset))
+
+    def iso(self) -> str:
+        return self.datetime().isoformat()
+
+    def git_date(self) -> str:
+        """Format like git's default date format (``Thu Oct 15 10:00:00 2026 +0200``)"""
+        dt = self.datetime()
+        return f"{dt:%a %b} {dt.day} {dt:%H:%M:%S %Y} {self.tz}"
+
+
+@dataclass
+class Commit:
+    """A parsed commit object"""
+
+    oid: str
+    tree: str
+    parents: List[str]
+    author: Signature
+    committer: Signature
+    message: str
+
+    @property
+    def subject(self) -> str:
+        return self.message.split("\n", 1)[0]
+
+    def to_dict(self, abbrev: int) -> Dict[str, object]:
+        subject, _, body = self.message.partition("\n")
+        return {
+            "oid": self.oid,
+            "short": self.oid[:abbrev],
+            "parents": self.parents,
+            "author": {"name": self.author.name, "email": self.author.email, "date": self.author.iso()},
+            "committer": {"name": self.committer.name, "email": self.committer.email, "date": self.committer.iso()},
+            "subject": subject,
+            "body": body.strip("\n"),
+        }
+
+
+def parse_commit(oid: str, data: bytes) -> Commit:
+    """Parse the raw content of a commit object"""
+    header, _, message = data.partition(b"\n\n")
+    tree = ""
+    parents: List[str] = []
+    author = committer = None
+    for line in header.split(b"\n"):
+        if line.startswith(b"tree "):
+            tree = line[5:].decode()
+        elif line.startswith(b"parent "):
+            parents.append(line[7:].decode())
+        elif line.startswith(b"author "):
+            author = Signature.parse(line[7:])
+        elif line.startswith(b"committer "):
+            committer = Signature.parse(line[10:])
+    if author is None or committer is None:
+        raise ObjectStoreError(f"Malformed commit {oid}")
+    return Commit(
+        oid=oid,
+        tree=tree,
+        parents=parents,
+        author=author,
+        committer=committer,
+        message=message.decode("utf-8", errors="replace"),
+    )
+
+
+class CommitGraph:
+    """Reader for ``objects/info/commit-graph`` files (single file or split chain).
+
+    Gives parents and commit dates without inflating commit objects, which is
+    what makes walking past filtered-out commits cheap.
+    """
+
+    def __init__(self, objects_dir: Path):
+        info = Path(objects_dir) / "info"
+        chain = info / "commit-graphs" / "commit-graph-chain"
+        paths: List[Path] = []
+        if chain.exists():
+            paths = [info / "commit-graphs" / f"graph-{h.strip()}.graph" for h in chain.read_text().split()]
+        elif (info / "commit-graph").exists():
+            paths = [info / "commit-graph"]
+        self._oids: List[bytes] = []
+        self._positions: Dict[bytes, int] = {}
+        self._cdat: List[Tuple[bytes, int]] = []
+        self._edges: List[bytes] = []
+        for path in paths:
+            self._load(path)
+
+    def _load(self, path: Path) -> None:
+        data = path.read_bytes()
+        if data[:4] != b"CGPH" or data[4] != 1 or data[5] != 1:
+            raise LogUnsupported(f"Unsupported commit-graph format in {path.name}")
+        chunk_count = data[6]
+        chunks: Dict[bytes, Tuple[int, int]] = {}
+        for i in range(chunk_count):
+            pos = 8 + 12 * i
+            cid = data[pos:pos + 4]
+            start = struct.unpack(">Q", data[pos + 4:pos + 12])[0]
+            end = struct.unpack(">Q", data[pos + 16:pos + 24])[0]
+            chunks[cid] = (start, end)
+        base = len(self._oids)
+        oidl_start, oidl_end = chunks[b"OIDL"]
+        count = (oidl_end - oidl_start) // 20
+        for i in range(count):
+            oid = data[oidl_start + 20 * i:oidl_start + 20 * i + 20]
+            self._positions[oid] = base + i
+            self._oids.append(oid)
+        self._cdat.append((data[chunks[b"CDAT"][0]:chunks[b"CDAT"][1]], base))
+        if b"EDGE" in chunks:
+            self._edges.append(data[chunks[b"EDGE"][0]:chunks[b"EDGE"][1]])
+        else:
+            self._edges.append(b"")
+
+    def __contains__(self, oid: bytes) -> bool:
+        return oid in self._positions
+
+    def lookup(self, oid: bytes) -> Optional[Tuple[List[bytes], int]]:
+        """Return ``(parents, commit time)`` for a commit, or None if not in the graph"""
+        pos = self._positions.get(oid)
+        if pos is None:
+            return None
+        layer = 0
+        while layer + 1 < len(self._cdat) and self._cdat[layer + 1][1] <= pos:
+            layer += 1
+        cdat, base = self._cdat[layer]
+        start = 36 * (pos - base)
+        p1, p2, hi, lo = struct.unpack(">IIII", cdat[start + 20:start + 36])
+        commit_time = ((hi & 0x3) << 32) | lo
+        parents = []
+        if p1 != _GRAPH_PARENT_NONE:
+            parents.append(self._oids[p1])
+        if p2 != _GRAPH_PARENT_NONE:
+            if p2 & _GRAPH_EXTRA_EDGES:
+                edges = self._edges[layer]
+                i = p2 & 0x7FFFFFFF
+                while True:
+                    value = struct.unpack(">I", edges[4 * i:4 * i + 4])[0]
+                    parents.append(self._oids[value & 0x7FFFFFFF])
+                    if value & _GRAPH_EXTRA_EDGES:
+                        break
+                    i += 1
+            else:
+                parents.append(self._oids[p2])
+        return parents, commit_time
+
+
+@dataclass
+class LogFilters:
+    """Filters applied while walking; all are optional"""
+
+    path: Optional[str] = None
+    author: Optional[str] = None
+    since: Optional[int] = None
+    until: Optional[int] = None
+    grep: Optional[str] = None
+
+    def fingerprint(self, start: List[str]) -> str:
+        raw = json.dumps([start, self.path, self.author, self.since, self.until, self.grep])
+        return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+def parse_date(value: str) -> int:
+    """Parse ``YYYY-MM-DD`` or an ISO datetime into a Unix timestamp (UTC if naive)"""
+    dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+class CommitWalker:
+    """Walks history newest-first (by committer date) and resumes from a cursor.
+
+    The cursor records only the walk frontier (pending commits), so fetching
+    the next page costs O(page), not O(history already returned). Parent links
+    and dates come from the commit-graph when available; commit objects are
+    only inflated for commits that are returned or need filter checks.
+    Path filtering shows a commit when the path differs from its parent (for
+    merges: from every parent), like git's default history simplification
+    but without pruning side branches.
+    """
+
+    def __init__(self, store: ObjectStore, objects_dir: Path, shallow: Optional[set] = None):
+        self.store = store
+        self.objects_dir = Path(objects_dir)
+        self.shallow = shallow or set()
+        self._lock = threading.Lock()
+        self._graph: Optional[CommitGraph] = None
+        self._graph_key: Optional[Tuple[float, ...]] = None
+
+    @property
+    def graph(self) -> CommitGraph:
+        info = self.objects_dir / "info"
+        key = tuple(
+            p.stat().st_mtime_ns if p.exists() else 0
+            for p in (info / "commit-graph", info / "commit-graphs" / "commit-graph-chain")
+        )
+        if self._graph is None or key != self._graph_key:
+            self._graph = CommitGraph(self.objects_dir)
+            self._graph_key = key
+        return self._graph
+
+    def abbrev_length(self) -> int:
+        """Approximate git's automatic abbreviation length from the object count"""
+        count = sum(pack.index.count for pack in self.store._packs.values())
+        if count <= 0:
+            return 7
+        bits = int(math.log2(count)) + 1
+        return max(7, (bits + 1) // 2)
+
+    def _parents_and_time(self, oid: bytes) -> Tuple[List[bytes], int, Optional[Commit]]:
+        found = self.graph.lookup(oid)
+        if found is not None:
+            parents, commit_time = found
+            return parents, commit_time, None
+        commit = self.read_commit(oid)
+        parents = [bytes.fromhex(p) for p in commit.parents]
+        return parents, commit.committer.timestamp, commit
+
+    def read_commit(self, oid: bytes) -> Commit:
+        obj_type, data = self.store.read(oid)
+        if obj_type != OBJ_COMMIT:
+            raise ObjectStoreError(f"{oid.hex()} is not a commit")
+        return parse_commit(oid.hex(), data)
+
+    def peel_to_commit(self, oid: bytes) -> bytes:
+        for _ in range(10):
+            obj_type, data = self.store.read(oid)
+            if obj_type == OBJ_COMMIT:
+                return oid
+            if obj_type != OBJ_TAG:
+                raise ObjectStoreError(f"{oid.hex()} does not point to a commit")
+            oid = bytes.fromhex(data[7:47].decode())
+        raise ObjectStoreError("Tag chain too long")
+
+    def _path_oid(self, tree_hex: str, parts: List[bytes]) -> Optional[bytes]:
+        oid = bytes.fromhex(tree_hex)
+        for i, part in enumerate(parts):
+            found = None
+            for mode, name, child in parse_tree(self.store.read_typed(oid, OBJ_TREE)):
+                if name == part:
+                    found = (mode, child)
+                    break
+            if found is None:
+                return None
+            mode, oid = found
+            if i + 1 < len(parts) and mode != TREE_MODE:
+                return None
+        return oid
+
+    def _touches(self, commit: Commit, parts: List[bytes]) -> bool:
+        mine = self._path_oid(commit.tree, parts)
+        if not commit.parents:
+            return mine is not None
+        for parent in commit.parents:
+            parent_oid = bytes.fromhex(parent)
+            if parent_oid in self.shallow and not self.store.contains(parent_oid):
+                return mine is not None
+            if self._path_oid(self.read_commit(parent_oid).tree, parts) == mine:
+                return False
+        return True
+
+    def walk(
+        self,
+        start: List[bytes],
+        limit: int,
+        filters: LogFilters,
+        cursor: Optional[str] = None,
+        start_names: Optional[List[str]] = None,
+    ) -> Tuple[List[Commit], Optional[str]]:
+        """Return up to ``limit`` matching commits and a cursor for the next page"""
+        with self._lock:
+            return self._walk(start, limit, filters, cursor, start_names or [])
+
+    def _walk(self, start: List[bytes], limit: int, filters: LogFilters, cursor: Optional[str],
+              start_names: List[str]) -> Tuple[List[Commit], Optional[str]]:
+        fingerprint = filters.fingerprint(start_names)
+        if cursor:
+            frontier = decode_log_cursor(cursor, fingerprint)
+        else:
+            frontier = [self.peel_to_commit(oid) for oid in start]
+
+        author_re = re.compile(filters.author, re.IGNORECASE) if filters.author else None
+        grep_re = re.compile(filters.grep, re.IGNORECASE | re.MULTILINE) if filters.grep else None
+        path_parts = [p.encode() for p in filters.path.strip("/").split("/")] if filters.path else None
+
+        heap: List[Tuple[int, int, bytes, Optional[Commit]]] = []
+        queued = set()
+        seq = 0
+        for oid in frontier:
+            if oid in queued:
+                continue
+            parents_time = self._parents_and_time(oid)
+            heapq.heappush(heap, (-parents_time[1], seq, oid, parents_time[2]))
+            queued.add(oid)
+            seq += 1
+
+        results: List[Commit] = []
+        while heap and len(results) < limit:
+            neg_time, _, oid, commit = heapq.heappop(heap)
+            commit_time = -neg_time
+            if filters.since is not None and commit_time < filters.since:
+                # Everything still queued is older: the walk is over
+                heap.clear()
+                break
+
+            parents, _, graph_commit = self._parents_and_time(oid) if commit is None else (
+                [bytes.fromhex(p) for p in commit.parents], commit_time, commit)
+            commit = commit or graph_commit
+            for parent in parents:
+                if parent in queued:
+                    continue
+                if parent in self.shallow and not self.store.contains(parent):
+                    continue
+                _, p_time, p_commit = self._parents_and_time(parent)
+                heapq.heappush(heap, (-p_time, seq, parent, p_commit))
+                queued.add(parent)
+                seq += 1
+
+            if filters.until is not None and commit_time > filters.until:
+                continue
+            commit = commit or self.read_commit(oid)
+            if author_re and not author_re.search(f"{commit.author.name} <{commit.author.email}>"):
+                continue
+            if grep_re and not grep_re.search(commit.message):
+                continue
+            if path_parts and not self._touches(commit, path_parts):
+                continue
+            results.append(commit)
+
+        next_cursor = None
+        if heap:
+            pending = [entry[2] for entry in sorted(heap)]
+            next_cursor = encode_log_cursor(pending, fingerprint)
+        return results, next_cursor
+
+
+def encode_log_cursor(frontier: List[bytes], fingerprint: str) -> str:
+    payload = json.dumps({"q": fingerprint, "f": [oid.hex() for oid in frontier]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_log_cursor(cursor: str, fingerprint: str) -> List[bytes]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        frontier = [bytes.fromhex(oid) for oid in payload["f"]]
+        cursor_fingerprint = payload["q"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid log cursor: {e}")
+    if cursor_fingerprint != fingerprint:
+        raise ValueError("Cursor belongs to a different query (start or filters changed)")
+    return frontier
+
+
+def format_commits(commits: List[Commit], oneline: bool, abbrev: int) -> str:
+    """Render commits like ``git log`` / ``git log --oneline``"""
+    if oneline:
+        return "".join(f"{c.oid[:abbrev]} {c.subject}\n" for c in commits)
+    blocks = []
+    for c in commits:
+        lines = [f"commit {c.oid}"]
+        if len(c.parents) > 1:
+            lines.append("Merge: " + " ".join(p[:abbrev] for p in c.parents))
+        lines.append(f"Author: {c.author.name} <{c.author.email}>")
+        lines.append(f"Date:   {c.author.git_date()}")
+        lines.append("")
+        lines.extend(f"    {line}" if line else "" for line in c.message.rstrip("\n").split("\n"))
+        blocks.append("\n".join(lines) + "\n")
+    return "\n".join(blocks)
+
+
+def iter_shallow(git_dir: Path) -> Iterator[bytes]:
+    """Yield the commit ids listed in ``.git/shallow``"""
+    try:
+        text = (Path(git_dir) / "shallow").read_text()
+    except FileNotFoundError:
+        return
+    for line in text.split():
+        yield bytes.fromhex(line)
@@ -0,0 +1,365 @@
+"""Read-only access to git objects stored loose or in packfiles"""
+
+import hashlib
+import mmap
+import os
+import struct
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+OBJ_COMMIT = 1
+OBJ_TREE = 2
+OBJ_BLOB = 3
+OBJ_TAG = 4
+OBJ_OFS_DELTA = 6
+OBJ_REF_DELTA = 7
+
+TYPE_NAMES = {OBJ_COMMIT: "commit", OBJ_TREE: "tree", OBJ_BLOB: "blob", OBJ_TAG: "tag"}
+
+# Mode of a tree entry that is itself a tree
+TREE_MODE = 0o040000
+
+
+class ObjectStoreError(Exception):
+    """Raised when an object cannot be read by the in-process object store"""
+
+
+class PackIndex:
+    """A version 2 pack ``.idx`` file mapped into memory"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._data[:4] != b"\377tOc" or struct.unpack(">I", self._data[4:8])[0] != 2:
+            raise ObjectStoreError(f"Unsupported pack index format: {path.name}")
+        self._fanout = struct.unpack(">256I", self._data[8:8 + 1024])
+        self.count = self._fanout[255]
+        self._sha_start = 8 + 1024
+        self._crc_start = self._sha_start + 20 * self.count
+        self._off_start = self._crc_start + 4 * self.count
+        self._large_start = self._off_start + 4 * self.count
+
+    def _sha_at(self, i: int) -> bytes:
+        start = self._sha_start + 20 * i
+        return self._data[start:start + 20]
+
+    def find(self, oid: bytes) -> Optional[int]:
+        """Return the pack offset of ``oid`` or None if it is not in this pack"""
+        first = oid[0]
+        lo = self._fanout[first - 1] if first else 0
+        hi = self._fanout[first]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            sha = self._sha_at(mid)
+            if sha < oid:
+                lo = mid + 1
+            elif sha > oid:
+                hi = mid
+            else:
+                return self._offset_at(mid)
+        return None
+
+    def _offset_at(self, i: int) -> int:
+        start = self._off_start + 4 * i
+        offset = struct.unpack(">I", self._data[start:start + 4])[0]
+        if offset & 0x80000000:
+            start = self._large_start + 8 * (offset & 0x7FFFFFFF)
+            offset = struct.unpack(">Q", self._data[start:start + 8])[0]
+        return offset
+
+    def oids(self) -> Iterator[bytes]:
+        """Iterate over every object id in the pack, in sorted order"""
+        for i in range(self.count):
+            yield self._sha_at(i)
+
+    def close(self) -> None:
+        self._data.close()
+
+
+class Pack:
+    """A packfile together with its index"""
+
+    def __init__(self, idx_path: Path):
+        self.index = PackIndex(idx_path)
+        self.path = idx_path.with_suffix(".pack")
+        with open(self.path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._data[:4] != b"PACK":
+            raise ObjectStoreError(f"Not a packfile: {self.path.name}")
+
+    def read_at(self, offset: int, store: "ObjectStore") -> Tuple[int, bytes]:
+        """Read and fully resolve the object stored at ``offset``"""
+        data = self._data
+        pos = offset
+        c = data[pos]
+        pos += 1
+        obj_type = (c >> 4) & 7
+        size = c & 15
+        shift = 4
+        while c & 0x80:
+            c = data[pos]
+            pos += 1
+            size |= (c & 0x7F) << shift
+            shift += 7
+
+        if obj_type == OBJ_OFS_DELTA:
+            c = data[pos]
+            pos += 1
+            base_rel = c & 0x7F
+            while c & 0x80:
+                c = data[pos]
+                pos += 1
+                base_rel = ((base_rel + 1) << 7) | (c & 0x7F)
+            base_type, base = store.read_pack_offset(self, offset - base_rel)
+            return base_type, apply_delta(base, self._inflate(pos, size))
+        if obj_type == OBJ_REF_DELTA:
+            base_oid = bytes(data[pos:pos + 20])
+            pos += 20
+            base_type, base = store.read(base_oid)
+            return base_type, apply_delta(base, self._inflate(pos, size))
+        if obj_type not in TYPE_NAMES:
+            raise ObjectStoreError(f"Bad object type {obj_type} in {self.path.name}")
+        return obj_type, self._inflate(pos, size)
+
+    def _inflate(self, pos: int, size: int) -> bytes:
+        d = zlib.decompressobj()
+        out = []
+        produced = 0
+        chunk = max(size + 64, 4096)
+        while produced < size or not d.eof:
+            piece = self._data[pos:pos + chunk]
+            if not piece:
+                break
+            pos += len(piece)
+            result = d.decompress(piece)
+            out.append(result)
+            produced += len(result)
+            if d.eof:
+                break
+        return b"".join(out)
+
+    def close(self) -> None:
+        self.index.close()
+        self._data.close()
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Apply a git binary delta to ``base``"""
+    pos = 0
+
+    def varint() -> int:
+        nonlocal pos
+        value = 0
+        shift = 0
+        while True:
+            c = delta[pos]
+            pos += 1
+            value |= (c & 0x7F) << shift
+            shift += 7
+            if not c & 0x80:
+                return value
+
+    if varint() != len(base):
+        raise ObjectStoreError("Delta base size mismatch")
+    target_size = varint()
+    out = bytearray()
+    end = len(delta)
+    while pos < end:
+        cmd = delta[pos]
+        pos += 1
+        if cmd & 0x80:
+            copy_off = 0
+            copy_len = 0
+            for i in range(4):
+                if cmd & (1 << i):
+                    copy_off |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if cmd & (0x10 << i):
+                    copy_len |= delta[pos] << (8 * i)
+                    pos += 1
+            if copy_len == 0:
+                copy_len = 0x10000
+            out += base[copy_off:copy_off + copy_len]
+        elif cmd:
+            out += delta[pos:pos + cmd]
+            pos += cmd
+        else:
+            raise ObjectStoreError("Invalid delta opcode 0")
+    if len(out) != target_size:
+        raise ObjectStoreError("Delta result size mismatch")
+    return bytes(out)
+
+
+class ObjectStore:
+    """Reads objects from an ``objects`` directory and its alternates.
+
+    Only SHA-1 repositories are supported. Packs are discovered lazily and
+    rescanned when an object is not found, so packs written by ``git gc``
+    while the server is running are picked up.
+    """
+
+    def __init__(self, objects_dir: Path, cache_size: int = 256):
+        self.objects_dir = Path(objects_dir)
+        self.dirs = [self.objects_dir] + self._alternates(self.objects_dir)
+        self._packs: Dict[Path, Pack] = {}
+        self._cache: "OrderedDict[Tuple[Path, int], Tuple[int, bytes]]" = OrderedDict()
+        self._cache_size = cache_size
+        self._scan_packs()
+
+    @staticmethod
+    def _alternates(objects_dir: Path) -> List[Path]:
+        alt_file = objects_dir / "info" / "alternates"
+        try:
+            lines = alt_file.read_text().splitlines()
+        except OSError:
+            return []
+        dirs = []
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                path = Path(line)
+                dirs.append(path if path.is_absolute() else (objects_dir / path).resolve())
+        return dirs
+
+    def _scan_packs(self) -> bool:
+        """Open any packs not seen before; return True if new packs were found"""
+        found = False
+        for objects_dir in self.dirs:
+            pack_dir = objects_dir / "pack"
+            try:
+                names = os.listdir(pack_dir)
+            except OSError:
+                continue
+            for name in names:
+                if not name.endswith(".idx"):
+                    continue
+                idx_path = pack_dir / name
+                if idx_path in self._packs or not idx_path.with_suffix(".pack").exists():
+                    continue
+                self._packs[idx_path] = Pack(idx_path)
+                found = True
+        return found
+
+    def read_pack_offset(self, pack: Pack, offset: int) -> Tuple[int, bytes]:
+        """Read an object by pack offset, using the small delta-base cache"""
+        key = (pack.path, offset)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+        result = pack.read_at(offset, self)
+        self._cache[key] = result
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def _read_loose(self, oid: bytes) -> Optional[Tuple[int, bytes]]:
+        hex_oid = oid.hex()
+        for objects_dir in self.dirs:
+            path = objects_dir / hex_oid[:2] / hex_oid[2:]
+            try:
+                raw = zlib.decompress(path.read_bytes())
+            except FileNotFoundError:
+                continue
+            except (OSError, zlib.error) as e:
+                raise ObjectStoreError(f"Cannot read loose object {hex_oid}: {e}")
+            header, _, body = raw.partition(b"\0")
+            type_name = header.split(b" ", 1)[0].decode()
+            for obj_type, name in TYPE_NAMES.items():
+                if name == type_name:
+                    return obj_type, body
+            raise ObjectStoreError(f"Bad object type {type_name!r} for {hex_oid}")
+        return None
+
+    def _read_packed(self, oid: bytes) -> Optional[Tuple[int, bytes]]:
+        for pack in self._packs.values():
+            offset = pack.index.find(oid)
+            if offset is not None:
+                return self.read_pack_offset(pack, offset)
+        return None
+
+    def read(self, oid: bytes) -> Tuple[int, bytes]:
+        """Return ``(type, content)`` for a binary object id"""
+        result = self._read_packed(oid) or self._read_loose(oid)
+        if result is None and self._scan_packs():
+            result = self._read_packed(oid)
+        if result is None:
+            raise ObjectStoreError(f"Object not found: {oid.hex()}")
+        return result
+
+    def contains(self, oid: bytes) -> bool:
+        """Return True if the object exists in this store"""
+        hex_oid = oid.hex()
+        for objects_dir in self.dirs:
+            if (objects_dir / hex_oid[:2] / hex_oid[2:]).exists():
+                return True
+        return any(pack.index.find(oid) is not None for pack in self._packs.values())
+
+    def read_typed(self, oid: bytes, expected: int) -> bytes:
+        """Read an object and check that it has the expected type"""
+        obj_type, data = self.read(oid)
+        if obj_type != expected:
+            raise ObjectStoreError(
+                f"Object {oid.hex()} is a {TYPE_NAMES[obj_type]}, expected {TYPE_NAMES[expected]}"
+            )
+        return data
+
+    def peel_to_tree(self, oid: bytes) -> bytes:
+        """Follow tags and commits until a tree object id is reached"""
+        while True:
+            obj_type, data = self.read(oid)
+            if obj_type == OBJ_TREE:
+                return oid
+            if obj_type == OBJ_COMMIT:
+                return bytes.fromhex(data[5:45].decode())
+            if obj_type == OBJ_TAG:
+                oid = bytes.fromhex(data[7:47].decode())
+                continue
+            raise ObjectStoreError(f"Cannot peel {oid.hex()} to a tree")
+
+    def close(self) -> None:
+        for pack in self._packs.values():
+            pack.close()
+        self._packs.clear()
+        self._cache.clear()
+
+
+def parse_tree(data: bytes) -> Iterator[Tuple[int, bytes, bytes]]:
+    """Yield ``(mode, name, oid)`` for each entry of a raw tree object"""
+    pos = 0
+    end = len(data)
+    while pos < end:
+        space = data.index(b" ", pos)
+        nul = data.index(b"\0", space)
+        mode = int(data[pos:space], 8)
+        name = data[space + 1:nul]
+        oid = data[nul + 1:nul + 21]
+        pos = nul + 21
+        yield mode, name, oid
+
+
+def flatten_tree(store: ObjectStore, tree_oid: bytes, prefix: bytes = b"") -> Dict[bytes, Tuple[int, bytes]]:
+    """Return ``{path: (mode, oid)}`` for every non-tree entry below a tree"""
+    result: Dict[bytes, Tuple[int, bytes]] = {}
+    stack = [(tree_oid, prefix)]
+    while stack:
+        oid, base = stack.pop()
+        for mode, name, child in parse_tree(store.read_typed(oid, OBJ_TREE)):
+            path = base + name
+            if mode == TREE_MODE:
+                stack.append((child, path + b"/"))
+            else:
+                result[path] = (mode, child)
+    return result
+
+
+def hash_object(obj_type: int, data: bytes) -> bytes:
+    """Return the binary SHA-1 object id git would assign to ``data``"""
+    header = f"{TYPE_NAMES[obj_type]} {len(data)}\0".encode()
+    h = hashlib.sha1(header)
+    h.update(data)
+    return h.digest()
@@ -0,0 +1,51 @@
+"""Reading HEAD, loose refs and packed-refs without invoking git"""
+
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+class RefError(Exception):
+    """Raised when a ref cannot be resolved in-process"""
+
+
+def read_packed_refs(git_dir: Path) -> Dict[str, str]:
+    """Return ``{refname: hex oid}`` from ``packed-refs`` (peeled lines skipped)"""
+    refs: Dict[str, str] = {}
+    try:
+        text = (Path(git_dir) / "packed-refs").read_text()
+    except FileNotFoundError:
+        return refs
+    for line in text.splitlines():
+        if not line or line[0] in "#^":
+            continue
+        oid, _, name = line.partition(" ")
+        refs[name.strip()] = oid
+    return refs
+
+
+def read_head(git_dir: Path) -> Tuple[Optional[str], Optional[str]]:
+    """Return ``(symbolic ref, detached oid)`` for HEAD; exactly one is set"""
+    text = (Path(git_dir) / "HEAD").read_text().strip()
+    if text.startswith("ref:"):
+        return text[4:].strip(), None
+    return None, text
+
+
+def resolve_ref(git_dir: Path, name: str, packed: Optional[Dict[str, str]] = None,
+                common_dir: Optional[Path] = None) -> Optional[str]:
+    """Resolve a ref name to a hex oid, following symbolic refs; None if unborn"""
+    common_dir = Path(common_dir or git_dir)
+    for _ in range(10):
+        # Per-worktree refs (HEAD and friends) live in git_dir, shared refs in common_dir
+        base = Path(git_dir) if "/" not in name else common_dir
+        try:
+            text = (base / name).read_text().strip()
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+            if packed is None:
+                packed = read_packed_refs(common_dir)
+            return packed.get(name)
+        if text.startswith("ref:"):
+            name = text[4:].strip()
+            continue
+        return text
+    raise RefError(f"Symbolic ref loop while resolving {name}")
@@ -0,0 +1,279 @@
+"""Long-lived repository context shared by all git_mcp tool calls"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from git_mcp.log import CommitWalker, LogUnsupported, iter_shallow
+from git_mcp.objects import ObjectStore
+from git_mcp.refs import RefError, read_packed_refs
+from git_mcp.status import StatusEngine
+from git_mcp.watch import WATCH_ENABLED
+
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def resolve_git_dir(dot_git: Path) -> Optional[Path]:
+    """Return the git directory for a ``.git`` directory or ``gitdir:`` file"""
+    if dot_git.is_dir():
+        return dot_git
+    try:
+        text = dot_git.read_text().strip()
+    except OSError:
+        return None
+    if not text.startswith("gitdir:"):
+        return None
+    git_dir = Path(text[len("gitdir:"):].strip())
+    if not git_dir.is_absolute():
+        git_dir = (dot_git.parent / git_dir).resolve()
+    return git_dir if git_dir.is_dir() else None
+
+
+def resolve_common_dir(git_dir: Path) -> Path:
+    """Return the directory holding shared objects and refs (differs for linked worktrees)"""
+    try:
+        common = Path((git_dir / "commondir").read_text().strip())
+    except OSError:
+        return git_dir
+    return common if common.is_absolute() else (git_dir / common).resolve()
+
+
+class RepoContext:
+    """Repository layout and cheap state, resolved once and reused across calls.
+
+    HEAD, the current branch and packed-refs are cached and invalidated when
+    the mtime of ``HEAD``, ``index``, ``packed-refs`` or the current branch's
+    loose ref changes, so branch queries are answered without forking git.
+    The context also owns the status engine and object store for the repo.
+    """
+
+    def __init__(self, worktree: Path, git_dir: Path, common_dir: Optional[Path] = None):
+        self.worktree = Path(worktree)
+        self.git_dir = Path(git_dir)
+        self.common_dir = Path(common_dir or resolve_common_dir(self.git_dir))
+        self._lock = threading.Lock()
+        self._key: Optional[Tuple[Optional[int], ...]] = None
+        self._head: Tuple[Optional[str], Optional[str]] = (None, None)
+        self._packed: Optional[Dict[str, str]] = None
+        self._status_engine: Optional[StatusEngine] = None
+        self._store: Optional[ObjectStore] = None
+        self._walker: Optional[CommitWalker] = None
+
+    @classmethod
+    def discover(cls, start_path: Optional[Path] = None) -> Optional["RepoContext"]:
+        """Walk up from ``start_path`` (default: cwd) to the enclosing repository"""
+        current = Path(start_path or Path.cwd()).resolve()
+        while True:
+            dot_git = current / ".git"
+            if os.path.lexists(dot_git):
+                git_dir = resolve_git_dir(dot_git)
+                if git_dir is not None:
+                    return cls(current, git_dir)
+            if current == current.parent:
+                return None
+            current = current.parent
+
+    # -- cached state ------------------------------------------------------
+
+    def _refresh(self) -> None:
+        """Drop cached state if any watched file changed since the last call"""
+        head_mtime = _mtime(self.git_dir / "HEAD")
+        key_prefix = (
+            head_mtime,
+            _mtime(self.git_dir / "index"),
+            _mtime(self.common_dir / "packed-refs"),
+        )
+        if self._key is not None and self._key[:3] == key_prefix:
+            # HEAD is unchanged, so the branch ref path is too; check its mtime
+            symref = self._head[0]
+            ref_mtime = _mtime(self.common_dir / symref) if symref else None
+            if self._key[3] == ref_mtime:
+                return
+        self._head = self._read_head()
+        self._packed = None
+        symref = self._head[0]
+        ref_mtime = _mtime(self.common_dir / symref) if symref else None
+        self._key = key_prefix + (ref_mtime,)
+
+    def _read_head(self) -> Tuple[Optional[str], Optional[str]]:
+        text = (self.git_dir / "HEAD").read_text().strip()
+        if text.startswith("ref:"):
+            symref = text[4:].strip()
+            return symref, self._resolve(symref)
+        return None, text
+
+    def _resolve(self, name: str) -> Optional[str]:
+        for _ in range(10):
+            try:
+                text = (self.common_dir / name).read_text().strip()
+            except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+                return self.packed_refs().get(name)
+            if not text.startswith("ref:"):
+                return text
+            name = text[4:].strip()
+        raise RefError(f"Symbolic ref loop while resolving {name}")
+
+    def packed_refs(self) -> Dict[str, str]:
+        """Return the (cached) contents of ``packed-refs``"""
+        if self._packed is None:
+            self._packed = read_packed_refs(self.common_dir)
+        return self._packed
+
+    def head(self) -> Tuple[Optional[str], Optional[str]]:
+        """Return ``(symbolic ref or None, oid or None)`` for HEAD"""
+        with self._lock:
+            self._refresh()
+            return self._head
+
+    def current_branch(self) -> str:
+        """Return the checked-out branch name, or "" when HEAD is detached"""
+        symref, _ = self.head()
+        if symref and symref.startswith("refs/heads/"):
+            return symref[len("refs/heads/"):]
+        return ""
+
+    def head_oid(self) -> Optional[str]:
+        """Return the commit HEAD points at, or None on an unborn branch"""
+        return self.head()[1]
+
+    def index_checksum(self) -> Optional[bytes]:
+        """Return the trailing checksum of the index file (changes whenever the index does)"""
+        try:
+            with open(self.git_dir / "index", "rb") as f:
+                f.seek(-20, os.SEEK_END)
+                return f.read(20)
+        except OSError:
+            return None
+
+    def resolve_revision(self, name: str) -> Optional[str]:
+        """Resolve a branch, tag, remote branch, full ref or full oid; None if unknown"""
+        if name == "HEAD":
+            return self.head_oid()
+        if len(name) == 40 and all(c in "0123456789abcdef" for c in name.lower()):
+            return name.lower()
+        with self._lock:
+            self._refresh()
+            for candidate in (name, f"refs/{name}", f"refs/tags/{name}", f"refs/heads/{name}",
+                              f"refs/remotes/{name}", f"refs/remotes/{name}/HEAD"):
+                try:
+                    oid = self._resolve(candidate)
+                except (OSError, RefError):
+                    continue
+                if oid and len(oid) == 40 and all(c in "0123456789abcdef" for c in oid):
+                    return oid
+        return None
+
+    # -- refs listing ------------------------------------------------------
+
+    def _loose_refs(self, prefix: str) -> Dict[str, str]:
+        """Return ``{refname: content}`` for loose refs below ``prefix``"""
+        refs: Dict[str, str] = {}
+        base = self.common_dir / prefix
+        for dirpath, _, filenames in os.walk(base):
+            for filename in filenames:
+                if filename.endswith(".lock"):
+                    continue
+                path = Path(dirpath) / filename
+                try:
+                    refs[path.relative_to(self.common_dir).as_posix()] = path.read_text().strip()
+                except OSError:
+                    continue
+        return refs
+
+    def _other_worktree_branches(self) -> List[str]:
+        """Return refs checked out by linked worktrees other than this one"""
+        branches = []
+        worktrees = [self.common_dir] + sorted((self.common_dir / "worktrees").glob("*"))
+        for git_dir in worktrees:
+            if git_dir.resolve() == self.git_dir.resolve():
+                continue
+            try:
+                text = (git_dir / "HEAD").read_text().strip()
+            except OSError:
+                continue
+            if text.startswith("ref:"):
+                branches.append(text[4:].strip())
+        return branches
+
+    def list_branches(self) -> Optional[str]:
+        """Render ``git branch -a`` output from refs; None if git must be asked"""
+        symref, oid = self.head()
+        if symref is None:
+            # Detached HEAD descriptions come from the reflog; leave them to git
+            return None
+        with self._lock:
+            refs: Dict[str, str] = {}
+            for name, value in self.packed_refs().items():
+                if name.startswith(("refs/heads/", "refs/remotes/")):
+                    refs[name] = value
+        refs.update(self._loose_refs("refs/heads"))
+        refs.update(self._loose_refs("refs/remotes"))
+        elsewhere = set(self._other_worktree_branches())
+
+        lines = []
+        for name in sorted(refs):
+            value = refs[name]
+            if name.startswith("refs/heads/"):
+                short = name[len("refs/heads/"):]
+                marker = "* " if name == symref else ("+ " if name in elsewhere else "  ")
+            else:
+                short = "remotes/" + name[len("refs/remotes/"):]
+                marker = "  "
+            if value.startswith("ref:"):
+                target = value[4:].strip()
+                for prefix in ("refs/heads/", "refs/remotes/"):
+                    if target.startswith(prefix):
+                        target = target[len(prefix):]
+                lines.append(f"{marker}{short} -> {target}")
+            else:
+                lines.append(f"{marker}{short}")
+        return "".join(line + "\n" for line in lines)
+
+    # -- shared engines ----------------------------------------------------
+
+    @property
+    def store(self) -> ObjectStore:
+        """Object store for this repository (shared by all in-process readers)"""
+        if self._store is None:
+            self._store = ObjectStore(self.common_dir / "objects")
+        return self._store
+
+    @property
+    def commit_walker(self) -> CommitWalker:
+        """In-process commit walker for ``git_log``"""
+        if (self.common_dir / "info" / "grafts").exists() or (self.common_dir / "refs" / "replace").is_dir():
+            raise LogUnsupported("Grafts or replace refs change history; using git log")
+        if self._walker is None:
+            self._walker = CommitWalker(self.store, self.common_dir / "objects")
+        self._walker.shallow = set(iter_shallow(self.common_dir))
+        return self._walker
+
+    @property
+    def status_engine(self) -> StatusEngine:
+        """In-process status engine bound to this repository"""
+        if self._status_engine is None:
+            self._status_engine = StatusEngine(
+                self.worktree, self.git_dir, self.common_dir, store=self.store, watch=WATCH_ENABLED
+            )
+        return self._status_engine
+
+
+_contexts: Dict[Path, RepoContext] = {}
+
+
+def get_repo_context(start_path: Optional[Path] = None) -> Optional[RepoContext]:
+    """Return the cached RepoContext for ``start_path`` (default: cwd)"""
+    start = Path(start_path or Path.cwd())
+    ctx = _contexts.get(start)
+    if ctx is not None and ctx.git_dir.is_dir():
+        return ctx
+    ctx = RepoContext.discover(start)
+    if ctx is not None:
+        _contexts[start] = ctx
+    return ctx
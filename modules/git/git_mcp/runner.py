@@ -0,0 +1,205 @@
+"""Async git subprocess execution with a bounded process pool"""
+
+import asyncio
+import os
+import signal
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+
+# Maximum number of git child processes running at once (per server process)
+DEFAULT_MAX_PROCS = int(os.getenv("GIT_MCP_MAX_PROCS", "4"))
+
+# Per-command timeout in seconds (0 disables the timeout)
+DEFAULT_TIMEOUT = float(os.getenv("GIT_MCP_TIMEOUT", "60"))
+
+# Longest line handed out by GitRunner.stream before it is split into pieces
+STREAM_MAX_LINE = 1024 * 1024
+
+# On POSIX each git child gets its own process group so hooks, aliases and
+# helpers it spawns are killed along with it
+_POSIX = os.name == "posix"
+
+
+class GitCommandError(Exception):
+    """Raised when a git command exits with a non-zero status"""
+
+    def __init__(self, args: List[str], returncode: int, stderr: str):
+        self.args_list = args
+        self.returncode = returncode
+        self.stderr = stderr
+        super().__init__(f"Git command failed: {stderr}")
+
+
+class GitTimeoutError(GitCommandError):
+    """Raised when a git command exceeds its timeout and is killed"""
+
+    def __init__(self, args: List[str], timeout: float):
+        self.args_list = args
+        self.returncode = -1
+        self.stderr = ""
+        self.timeout = timeout
+        Exception.__init__(self, f"Git command timed out after {timeout:g}s: git {' '.join(args)}")
+
+
+class GitRunner:
+    """Runs git commands as asyncio subprocesses behind a concurrency cap.
+
+    Commands never block the event loop. At most ``max_procs`` children run at
+    the same time; further calls wait for a free slot. A command that exceeds its
+    timeout, or whose awaiting task is cancelled, has its child process killed.
+    """
+
+    def __init__(self, max_procs: int = DEFAULT_MAX_PROCS, timeout: float = DEFAULT_TIMEOUT):
+        self.max_procs = max(1, max_procs)
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(self.max_procs)
+
+    async def run(
+        self,
+        repo_root: Path,
+        args: List[str],
+        timeout: Optional[float] = None,
+        input: Optional[bytes] = None,
+        check: bool = True,
+        env: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Run ``git <args>`` in ``repo_root`` and return its stdout as text"""
+        stdout = await self.run_bytes(repo_root, args, timeout=timeout, input=input, check=check, env=env)
+        return stdout.decode("utf-8", errors="replace")
+
+    async def run_bytes(
+        self,
+        repo_root: Path,
+        args: List[str],
+        timeout: Optional[float] = None,
+        input: Optional[bytes] = None,
+        check: bool = True,
+        env: Optional[Dict[str, str]] = None,
+    ) -> bytes:
+        """Run ``git <args>`` in ``repo_root`` and return its raw stdout.
+
+        ``env`` holds variables added to the server's environment for this
+        command (e.g. ``GIT_INDEX_FILE``).
+        """
+        if timeout is None:
+            timeout = self.timeout
+        async with self._semaphore:
+            proc = await asyncio.create_subprocess_exec(
+                "git", *args,
+                cwd=repo_root,
+                env={**os.environ, **env} if env else None,
+                stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=_POSIX,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    proc.communicate(input),
+                    timeout=timeout or None,
+                )
+            except asyncio.TimeoutError:
+                await kill_process(proc)
+                raise GitTimeoutError(args, timeout)
+            except BaseException:
+                # Cancellation (or any other interruption) must not leak the child
+                await kill_process(proc)
+                raise
+
+        if check and proc.returncode != 0:
+            raise GitCommandError(args, proc.returncode, stderr.decode("utf-8", errors="replace"))
+        return stdout
+
+    async def stream(
+        self,
+        repo_root: Path,
+        args: List[str],
+        timeout: Optional[float] = None,
+        chunk_size: int = 64 * 1024,
+    ) -> AsyncIterator[bytes]:
+        """Run ``git <args>`` and yield its stdout line by line as it is produced.
+
+        Output is never buffered beyond one line (lines longer than
+        ``STREAM_MAX_LINE`` are yielded in pieces). Closing the iterator early,
+        for example once a caller's output budget is used up, kills the child.
+        The timeout applies to the whole stream.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout else None
+        async with self._semaphore:
+            proc = await asyncio.create_subprocess_exec(
+                "git", *args,
+                cwd=repo_root,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=_POSIX,
+            )
+            # Read stderr alongside stdout: a full stderr pipe would block git
+            stderr_read = asyncio.ensure_future(proc.stderr.read())
+            try:
+                pending = b""
+                while True:
+                    remaining = None if deadline is None else max(0.0, deadline - loop.time())
+                    try:
+                        chunk = await asyncio.wait_for(proc.stdout.read(chunk_size), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        raise GitTimeoutError(args, timeout)
+                    if not chunk:
+                        break
+                    pending += chunk
+                    start = 0
+                    while True:
+                        newline = pending.find(b"\n", start)
+                        if newline == -1:
+                            break
+                        yield pending[start:newline + 1]
+                        start = newline + 1
+                    pending = pending[start:]
+                    while len(pending) >= STREAM_MAX_LINE:
+                        yield pending[:STREAM_MAX_LINE]
+                        pending = pending[STREAM_MAX_LINE:]
+                if pending:
+                    yield pending
+                stderr = await stderr_read
+                await proc.wait()
+                if proc.returncode != 0:
+                    raise GitCommandError(args, proc.returncode, stderr.decode("utf-8", errors="replace"))
+            finally:
+                # Early close, timeout or cancellation: do not leave git running
+                await kill_process(proc)
+                stderr_read.cancel()
+
+
+async def kill_process(proc: asyncio.subprocess.Process) -> None:
+    """Kill a child process (if still running) and reap it"""
+    if proc.returncode is None:
+        try:
+            if _POSIX:
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except ProcessLookupError:
+            pass
+    # Shield the reap so a second cancellation cannot leave a zombie behind
+    await asyncio.shield(proc.wait())
+
+
+_runner: Optional[GitRunner] = None
+
+
+def get_runner() -> GitRunner:
+    """Return the process-wide GitRunner, creating it on first use"""
+    global _runner
+    if _runner is None:
+        _runner = GitRunner()
+    return _runner
+
+
+def configure_runner(max_procs: int = DEFAULT_MAX_PROCS, timeout: float = DEFAULT_TIMEOUT) -> GitRunner:
+    """Replace the process-wide GitRunner with one using the given limits"""
+    global _runner
+    _runner = GitRunner(max_procs=max_procs, timeout=timeout)
+    return _runner
@@ -0,0 +1,216 @@
+"""Code search with ``git grep``, memoized per tree state and paginated"""
+
+import base64
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from contextlib import aclosing
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from git_mcp.commit import worktree_signature
+from git_mcp.limits import DEFAULT_PAGE_SIZE
+from git_mcp.objects import ObjectStoreError
+from git_mcp.repo import RepoContext
+from git_mcp.runner import GitCommandError, get_runner
+
+# Threads handed to `git grep --threads`
+GREP_THREADS = int(os.getenv("GIT_MCP_GREP_THREADS", "0")) or (os.cpu_count() or 1)
+
+# Matches kept per query; the search stops (and git is killed) past this
+MAX_MATCHES = 5000
+
+# Longest line text returned per match
+MAX_LINE_CHARS = 300
+
+# Number of result sets kept in memory
+_CACHE_SIZE = 32
+
+_cache: "OrderedDict[tuple, Tuple[List[SearchMatch], bool]]" = OrderedDict()
+
+
+class SearchCursorError(Exception):
+    """Raised when a search cursor is malformed or belongs to a different query"""
+
+
+@dataclass
+class SearchMatch:
+    """One matching line"""
+
+    path: str
+    line: int
+    column: int
+    text: str
+
+
+@dataclass
+class SearchPage:
+    """One page of search results"""
+
+    matches: List[SearchMatch]
+    total: int
+    files: int
+    truncated: bool
+    next_cursor: Optional[str]
+    cached: bool
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "matches": [asdict(m) for m in self.matches],
+            "total": self.total,
+            "files": self.files,
+            "truncated": self.truncated,
+            "next_cursor": self.next_cursor,
+        }
+
+
+def grep_args(pattern: str, tree: Optional[str], source: str, paths: Optional[List[str]],
+              ignore_case: bool, regex: bool, word: bool) -> List[str]:
+    """Build the ``git grep`` command for a query"""
+    args = ["grep", "-n", "--column", "--null", "-I", "--full-name", "--no-color", f"--threads={GREP_THREADS}"]
+    args.append("-E" if regex else "-F")
+    if ignore_case:
+        args.append("-i")
+    if word:
+        args.append("-w")
+    args += ["-e", pattern]
+    if tree:
+        args.append(tree)
+    elif source == "index":
+        args.append("--cached")
+    if paths:
+        args += ["--"] + list(paths)
+    return args
+
+
+def parse_grep_line(line: bytes, prefix: bytes) -> Optional[SearchMatch]:
+    """Parse one ``path NUL line NUL column NUL text`` record"""
+    parts = line.rstrip(b"\n").split(b"\0", 3)
+    if len(parts) != 4:
+        return None
+    path, lineno, column, text = parts
+    if prefix and path.startswith(prefix):
+        path = path[len(prefix):]
+    content = text.decode("utf-8", errors="replace")
+    if len(content) > MAX_LINE_CHARS:
+        content = content[:MAX_LINE_CHARS] + "..."
+    return SearchMatch(
+        path=path.decode("utf-8", errors="replace"),
+        line=int(lineno),
+        column=int(column),
+        text=content,
+    )
+
+
+def _encode_cursor(fingerprint: str, offset: int) -> str:
+    payload = json.dumps({"q": fingerprint, "o": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, fingerprint: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        offset = int(payload["o"])
+        cursor_fingerprint = payload["q"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise SearchCursorError(f"Invalid search cursor: {e}")
+    if cursor_fingerprint != fingerprint:
+        raise SearchCursorError("Cursor belongs to a different search (query or options changed)")
+    return offset
+
+
+async def _search_state(ctx: RepoContext, source: str, ref: Optional[str]) -> Tuple[Optional[str], Optional[tuple]]:
+    """Return the tree to search (None for worktree/index) and the cache key for its content"""
+    if ref:
+        oid = ctx.resolve_revision(ref)
+        if oid is None:
+            oid = (await get_runner().run(
+                ctx.worktree, ["rev-parse", "--verify", "--quiet", "--end-of-options", f"{ref}^{{commit}}"]
+            )).strip()
+        tree = ctx.store.peel_to_tree(bytes.fromhex(oid)).hex()
+        return tree, (tree,)
+    head = ctx.head_oid()
+    if source == "index":
+        return None, (head, ctx.index_checksum())
+    return None, (head, ctx.index_checksum(), await worktree_signature(ctx))
+
+
+async def _run_grep(ctx: RepoContext, args: List[str], prefix: bytes) -> Tuple[List[SearchMatch], bool]:
+    matches: List[SearchMatch] = []
+    truncated = False
+    try:
+        async with aclosing(get_runner().stream(ctx.worktree, args)) as lines:
+            async for line in lines:
+                match = parse_grep_line(line, prefix)
+                if match is None:
+                    continue
+                if len(matches) >= MAX_MATCHES:
+                    truncated = True
+                    break
+                matches.append(match)
+    except GitCommandError as e:
+        # git grep exits with 1 when nothing matched
+        if e.returncode != 1 or e.stderr.strip():
+            raise
+    return matches, truncated
+
+
+async def search(
+    ctx: RepoContext,
+    pattern: str,
+    source: str = "worktree",
+    ref: Optional[str] = None,
+    paths: Optional[List[str]] = None,
+    ignore_case: bool = False,
+    regex: bool = False,
+    word: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> SearchPage:
+    """Search tracked files and return one page of matches.
+
+    Result sets are kept in memory keyed by the query and the searched
+    content: the tree oid for a revision, HEAD plus the index checksum for the
+    index, and additionally the worktree's state for the worktree (the file
+    watcher's event generation, or the stat data of modified files).
+    Later pages, and repeated searches while HEAD and the index are unchanged,
+    are served from memory without running ``git grep``.
+    """
+    limit = max(1, limit)
+    try:
+        tree, state = await _search_state(ctx, source, ref)
+    except (GitCommandError, ObjectStoreError, ValueError):
+        raise ValueError(f"Unknown revision: {ref}")
+    args = grep_args(pattern, tree, source, paths, ignore_case, regex, word)
+    fingerprint = hashlib.sha1("\0".join(args).encode()).hexdigest()[:12]
+    offset = _decode_cursor(cursor, fingerprint) if cursor else 0
+
+    key = (str(ctx.worktree), state, tuple(args))
+    cached = key in _cache
+    if cached:
+        _cache.move_to_end(key)
+        matches, truncated = _cache[key]
+    else:
+        prefix = tree.encode() + b":" if tree else b""
+        matches, truncated = await _run_grep(ctx, args, prefix)
+        _cache[key] = (matches, truncated)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    page = matches[offset:offset + limit]
+    end = offset + len(page)
+    return SearchPage(
+        matches=page,
+        total=len(matches),
+        files=len({m.path for m in matches}),
+        truncated=truncated,
+        next_cursor=_encode_cursor(fingerprint, end) if end < len(matches) else None,
+        cached=cached,
+    )
+
+
+def format_page(page: SearchPage) -> str:
+    """Render matches as ``path:line:column: text`` lines"""
+    return "".join(f"{m.path}:{m.line}:{m.column}: {m.text}\n" for m in page.matches)
@@ -0,0 +1,578 @@
+"""In-process ``git status --porcelain`` driven by the index's cached stat data"""
+
+import bisect
+import os
+import stat
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from git_mcp.config import ConfigUnsupported, config_bool, excludes_file, read_config
+from git_mcp.ignore import IgnoreMatcher
+from git_mcp.index import (
+    FLAG_ASSUME_VALID,
+    MODE_GITLINK,
+    MODE_REGULAR,
+    MODE_SYMLINK,
+    MODE_TYPE_MASK,
+    Index,
+    IndexEntry,
+    IndexParseError,
+    parse_index,
+)
+from git_mcp.objects import OBJ_BLOB, ObjectStore, ObjectStoreError, flatten_tree, hash_object
+from git_mcp.refs import RefError, read_head, resolve_ref
+from git_mcp.watch import WatchDelta, WorktreeWatcher, create_watcher
+
+# Index extensions whose presence changes the meaning of the entry list
+_UNSUPPORTED_EXTENSIONS = (b"link", b"sdir")
+
+# Attributes that make the worktree bytes differ from the blob bytes
+_CONVERSION_ATTRIBUTES = ("text", "eol", "crlf", "filter", "ident", "working-tree-encoding")
+
+# Directory listings younger than this are not cached (mtime granularity)
+_RACY_LISTING_NS = 2_000_000_000
+
+# Untracked-file modes understood by the engine (status.showUntrackedFiles)
+_UNTRACKED_MODES = ("normal", "all", "no")
+
+
+class StatusUnsupported(Exception):
+    """Raised when the repository needs features only the git CLI implements"""
+
+
+def quote_path(path: bytes) -> str:
+    """Quote a path the way ``git status --porcelain`` does (core.quotePath=true)"""
+    needs_quote = False
+    out = []
+    for b in path:
+        if b in (0x22, 0x5C):
+            out.append("\\" + chr(b))
+            needs_quote = True
+        elif b < 0x20 or b >= 0x7F or b == 0x20:
+            if b == 0x20:
+                out.append(" ")
+            else:
+                escape = {7: "a", 8: "b", 9: "t", 10: "n", 11: "v", 12: "f", 13: "r"}.get(b)
+                out.append("\\" + escape if escape else "\\%03o" % b)
+            needs_quote = True
+        else:
+            out.append(chr(b))
+    text = "".join(out)
+    return f'"{text}"' if needs_quote else text
+
+
+def format_porcelain(entries: List[Tuple[str, bytes]]) -> str:
+    """Render ``(XY, path)`` pairs as ``git status --porcelain`` output"""
+    return "".join(f"{xy} {quote_path(path)}\n" for xy, path in entries)
+
+
+def _worktree_mode(st: os.stat_result, entry_mode: int, filemode: bool) -> int:
+    if stat.S_ISLNK(st.st_mode):
+        return MODE_SYMLINK
+    if not filemode:
+        return entry_mode if entry_mode & MODE_TYPE_MASK == MODE_REGULAR else 0o100644
+    return 0o100755 if st.st_mode & 0o100 else 0o100644
+
+
+def _stat_signature(st: os.stat_result) -> Tuple[int, int, int, int, int]:
+    return (st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino, st.st_mode)
+
+
+class StatusEngine:
+    """Computes porcelain status for one worktree without forking git.
+
+    The index is only re-parsed when the file changes. Worktree entries are
+    checked with ``lstat``; content is hashed only when the stat data no longer
+    matches the index, and the resulting oid is remembered per path so the next
+    call re-hashes a file only if its mtime or size moved again. Directory
+    listings used for untracked detection are reused while the directory's
+    mtime is unchanged. Anything the engine does not model (merges, sparse or
+    split indexes, submodules, content filters, rename detection) raises
+    ``StatusUnsupported`` so callers can fall back to the git CLI.
+
+    With ``watch=True`` an inotify watcher records which paths changed; while
+    the index, config and ignore files are unchanged only those paths are
+    re-checked and the untracked walk is repeated only when entries were
+    created, removed or renamed.
+    """
+
+    def __init__(self, worktree: Path, git_dir: Path, common_dir: Optional[Path] = None,
+                 store: Optional[ObjectStore] = None, watch: bool = False):
+        self.worktree = Path(worktree)
+        self.git_dir = Path(git_dir)
+        self.common_dir = Path(common_dir or git_dir)
+        self._lock = threading.Lock()
+        self._store = store
+        self._index_key: Optional[Tuple[int, int, int]] = None
+        self._index: Optional[Index] = None
+        self._index_paths: Dict[bytes, IndexEntry] = {}
+        self._tracked_dirs: Set[bytes] = set()
+        self._index_mtime: Tuple[int, int] = (0, 0)
+        self._head_tree: Optional[Tuple[bytes, Dict[bytes, Tuple[int, bytes]]]] = None
+        self._staged: Optional[Tuple[Tuple[bytes, Optional[bytes]], Dict[bytes, str]]] = None
+        self._hashes: Dict[bytes, Tuple[Tuple[int, int, int, int, int], bytes]] = {}
+        # path -> (lstat tuple, index oid, index mode) last confirmed clean
+        self._clean: Dict[bytes, Tuple[Tuple[int, ...], bytes, int]] = {}
+        self._listings: Dict[bytes, Tuple[int, List[Tuple[bytes, bool]]]] = {}
+        self._listed: Set[bytes] = set()
+        self._ignore: Optional[IgnoreMatcher] = None
+        self._sorted_paths: List[bytes] = []
+        self._watch = watch
+        self._watcher: Optional[WorktreeWatcher] = None
+        self._watcher_state: Optional[Tuple[Optional[Path], Optional[Tuple[int, int, int]]]] = None
+        # (state key, worktree changes, untracked paths) from the previous call
+        self._last: Optional[Tuple[tuple, Dict[bytes, str], List[bytes]]] = None
+        self.hashed = 0
+        self.incremental = 0
+
+    @property
+    def store(self) -> ObjectStore:
+        if self._store is None:
+            self._store = ObjectStore(self.common_dir / "objects")
+        return self._store
+
+    def status(self) -> List[Tuple[str, bytes]]:
+        """Return ``(XY, path)`` pairs in porcelain order"""
+        with self._lock:
+            try:
+                return self._status()
+            except StatusUnsupported:
+                raise
+            except (ConfigUnsupported, IndexParseError, ObjectStoreError, RefError, OSError, ValueError) as e:
+                raise StatusUnsupported(str(e)) from e
+
+    def is_incremental(self) -> bool:
+        """Return True if the next status call can be answered from watcher events alone"""
+        if self._watcher is None or self._last is None:
+            return False
+        try:
+            st = os.stat(self.git_dir / "index")
+        except OSError:
+            return False
+        return (st.st_mtime_ns, st.st_size, st.st_ino) == self._index_key
+
+    def worktree_generation(self) -> Optional[int]:
+        """A value that changes whenever the worktree may have changed, read from watcher events.
+
+        Starts the watcher if it is enabled and not running yet. None when
+        there is no watcher, so callers have to look at the files instead.
+        """
+        with self._lock:
+            try:
+                config = self._load_config()
+                self._load_index()
+                watcher = self._ensure_watcher(config)
+            except (StatusUnsupported, ConfigUnsupported, IndexParseError, OSError, ValueError):
+                return None
+            return watcher.generation() if watcher is not None else None
+
+    def porcelain(self) -> str:
+        """Return the status formatted like ``git status --porcelain``"""
+        return format_porcelain(self.status())
+
+    # -- configuration -----------------------------------------------------
+
+    def _load_config(self) -> Dict[str, str]:
+        config = read_config(self.common_dir)
+        if self.common_dir != self.git_dir and (self.git_dir / "config.worktree").exists():
+            raise StatusUnsupported("Per-worktree config is not evaluated in-process")
+        if config.get("extensions.objectformat", "sha1").lower() != "sha1":
+            raise StatusUnsupported("Only SHA-1 repositories are supported")
+        if config_bool(config, "core.bare", False):
+            raise StatusUnsupported("Bare repository")
+        if config_bool(config, "core.ignorecase", False):
+            raise StatusUnsupported("core.ignoreCase is not supported")
+        if not config_bool(config, "core.symlinks", True):
+            raise StatusUnsupported("core.symlinks=false is not supported")
+        if config_bool(config, "core.sparsecheckout", False):
+            raise StatusUnsupported("Sparse checkout is not supported")
+        if config.get("status.showuntrackedfiles", "normal").lower() not in _UNTRACKED_MODES:
+            raise StatusUnsupported("Unknown status.showUntrackedFiles value")
+        return config
+
+    def _has_conversions(self, config: Dict[str, str]) -> bool:
+        """Return True if worktree content may be converted before hashing"""
+        if config.get("core.autocrlf", "false").lower() in ("true", "input"):
+            return True
+        attr_files = [self.common_dir / "info" / "attributes"]
+        if config.get("core.attributesfile"):
+            attr_files.append(Path(os.path.expanduser(config["core.attributesfile"])))
+        else:
+            xdg = os.getenv("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+            attr_files.append(Path(xdg) / "git" / "attributes")
+        for path in self._index_paths:
+            if path == b".gitattributes" or path.endswith(b"/.gitattributes"):
+                attr_files.append(self.worktree / os.fsdecode(path))
+        for path in attr_files:
+            try:
+                text = path.read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                continue
+            for line in text.splitlines():
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                for attr in line.split()[1:]:
+                    name = attr.lstrip("-!").split("=", 1)[0]
+                    if name in _CONVERSION_ATTRIBUTES:
+                        return True
+        return False
+
+    # -- index -------------------------------------------------------------
+
+    def _load_index(self) -> Optional[Index]:
+        index_path = self.git_dir / "index"
+        try:
+            st = os.stat(index_path)
+        except FileNotFoundError:
+            self._index = None
+            self._index_key = None
+            self._index_paths = {}
+            self._tracked_dirs = set()
+            self._sorted_paths = []
+            return None
+        key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if key == self._index_key:
+            return self._index
+        index = parse_index(index_path.read_bytes())
+        for sig in _UNSUPPORTED_EXTENSIONS:
+            if sig in index.extensions:
+                raise StatusUnsupported(f"Index extension {sig.decode()} is not supported")
+        paths: Dict[bytes, IndexEntry] = {}
+        dirs: Set[bytes] = {b""}
+        for entry in index.entries:
+            if entry.stage != 0:
+                raise StatusUnsupported("Unmerged entries present")
+            if entry.skip_worktree or entry.intent_to_add:
+                raise StatusUnsupported("Sparse or intent-to-add entries present")
+            if entry.mode & MODE_TYPE_MASK == MODE_GITLINK:
+                raise StatusUnsupported("Submodules are not supported")
+            paths[entry.path] = entry
+            parent = entry.path.rpartition(b"/")[0]
+            while parent and parent not in dirs:
+                dirs.add(parent)
+                parent = parent.rpartition(b"/")[0]
+        self._index = index
+        self._index_key = key
+        self._index_paths = paths
+        self._tracked_dirs = dirs
+        self._sorted_paths = sorted(paths)
+        self._index_mtime = divmod(st.st_mtime_ns, 1_000_000_000)
+        return index
+
+    # -- HEAD vs index -----------------------------------------------------
+
+    def _head_tree_oid(self) -> Optional[bytes]:
+        symref, detached = read_head(self.git_dir)
+        oid = detached if symref is None else resolve_ref(self.git_dir, symref, common_dir=self.common_dir)
+        if oid is None:
+            return None
+        return self.store.peel_to_tree(bytes.fromhex(oid))
+
+    def _staged_changes(self, index: Optional[Index], config: Dict[str, str]) -> Dict[bytes, str]:
+        head_tree = self._head_tree_oid()
+        key = (index.checksum if index else b"", head_tree)
+        if self._staged is not None and self._staged[0] == key:
+            return self._staged[1]
+
+        changes: Dict[bytes, str] = {}
+        if head_tree is not None and index is not None and index.cache_tree_root == head_tree:
+            self._staged = (key, changes)
+            return changes
+
+        if head_tree is None:
+            flat: Dict[bytes, Tuple[int, bytes]] = {}
+        else:
+            if self._head_tree is None or self._head_tree[0] != head_tree:
+                self._head_tree = (head_tree, flatten_tree(self.store, head_tree))
+            flat = self._head_tree[1]
+
+        for path, entry in self._index_paths.items():
+            head = flat.get(path)
+            if head is None:
+                changes[path] = "A"
+            elif head[0] & MODE_TYPE_MASK == MODE_GITLINK:
+                raise StatusUnsupported("Submodules are not supported")
+            elif head[0] & MODE_TYPE_MASK != entry.mode & MODE_TYPE_MASK:
+                changes[path] = "T"
+            elif head[0] != entry.mode or head[1] != entry.oid:
+                changes[path] = "M"
+        for path, (mode, _) in flat.items():
+            if path not in self._index_paths:
+                if mode & MODE_TYPE_MASK == MODE_GITLINK:
+                    raise StatusUnsupported("Submodules are not supported")
+                changes[path] = "D"
+
+        values = changes.values()
+        if "A" in values and "D" in values and config_bool(config, "status.renames", True):
+            raise StatusUnsupported("Staged adds and deletes need rename detection")
+        self._staged = (key, changes)
+        return changes
+
+    # -- index vs worktree -------------------------------------------------
+
+    def _hash_worktree(self, full: bytes, st: os.stat_result, path: bytes, conversions: bool) -> bytes:
+        sig = _stat_signature(st)
+        cached = self._hashes.get(path)
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+        if conversions:
+            raise StatusUnsupported("Content conversion (autocrlf/attributes) is not supported")
+        if stat.S_ISLNK(st.st_mode):
+            data = os.readlink(full)
+        else:
+            with open(full, "rb") as f:
+                data = f.read()
+        oid = hash_object(OBJ_BLOB, data)
+        self.hashed += 1
+        # A file modified within the current mtime tick could change again
+        # without its stat data moving, so only remember settled results
+        if time.time_ns() - st.st_mtime_ns > _RACY_LISTING_NS:
+            self._hashes[path] = (sig, oid)
+        return oid
+
+    def _worktree_changes(self, config: Dict[str, str], only: Optional[List[bytes]] = None) -> Dict[bytes, str]:
+        """Compare index entries with the worktree (all of them, or just ``only``)"""
+        filemode = config_bool(config, "core.filemode", True)
+        trustctime = config_bool(config, "core.trustctime", True)
+        check_owner = config.get("core.checkstat", "default").lower() != "minimal"
+        conversions: Optional[bool] = None
+        index_mtime = self._index_mtime
+        root = os.fsencode(self.worktree) + b"/"
+        changes: Dict[bytes, str] = {}
+
+        clean_cache = self._clean
+        settled_before = time.time_ns() - _RACY_LISTING_NS
+        lstat = os.lstat
+        items = self._index_paths.items() if only is None else [(p, self._index_paths[p]) for p in only]
+        for path, entry in items:
+            if entry.flags & FLAG_ASSUME_VALID:
+                continue
+            full = root + path
+            try:
+                st = lstat(full)
+            except (FileNotFoundError, NotADirectoryError):
+                changes[path] = "D"
+                continue
+            sig = (st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino, st.st_mode, st.st_uid, st.st_gid)
+            cached = clean_cache.get(path)
+            if cached is not None and cached[0] == sig and cached[1] == entry.oid and cached[2] == entry.mode:
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                changes[path] = "D"
+                continue
+
+            wt_mode = _worktree_mode(st, entry.mode, filemode)
+            if wt_mode & MODE_TYPE_MASK != entry.mode & MODE_TYPE_MASK:
+                changes[path] = "T"
+                continue
+            if wt_mode != entry.mode:
+                changes[path] = "M"
+                continue
+
+            mtime_s, mtime_ns = divmod(st.st_mtime_ns, 1_000_000_000)
+            ctime_s, ctime_ns = divmod(st.st_ctime_ns, 1_000_000_000)
+            size_ok = entry.size == st.st_size & 0xFFFFFFFF
+            clean = (
+                size_ok
+                and entry.mtime_s == mtime_s & 0xFFFFFFFF and entry.mtime_ns == mtime_ns
+                and (not trustctime or (entry.ctime_s == ctime_s & 0xFFFFFFFF and entry.ctime_ns == ctime_ns))
+                and (not check_owner or (
+                    entry.ino == st.st_ino & 0xFFFFFFFF
+                    and entry.uid == st.st_uid & 0xFFFFFFFF
+                    and entry.gid == st.st_gid & 0xFFFFFFFF
+                ))
+            )
+            racy = (entry.mtime_s, entry.mtime_ns) >= index_mtime
+            if not (clean and not racy):
+                if not size_ok and entry.size != 0:
+                    changes[path] = "M"
+                    continue
+                if conversions is None:
+                    conversions = self._has_conversions(config)
+                if self._hash_worktree(full, st, path, conversions) != entry.oid:
+                    changes[path] = "M"
+                    continue
+            # Remember the confirmed-clean stat data once it is out of the racy window
+            if st.st_mtime_ns < settled_before and st.st_ctime_ns < settled_before:
+                clean_cache[path] = (sig, entry.oid, entry.mode)
+
+        # Forget state for paths that left the index or the worktree
+        for cache in (self._hashes, self._clean):
+            candidates = cache if only is None else [p for p in only if p in cache]
+            for path in [p for p in candidates if p not in self._index_paths or changes.get(p) == "D"]:
+                del cache[path]
+        return changes
+
+    # -- untracked files ---------------------------------------------------
+
+    def _listing(self, rel_dir: bytes) -> List[Tuple[bytes, bool]]:
+        full = os.fsencode(self.worktree) + (b"/" + rel_dir if rel_dir else b"")
+        mtime = os.stat(full).st_mtime_ns
+        self._listed.add(rel_dir)
+        cached = self._listings.get(rel_dir)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with os.scandir(full) as it:
+            entries = [(e.name, e.is_dir(follow_symlinks=False)) for e in it]
+        if time.time_ns() - mtime > _RACY_LISTING_NS:
+            self._listings[rel_dir] = (mtime, entries)
+        else:
+            self._listings.pop(rel_dir, None)
+        return entries
+
+    def _has_untracked(self, rel_dir: bytes, ignore: IgnoreMatcher) -> bool:
+        for name, is_dir in self._listing(rel_dir):
+            if name == b".git":
+                continue
+            rel = rel_dir + b"/" + name
+            if ignore.is_ignored(os.fsdecode(rel), is_dir):
+                continue
+            if not is_dir or self._is_nested_repo(rel) or self._has_untracked(rel, ignore):
+                return True
+        return False
+
+    def _is_nested_repo(self, rel_dir: bytes) -> bool:
+        return os.path.exists(os.fsencode(self.worktree) + b"/" + rel_dir + b"/.git")
+
+    def _collect_all(self, rel_dir: bytes, ignore: IgnoreMatcher, out: List[bytes]) -> None:
+        for name, is_dir in self._listing(rel_dir):
+            if name == b".git":
+                continue
+            rel = rel_dir + b"/" + name
+            if ignore.is_ignored(os.fsdecode(rel), is_dir):
+                continue
+            if not is_dir:
+                out.append(rel)
+            elif self._is_nested_repo(rel):
+                out.append(rel + b"/")
+            else:
+                self._collect_all(rel, ignore, out)
+
+    def _untracked(self, config: Dict[str, str]) -> List[bytes]:
+        mode = config.get("status.showuntrackedfiles", "normal").lower()
+        if mode == "no":
+            return []
+        excludes = excludes_file(config)
+        if self._ignore is None or self._ignore.global_files[0] != excludes:
+            self._ignore = IgnoreMatcher(self.worktree, self.common_dir, excludes_file=excludes)
+        ignore = self._ignore
+        ignore.begin_pass()
+        found: List[bytes] = []
+        self._listed = set()
+        stack = [b""]
+        while stack:
+            rel_dir = stack.pop()
+            for name, is_dir in self._listing(rel_dir):
+                if name == b".git":
+                    continue
+                rel = rel_dir + b"/" + name if rel_dir else name
+                if rel in self._index_paths:
+                    continue
+                if ignore.is_ignored(os.fsdecode(rel), is_dir):
+                    continue
+                if not is_dir:
+                    found.append(rel)
+                elif rel in self._tracked_dirs:
+                    stack.append(rel)
+                elif self._is_nested_repo(rel):
+                    found.append(rel + b"/")
+                elif mode == "all":
+                    self._collect_all(rel, ignore, found)
+                elif self._has_untracked(rel, ignore):
+                    found.append(rel + b"/")
+        # Drop cached listings for directories this walk no longer reached
+        for rel_dir in [d for d in self._listings if d not in self._listed]:
+            del self._listings[rel_dir]
+        found.sort()
+        return found
+
+    # -- combined ----------------------------------------------------------
+
+    def _ensure_watcher(self, config: Dict[str, str]) -> Optional[WorktreeWatcher]:
+        """Start the watcher, or bring it up to date with the excludes file and the tracked directories"""
+        if not self._watch:
+            return None
+        excludes = excludes_file(config)
+        if self._watcher is not None and self._watcher_state[0] != excludes:
+            self._watcher.close()
+            self._watcher = None
+        if self._watcher is None:
+            self._watcher = create_watcher(self.worktree, self.common_dir, excludes, self._tracked_dirs)
+            if self._watcher is None:
+                self._watch = False
+                return None
+        elif self._watcher_state[1] != self._index_key:
+            self._watcher.track(self._tracked_dirs)
+        self._watcher_state = (excludes, self._index_key)
+        return self._watcher
+
+    def _watch_delta(self, config: Dict[str, str]) -> Optional[WatchDelta]:
+        """Start or refresh the watcher and return what changed since the last call"""
+        if self._ensure_watcher(config) is None:
+            return None
+        delta = self._watcher.take()
+        if delta is None:
+            self._watcher.close()
+            self._watcher = None
+            self._watch = False
+        return delta
+
+    def _affected(self, paths: Set[bytes]) -> List[bytes]:
+        """Index paths equal to, or below, any of ``paths``"""
+        sorted_paths = self._sorted_paths
+        affected: Set[bytes] = set()
+        for path in paths:
+            if path in self._index_paths:
+                affected.add(path)
+            prefix = path + b"/"
+            i = bisect.bisect_left(sorted_paths, prefix)
+            while i < len(sorted_paths) and sorted_paths[i].startswith(prefix):
+                affected.add(sorted_paths[i])
+                i += 1
+        return sorted(affected)
+
+    def _state_key(self, config: Dict[str, str]) -> tuple:
+        """Everything outside the worktree that the unstaged/untracked results depend on"""
+        ignore_files = [self.common_dir / "info" / "exclude", excludes_file(config)]
+        mtimes = []
+        for path in ignore_files:
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns if path else None)
+            except OSError:
+                mtimes.append(None)
+        return (self._index_key, tuple(sorted(config.items())), tuple(mtimes))
+
+    def _status(self) -> List[Tuple[str, bytes]]:
+        config = self._load_config()
+        index = self._load_index()
+        delta = self._watch_delta(config)
+        staged = self._staged_changes(index, config)
+
+        state = self._state_key(config) if delta is not None else None
+        last = self._last
+        incremental = delta is not None and not delta.full and last is not None and last[0] == state
+        if incremental:
+            affected = self._affected(delta.paths)
+            unstaged = dict(last[1])
+            for path in affected:
+                unstaged.pop(path, None)
+            unstaged.update(self._worktree_changes(config, affected))
+            untracked = last[2] if not delta.structure else self._untracked(config)
+            self.incremental += 1
+        else:
+            unstaged = self._worktree_changes(config)
+            untracked = self._untracked(config)
+        self._last = (state, unstaged, untracked) if delta is not None else None
+
+        entries: List[Tuple[str, bytes]] = []
+        for path in sorted(set(staged) | set(unstaged)):
+            x = staged.get(path, " ")
+            y = unstaged.get(path, " ")
+            if x == "D":
+                y = " "
+            entries.append((x + y, path))
+        entries.extend(("??", path) for path in untracked)
+        return entries
@@ -0,0 +1,250 @@
+"""Budgeted diff summaries (per-file stats, renames, largest hunks), memoized per diff state"""
+
+import heapq
+import os
+from collections import OrderedDict
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from git_mcp.commit import worktree_signature
+from git_mcp.diff import diff_revisions, is_generated, iter_units
+from git_mcp.limits import DEFAULT_SUMMARY_BYTES, DEFAULT_TOP_HUNKS
+from git_mcp.objects import ObjectStoreError
+from git_mcp.repo import RepoContext
+from git_mcp.runner import GitCommandError, get_runner
+
+# Number of summaries kept in memory
+_CACHE_SIZE = 32
+
+_cache: "OrderedDict[tuple, str]" = OrderedDict()
+
+
+@dataclass
+class ChangedFile:
+    """One entry of a diff: line counts plus rename information"""
+
+    path: str
+    added: int
+    deleted: int
+    binary: bool
+    status: str
+    old_path: Optional[str] = None
+    similarity: Optional[int] = None
+
+    @property
+    def generated(self) -> bool:
+        return is_generated(self.path)
+
+    @property
+    def moved(self) -> bool:
+        """True when a rename changed the directory, not just the file name"""
+        return self.old_path is not None and os.path.dirname(self.old_path) != os.path.dirname(self.path)
+
+
+@dataclass
+class Hunk:
+    """A hunk chosen for the summary"""
+
+    path: str
+    added: int
+    deleted: int
+    text: str
+    truncated: bool
+
+
+def parse_raw_numstat(output: bytes) -> List[ChangedFile]:
+    """Parse ``git diff --raw --numstat -z`` output (raw records come first)"""
+    tokens = output.split(b"\0")
+    raw: List[Tuple[str, Optional[int]]] = []
+    files: List[ChangedFile] = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        i += 1
+        if not token:
+            continue
+        if token.startswith(b":"):
+            code = token.split()[-1].decode()
+            similarity = int(code[1:]) if code[:1] in ("R", "C") and code[1:] else None
+            raw.append((code[:1], similarity))
+            i += 2 if code[:1] in ("R", "C") else 1
+            continue
+        added, deleted, path = token.split(b"\t", 2)
+        old_path = None
+        if not path:
+            old_path = tokens[i].decode("utf-8", errors="replace")
+            path = tokens[i + 1]
+            i += 2
+        status, similarity = raw[len(files)] if len(files) < len(raw) else ("M", None)
+        binary = added == b"-"
+        files.append(ChangedFile(
+            path=path.decode("utf-8", errors="replace"),
+            added=0 if binary else int(added),
+            deleted=0 if binary else int(deleted),
+            binary=binary,
+            status=status,
+            old_path=old_path,
+            similarity=similarity,
+        ))
+    return files
+
+
+async def _resolve_commit(ctx: RepoContext, commit: str) -> str:
+    """Return the oid ``commit`` names; ValueError if it names no commit"""
+    oid = ctx.resolve_revision(commit)
+    if oid is not None:
+        return oid
+    try:
+        output = await get_runner().run(
+            ctx.worktree, ["rev-parse", "--verify", "--quiet", "--end-of-options", f"{commit}^{{commit}}"]
+        )
+    except GitCommandError:
+        raise ValueError(f"Unknown revision: {commit}") from None
+    return output.strip()
+
+
+async def _diff_state(ctx: RepoContext, staged: bool, commit: Optional[str]) -> Optional[tuple]:
+    """Identify the compared states: base tree, index checksum and dirty worktree files"""
+    try:
+        oid = commit or ctx.head_oid()
+        base = ctx.store.peel_to_tree(bytes.fromhex(oid)) if oid else None
+    except (ObjectStoreError, ValueError):
+        return None
+    index = ctx.index_checksum()
+    if staged and not commit:
+        return (base, index)
+    return (base if commit else None, index, await worktree_signature(ctx))
+
+
+async def _top_hunks(ctx: RepoContext, args: List[str], files: List[ChangedFile], top: int, cap: int) -> List[Hunk]:
+    """Stream the patch and keep the ``top`` hunks with the most changed lines"""
+    heap: List[Tuple[int, int, Hunk]] = []
+    seq = 0
+    async with aclosing(get_runner().stream(ctx.worktree, args)) as lines:
+        async for unit in iter_units(lines, cap=cap):
+            if unit.binary or not unit.lines or unit.file_index >= len(files):
+                continue
+            changed = files[unit.file_index]
+            if changed.generated:
+                continue
+            score = unit.added + unit.deleted
+            if len(heap) >= top and score <= heap[0][0]:
+                continue
+            hunk = Hunk(
+                path=changed.path,
+                added=unit.added,
+                deleted=unit.deleted,
+                text=unit.body.decode("utf-8", errors="replace"),
+                truncated=unit.truncated,
+            )
+            # Ties keep the earlier hunk, so the result follows diff order
+            entry = (score, -seq, hunk)
+            seq += 1
+            if len(heap) < top:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heapreplace(heap, entry)
+    return [entry[2] for entry in sorted(heap, key=lambda e: (-e[0], -e[1]))]
+
+
+def format_summary(files: List[ChangedFile], hunks: List[Hunk], max_bytes: int) -> str:
+    """Render the summary, dropping or truncating detail to stay within ``max_bytes``"""
+    added = sum(f.added for f in files)
+    deleted = sum(f.deleted for f in files)
+    renames = [f for f in files if f.old_path is not None]
+    head = f"Diff summary: {len(files)} files changed, +{added} -{deleted}"
+    if renames:
+        head += f" ({len(renames)} renamed)"
+    out = [head + "\n"]
+    used = len(out[0])
+
+    def add(text: str) -> bool:
+        nonlocal used
+        if used + len(text) > max_bytes:
+            return False
+        out.append(text)
+        used += len(text)
+        return True
+
+    if renames:
+        add("Renames:\n")
+        for i, f in enumerate(renames):
+            kind = "moved" if f.moved else "renamed"
+            if not add(f"  {f.old_path} -> {f.path} ({kind}, {f.similarity}% similar)\n"):
+                add(f"  ... and {len(renames) - i} more renames\n")
+                break
+
+    add("Files (most changed first):\n")
+    ordered = sorted(files, key=lambda f: (-(f.added + f.deleted), f.path))
+    for i, f in enumerate(ordered):
+        counts = "binary" if f.binary else f"+{f.added} -{f.deleted}"
+        notes = []
+        if f.status in ("A", "D", "T"):
+            notes.append({"A": "new", "D": "deleted", "T": "type changed"}[f.status])
+        if f.generated:
+            notes.append("generated")
+        note = f" ({', '.join(notes)})" if notes else ""
+        # Keep room for the "more files" marker
+        if used + len(f"  {counts:>14}  {f.path}{note}\n") + 40 > max_bytes:
+            add(f"  ... and {len(ordered) - i} more files\n")
+            break
+        add(f"  {counts:>14}  {f.path}{note}\n")
+
+    if hunks and add(f"Top {len(hunks)} hunks by lines changed:\n"):
+        for i, hunk in enumerate(hunks):
+            title = f"--- {hunk.path} (+{hunk.added} -{hunk.deleted})\n"
+            # Split what is left evenly so one huge hunk cannot crowd out the rest
+            room = (max_bytes - used) // (len(hunks) - i) - len(title)
+            if room < 80:
+                add("... [remaining hunks omitted to fit the budget]\n")
+                break
+            text = hunk.text
+            if len(text) > room or hunk.truncated:
+                text = text[:max(0, room - 40)].rsplit("\n", 1)[0] + "\n... [hunk truncated]\n"
+            add(title + text)
+    return "".join(out)
+
+
+async def diff_summary(
+    ctx: RepoContext,
+    staged: bool = False,
+    commit: Optional[str] = None,
+    paths: Optional[List[str]] = None,
+    top: int = DEFAULT_TOP_HUNKS,
+    max_bytes: int = DEFAULT_SUMMARY_BYTES,
+) -> str:
+    """Summarize a diff within ``max_bytes``; unchanged diffs are served from memory.
+
+    Summaries are keyed by the base tree oid, the index checksum and (for
+    diffs against the worktree) the file watcher's event generation or the
+    stat data of files that differ from the index, so a repeated call on an
+    unchanged diff runs no ``git diff``.
+    """
+    max_bytes = max(512, max_bytes)
+    top = max(0, top)
+    if commit:
+        commit = await _resolve_commit(ctx, commit)
+    revisions = diff_revisions(staged=staged, commit=commit)
+    spec = ["--"] + list(paths) if paths else []
+    state = await _diff_state(ctx, staged, commit)
+    key = (str(ctx.worktree), state, tuple(revisions), tuple(spec), top, max_bytes)
+    if state is not None and key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+
+    output = await get_runner().run_bytes(
+        ctx.worktree, ["diff", "--raw", "--numstat", "-z", "-M", "--no-ext-diff"] + revisions + spec
+    )
+    files = parse_raw_numstat(output)
+    hunks: List[Hunk] = []
+    if files and top:
+        args = ["diff", "--no-color", "--no-ext-diff", "-M", "-U1"] + revisions + spec
+        hunks = await _top_hunks(ctx, args, files, top, cap=max_bytes)
+    text = format_summary(files, hunks, max_bytes) if files else ""
+
+    if state is not None:
+        _cache[key] = text
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return text
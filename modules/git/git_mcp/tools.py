@@ -1,23 +1,63 @@
-import subprocess
+from __future__ import annotations
+
+import asyncio
 import json
+import os
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 from mcp.types import Tool, TextContent
+from git_mcp.limits import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_LINES,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_SUMMARY_BYTES,
+    DEFAULT_TOP_HUNKS,
+)
+
+if TYPE_CHECKING:
+    from git_mcp.repo import RepoContext
+
+# "auto" uses the in-process status engine and falls back to the CLI when the
+# repository needs it; "cli" always runs `git status --porcelain`
+STATUS_ENGINE = os.getenv("GIT_MCP_STATUS_ENGINE", "auto")
+
+# Tools that accept `workspace: true`
+WORKSPACE_TOOLS = ("git_status", "git_log", "git_branch")
+
+# Built on the first list_tools call and reused afterwards
+_tools: Optional[List[Tool]] = None
 
 def get_tools() -> List[Tool]:
     """Return list of available Git MCP tools"""
+    global _tools
+    if _tools is None:
+        _tools = _build_tools()
+    return _tools
+
+def _build_tools() -> List[Tool]:
     return [
         Tool(
             name="git_status",
             description="Get the current git repository status (staged, unstaged, untracked files)",
             inputSchema={
                 "type": "object",
-                "properties": {},
+                "properties": {
+                    "workspace": {
+                        "type": "boolean",
+                        "description": "Query every repository in the workspace (submodules, nested and sibling repos) concurrently and return one JSON report with per-repo timing (default: false)",
+                        "default": False
+                    },
+                    "siblings": {
+                        "type": "boolean",
+                        "description": "In workspace mode, include repositories next to the root repository (default: true)",
+                        "default": True
+                    }
+                },
             }
         ),
         Tool(
             name="git_diff",
-            description="Show changes between working directory and staging area, or between commits",
+            description="Show changes between working directory and staging area, or between commits. For large diffs use mode 'stat' for a per-file overview, then mode 'patch' to page through hunks with a cursor.",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -29,13 +69,135 @@ def get_tools() -> List[Tool]:
                     "commit": {
                         "type": "string",
                         "description": "Show diff for specific commit (optional)"
+                    },
+                    "mode": {
+                        "type": "string",
+                        "enum": ["full", "stat", "patch"],
+                        "description": "full: entire diff (default); stat: per-file line counts; patch: one budgeted page of hunks",
+                        "default": "full"
+                    },
+                    "paths": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Limit the diff to these paths or pathspecs (optional)"
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Cursor from a previous 'patch' page to continue from (optional)"
+                    },
+                    "max_bytes": {
+                        "type": "integer",
+                        "description": f"Byte budget for one 'patch' page (default: {DEFAULT_MAX_BYTES})",
+                        "default": DEFAULT_MAX_BYTES
+                    },
+                    "max_lines": {
+                        "type": "integer",
+                        "description": f"Line budget for one 'patch' page (default: {DEFAULT_MAX_LINES})",
+                        "default": DEFAULT_MAX_LINES
+                    },
+                    "skip_generated": {
+                        "type": "boolean",
+                        "description": "In 'patch' mode, leave out lockfiles, minified and vendored files (default: true)",
+                        "default": True
                     }
                 }
             }
         ),
+        Tool(
+            name="git_diff_summary",
+            description="Summarize changes for writing commit messages: per-file line counts, renames and moves, and the largest hunks, kept within an output budget. Cheaper than git_diff for large change sets.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "staged": {
+                        "type": "boolean",
+                        "description": "Summarize staged changes (default: false, summarizes unstaged changes)",
+                        "default": False
+                    },
+                    "commit": {
+                        "type": "string",
+                        "description": "Compare the working tree against this commit (optional)"
+                    },
+                    "paths": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Limit the summary to these files or directories (optional)"
+                    },
+                    "top": {
+                        "type": "integer",
+                        "description": "Number of largest hunks to include (default: 5)",
+                        "default": DEFAULT_TOP_HUNKS
+                    },
+                    "max_bytes": {
+                        "type": "integer",
+                        "description": "Maximum size of the summary in bytes (default: 8192)",
+                        "default": DEFAULT_SUMMARY_BYTES
+                    }
+                }
+            }
+        ),
+        Tool(
+            name="git_search",
+            description="Search tracked files with git grep. Returns file:line:column matches, paginated with a cursor. Repeated searches are served from cache while HEAD and the index are unchanged.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "pattern": {
+                        "type": "string",
+                        "description": "Text to search for (a regular expression when regex is true)"
+                    },
+                    "regex": {
+                        "type": "boolean",
+                        "description": "Treat pattern as an extended regular expression (default: false, literal text)",
+                        "default": False
+                    },
+                    "ignore_case": {
+                        "type": "boolean",
+                        "description": "Case-insensitive search (default: false)",
+                        "default": False
+                    },
+                    "word": {
+                        "type": "boolean",
+                        "description": "Only match whole words (default: false)",
+                        "default": False
+                    },
+                    "paths": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Limit the search to these files, directories or globs (optional)"
+                    },
+                    "source": {
+                        "type": "string",
+                        "enum": ["worktree", "index"],
+                        "description": "Search working tree files (default) or staged content",
+                        "default": "worktree"
+                    },
+                    "ref": {
+                        "type": "string",
+                        "description": "Search a branch, tag or commit instead of the working tree (optional)"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Matches per page (default: 50)",
+                        "default": DEFAULT_PAGE_SIZE
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Cursor from a previous git_search call to get the next page (optional)"
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": ["text", "json"],
+                        "description": "text: file:line:column: text lines (default); json: structured matches",
+                        "default": "text"
+                    }
+                },
+                "required": ["pattern"]
+            }
+        ),
         Tool(
             name="git_commit",
-            description="Create a commit with the given message. Automatically stages all changes if there are any.",
+            description="Create a commit with the given message. Automatically stages all changes if there are any, or only the given paths.",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -47,6 +209,11 @@ def get_tools() -> List[Tool]:
                         "type": "boolean",
                         "description": "Stage all changes before committing (default: true)",
                         "default": True
+                    },
+                    "paths": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Only stage changes under these files or directories (optional; overrides stage_all)"
                     }
                 },
                 "required": ["message"]
@@ -54,7 +221,7 @@ def get_tools() -> List[Tool]:
         ),
         Tool(
             name="git_log",
-            description="Show commit history. Returns recent commits with messages.",
+            description="Show commit history. Returns recent commits with messages. Pass the returned cursor to get the next page.",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -67,6 +234,50 @@ def get_tools() -> List[Tool]:
                         "type": "boolean",
                         "description": "Show one line per commit (default: true)",
                         "default": True
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": ["text", "json"],
+                        "description": "text: git log style output (default); json: structured commits",
+                        "default": "text"
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Cursor from a previous git_log call to continue from (optional)"
+                    },
+                    "ref": {
+                        "type": "string",
+                        "description": "Branch, tag or commit to start from (default: HEAD)"
+                    },
+                    "path": {
+                        "type": "string",
+                        "description": "Only commits that change this file or directory (optional)"
+                    },
+                    "author": {
+                        "type": "string",
+                        "description": "Only commits whose author name/email matches this regex, case-insensitive (optional)"
+                    },
+                    "since": {
+                        "type": "string",
+                        "description": "Only commits committed at or after this date (YYYY-MM-DD or ISO datetime) (optional)"
+                    },
+                    "until": {
+                        "type": "string",
+                        "description": "Only commits committed at or before this date (YYYY-MM-DD or ISO datetime) (optional)"
+                    },
+                    "grep": {
+                        "type": "string",
+                        "description": "Only commits whose message matches this regex, case-insensitive (optional)"
+                    },
+                    "workspace": {
+                        "type": "boolean",
+                        "description": "Query every repository in the workspace (submodules, nested and sibling repos) concurrently and return one JSON report with per-repo timing (default: false)",
+                        "default": False
+                    },
+                    "siblings": {
+                        "type": "boolean",
+                        "description": "In workspace mode, include repositories next to the root repository (default: true)",
+                        "default": True
                     }
                 }
             }
@@ -81,6 +292,16 @@ def get_tools() -> List[Tool]:
                         "type": "boolean",
                         "description": "Get only the current branch name (default: false, lists all)",
                         "default": False
+                    },
+                    "workspace": {
+                        "type": "boolean",
+                        "description": "Query every repository in the workspace (submodules, nested and sibling repos) concurrently and return one JSON report with per-repo timing (default: false)",
+                        "default": False
+                    },
+                    "siblings": {
+                        "type": "boolean",
+                        "description": "In workspace mode, include repositories next to the root repository (default: true)",
+                        "default": True
                     }
                 }
             }
@@ -89,17 +310,34 @@ def get_tools() -> List[Tool]:
 
 async def handle_tool_call(tool_name: str, arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle tool execution and return results"""
+    # The git engine is imported on the first call, not at server startup
+    from git_mcp.commit import abbrev_length, create_commit
+    from git_mcp.diff import diff_numstat, diff_page, diff_revisions, format_numstat
+    from git_mcp.log import LogUnsupported, format_commits
+    from git_mcp.objects import ObjectStoreError
+    from git_mcp.repo import get_repo_context
+    from git_mcp.search import format_page, search
+    from git_mcp.summary import diff_summary
+
     try:
-        # Find git repository root
-        repo_root = find_git_root()
-        if not repo_root:
+        # Reuse the cached repository context for the working directory
+        ctx = get_repo_context()
+        if not ctx:
             return [TextContent(
                 type="text",
                 text="Error: Not in a git repository"
             )]
+        repo_root = ctx.worktree
+
+        if tool_name in WORKSPACE_TOOLS and arguments.get("workspace"):
+            report = await workspace_report(tool_name, ctx, arguments)
+            return [TextContent(
+                type="text",
+                text=json.dumps(report)
+            )]
         
         if tool_name == "git_status":
-            result = run_git_command(repo_root, ["status", "--porcelain"])
+            result = await git_status_porcelain(ctx)
             if not result.strip():
                 return [TextContent(
                     type="text",
@@ -113,13 +351,49 @@ async def handle_tool_call(tool_name: str, arguments: Dict[str, Any]) -> List[Te
         elif tool_name == "git_diff":
             staged = arguments.get("staged", False)
             commit = arguments.get("commit")
-            
-            if commit:
-                result = run_git_command(repo_root, ["diff", commit])
-            elif staged:
-                result = run_git_command(repo_root, ["diff", "--staged"])
-            else:
-                result = run_git_command(repo_root, ["diff"])
+            mode = arguments.get("mode", "full")
+            revisions = diff_revisions(staged=staged, commit=commit)
+
+            if mode == "stat":
+                stats = await diff_numstat(repo_root, revisions, arguments.get("paths"))
+                if not stats:
+                    return [TextContent(
+                        type="text",
+                        text="No differences found."
+                    )]
+                return [TextContent(
+                    type="text",
+                    text=format_numstat(stats)
+                )]
+
+            if mode == "patch":
+                page = await diff_page(
+                    repo_root,
+                    revisions,
+                    paths=arguments.get("paths"),
+                    cursor=arguments.get("cursor"),
+                    max_bytes=arguments.get("max_bytes", DEFAULT_MAX_BYTES),
+                    max_lines=arguments.get("max_lines", DEFAULT_MAX_LINES),
+                    skip_generated=arguments.get("skip_generated", True),
+                )
+                if not page.text and not page.skipped_binary:
+                    return [TextContent(
+                        type="text",
+                        text="No differences found."
+                    )]
+                footer = [f"[{page.hunks} hunks from {page.files} files]"]
+                if page.skipped_binary:
+                    footer.append("Skipped binary files: " + ", ".join(page.skipped_binary))
+                if page.next_cursor:
+                    footer.append(f"More changes available. next cursor: {page.next_cursor}")
+                else:
+                    footer.append("End of diff.")
+                return [TextContent(
+                    type="text",
+                    text=f"Git diff:\n{page.text}\n" + "\n".join(footer)
+                )]
+
+            result = await run_git_command(repo_root, ["diff"] + revisions)
             
             if not result.strip():
                 return [TextContent(
@@ -131,17 +405,70 @@ async def handle_tool_call(tool_name: str, arguments: Dict[str, Any]) -> List[Te
                 text=f"Git diff:\n{result}"
             )]
         
+        elif tool_name == "git_diff_summary":
+            result = await diff_summary(
+                ctx,
+                staged=arguments.get("staged", False),
+                commit=arguments.get("commit"),
+                paths=arguments.get("paths"),
+                top=arguments.get("top", DEFAULT_TOP_HUNKS),
+                max_bytes=arguments.get("max_bytes", DEFAULT_SUMMARY_BYTES),
+            )
+            if not result:
+                return [TextContent(
+                    type="text",
+                    text="No differences found."
+                )]
+            return [TextContent(
+                type="text",
+                text=result
+            )]
+        
+        elif tool_name == "git_search":
+            page = await search(
+                ctx,
+                arguments["pattern"],
+                source=arguments.get("source", "worktree"),
+                ref=arguments.get("ref"),
+                paths=arguments.get("paths"),
+                ignore_case=arguments.get("ignore_case", False),
+                regex=arguments.get("regex", False),
+                word=arguments.get("word", False),
+                cursor=arguments.get("cursor"),
+                limit=arguments.get("limit", DEFAULT_PAGE_SIZE),
+            )
+            if arguments.get("format", "text") == "json":
+                return [TextContent(
+                    type="text",
+                    text=json.dumps(page.to_dict())
+                )]
+            if not page.total:
+                return [TextContent(
+                    type="text",
+                    text="No matches found."
+                )]
+            limit_note = f" (stopped at {page.total})" if page.truncated else ""
+            header = f"Search results: {page.total} matches in {page.files} files{limit_note}"
+            if page.cached:
+                header += ", from cache"
+            footer = f"More matches available. next cursor: {page.next_cursor}" if page.next_cursor else "End of results."
+            return [TextContent(
+                type="text",
+                text=f"{header}\n{format_page(page)}{footer}"
+            )]
+        
         elif tool_name == "git_commit":
             message = arguments["message"]
             stage_all = arguments.get("stage_all", True)
             
-            if stage_all:
-                # Check if there are changes to stage
-                status = run_git_command(repo_root, ["status", "--porcelain"])
-                if status.strip():
-                    run_git_command(repo_root, ["add", "-A"])
-            
-            result = run_git_command(repo_root, ["commit", "-m", message])
+            commit = await create_commit(
+                ctx,
+                message,
+                stage_all=stage_all,
+                paths=arguments.get("paths"),
+                use_engine=STATUS_ENGINE != "cli",
+            )
+            result = commit.summary(abbrev_length(ctx))
             return [TextContent(
                 type="text",
                 text=f"Commit created successfully:\n{result}"
@@ -150,17 +477,34 @@ async def handle_tool_call(tool_name: str, arguments: Dict[str, Any]) -> List[Te
         elif tool_name == "git_log":
             limit = arguments.get("limit", 10)
             oneline = arguments.get("oneline", True)
-            
-            cmd = ["log", f"-{limit}"]
-            if oneline:
-                cmd.append("--oneline")
-            
-            result = run_git_command(repo_root, cmd)
+            as_json = arguments.get("format", "text") == "json"
+
+            try:
+                start = await resolve_log_start(ctx, arguments)
+                commits, next_cursor, abbrev = await asyncio.to_thread(walk_log, ctx, arguments, start)
+            except (LogUnsupported, ObjectStoreError):
+                if arguments.get("cursor") or as_json:
+                    raise
+                result = await run_git_command(repo_root, git_log_args(arguments))
+                commits, next_cursor = None, None
+
+            if commits is not None:
+                if as_json:
+                    return [TextContent(
+                        type="text",
+                        text=json.dumps({
+                            "commits": [c.to_dict(abbrev) for c in commits],
+                            "next_cursor": next_cursor,
+                        })
+                    )]
+                result = format_commits(commits, oneline, abbrev)
             if not result.strip():
                 return [TextContent(
                     type="text",
                     text="No commits found."
                 )]
+            if next_cursor:
+                result += f"\nMore commits available. next cursor: {next_cursor}\n"
             return [TextContent(
                 type="text",
                 text=f"Git log:\n{result}"
@@ -170,9 +514,12 @@ async def handle_tool_call(tool_name: str, arguments: Dict[str, Any]) -> List[Te
             current_only = arguments.get("current", False)
             
             if current_only:
-                result = run_git_command(repo_root, ["branch", "--show-current"])
+                branch = ctx.current_branch()
+                result = f"{branch}\n" if branch else ""
             else:
-                result = run_git_command(repo_root, ["branch", "-a"])
+                result = ctx.list_branches()
+                if result is None:
+                    result = await run_git_command(repo_root, ["branch", "-a"])
             
             return [TextContent(
                 type="text",
@@ -192,29 +539,120 @@ async def handle_tool_call(tool_name: str, arguments: Dict[str, Any]) -> List[Te
         )]
 
 def find_git_root(start_path: Path = None) -> Path:
-    """Find the git repository root by walking up the directory tree"""
-    if start_path is None:
-        start_path = Path.cwd()
-    
-    current = Path(start_path).resolve()
-    
-    while current != current.parent:
-        if (current / ".git").exists():
-            return current
-        current = current.parent
-    
-    return None
+    """Find the git repository root (worktree) for start_path or the cwd"""
+    from git_mcp.repo import get_repo_context
+
+    ctx = get_repo_context(start_path)
+    return ctx.worktree if ctx else None
+
+async def workspace_report(tool_name: str, ctx: RepoContext, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a status/log/branch query across the workspace around ``ctx``"""
+    from git_mcp.log import LogUnsupported
+    from git_mcp.objects import ObjectStoreError
+    from git_mcp.workspace import discover_workspace, fan_out, workspace_root
+
+    root = workspace_root(ctx)
+    repos = discover_workspace(root, siblings=arguments.get("siblings", True))
+
+    async def query(repo: RepoContext) -> Any:
+        if tool_name == "git_status":
+            return (await git_status_porcelain(repo)).splitlines()
+        if tool_name == "git_log":
+            log_arguments = {k: v for k, v in arguments.items() if k != "cursor"}
+            try:
+                start = await resolve_log_start(repo, log_arguments)
+                commits, _, abbrev = await asyncio.to_thread(walk_log, repo, log_arguments, start)
+            except (LogUnsupported, ObjectStoreError):
+                return (await run_git_command(repo.worktree, git_log_args(log_arguments))).splitlines()
+            return [c.to_dict(abbrev) for c in commits]
+        if arguments.get("current", False):
+            return repo.current_branch()
+        branches = repo.list_branches()
+        if branches is None:
+            branches = await run_git_command(repo.worktree, ["branch", "-a"])
+        return branches.splitlines()
 
-def run_git_command(repo_root: Path, args: List[str]) -> str:
-    """Run a git command and return the output"""
+    report = await fan_out(repos, query)
+    report["root"] = str(root.worktree)
+    return report
+
+async def resolve_log_start(ctx: RepoContext, arguments: Dict[str, Any]) -> Optional[str]:
+    """The commit a git_log call starts from (None for HEAD on an unborn branch, or with a cursor).
+
+    Branches, tags and full oids are resolved in-process; anything else
+    (short oids, ``HEAD~2``, ``tag^``) by ``git rev-parse``.
+    """
+    from git_mcp.runner import GitCommandError
+
+    if arguments.get("cursor"):
+        return None
+    ref = arguments.get("ref") or "HEAD"
+    oid = await asyncio.to_thread(ctx.resolve_revision, ref)
+    if oid is not None or ref == "HEAD":
+        return oid
     try:
-        result = subprocess.run(
-            ["git"] + args,
-            cwd=repo_root,
-            capture_output=True,
-            text=True,
-            check=True
+        output = await run_git_command(
+            ctx.worktree, ["rev-parse", "--verify", "--quiet", "--end-of-options", f"{ref}^{{commit}}"]
         )
-        return result.stdout
-    except subprocess.CalledProcessError as e:
-        raise Exception(f"Git command failed: {e.stderr}")
+    except GitCommandError:
+        raise ValueError(f"Unknown revision: {ref}") from None
+    return output.strip()
+
+def walk_log(ctx: RepoContext, arguments: Dict[str, Any], start_oid: Optional[str] = None):
+    """Run the in-process commit walker for a git_log call, from ``start_oid`` (see resolve_log_start)"""
+    from git_mcp.log import LogFilters, parse_date
+
+    filters = LogFilters(
+        path=arguments.get("path"),
+        author=arguments.get("author"),
+        since=parse_date(arguments["since"]) if arguments.get("since") else None,
+        until=parse_date(arguments["until"]) if arguments.get("until") else None,
+        grep=arguments.get("grep"),
+    )
+    ref = arguments.get("ref") or "HEAD"
+    walker = ctx.commit_walker
+    start = []
+    if not arguments.get("cursor"):
+        if start_oid is None:
+            return [], None, walker.abbrev_length()
+        start = [bytes.fromhex(start_oid)]
+    commits, next_cursor = walker.walk(
+        start,
+        arguments.get("limit", 10),
+        filters,
+        cursor=arguments.get("cursor"),
+        start_names=[ref],
+    )
+    return commits, next_cursor, walker.abbrev_length()
+
+def git_log_args(arguments: Dict[str, Any]) -> List[str]:
+    """Build the `git log` command used when the walker cannot be used"""
+    cmd = ["log", f"-{arguments.get('limit', 10)}", "--regexp-ignore-case"]
+    if arguments.get("oneline", True):
+        cmd.append("--oneline")
+    for key in ("author", "since", "until", "grep"):
+        if arguments.get(key):
+            cmd.append(f"--{key}={arguments[key]}")
+    if arguments.get("ref"):
+        # A ref such as "--output=file" must not be taken for an option
+        cmd += ["--end-of-options", arguments["ref"]]
+    if arguments.get("path"):
+        cmd += ["--", arguments["path"]]
+    return cmd
+
+async def git_status_porcelain(ctx: RepoContext) -> str:
+    """Return `git status --porcelain` output, computed in-process when possible"""
+    from git_mcp.status import StatusUnsupported
+
+    if STATUS_ENGINE != "cli":
+        try:
+            return await asyncio.to_thread(ctx.status_engine.porcelain)
+        except StatusUnsupported:
+            pass
+    return await run_git_command(ctx.worktree, ["status", "--porcelain"])
+
+async def run_git_command(repo_root: Path, args: List[str], timeout: Optional[float] = None) -> str:
+    """Run a git command without blocking the event loop and return the output"""
+    from git_mcp.runner import get_runner
+
+    return await get_runner().run(repo_root, args, timeout=timeout)
@@ -0,0 +1,298 @@
+"""Optional inotify watcher that keeps the set of worktree paths changed since the last status"""
+
+import ctypes
+import ctypes.util
+import errno
+import itertools
+import os
+import select
+import struct
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+
+from git_mcp.ignore import IgnoreMatcher
+
+WATCH_ENABLED = os.getenv("GIT_MCP_WATCH", "0").lower() in ("1", "true", "yes", "on")
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+# Stamps for WorktreeWatcher.generation(), unique across watchers
+_generations = itertools.count(1)
+
+_WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_DONT_FOLLOW
+)
+_ENTRY_EVENTS = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+class WatchUnavailable(Exception):
+    """Raised when inotify cannot be used (non-Linux, no libc support, watch limit)"""
+
+
+@dataclass
+class WatchDelta:
+    """What changed in the worktree since the previous ``take()``.
+
+    ``paths`` holds worktree-relative entries that saw events; a directory
+    entry stands for everything below it. ``structure`` is set when a
+    non-ignored entry was created, deleted or renamed (untracked files may
+    differ). ``full`` means events were lost and the caller must rescan.
+    """
+
+    paths: Set[bytes] = field(default_factory=set)
+    structure: bool = False
+    full: bool = False
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        raise WatchUnavailable("inotify is only available on Linux")
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    try:
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    except AttributeError as e:
+        raise WatchUnavailable(f"libc has no inotify support: {e}")
+    return libc
+
+
+class WorktreeWatcher:
+    """Watches every non-ignored directory of a worktree with inotify.
+
+    A daemon thread drains the inotify queue so it does not overflow between
+    status calls; ``take()`` drains whatever is still pending and hands over
+    the accumulated delta. Directories excluded by ``.gitignore`` are not
+    watched (unless they hold tracked files), ``.git`` and nested repositories
+    are skipped, and events for ignored files do not count as structure
+    changes. A queue overflow, or an edit to a ``.gitignore`` file, makes the
+    next delta ``full`` and re-synchronises the watch list.
+    """
+
+    def __init__(self, worktree: Path, git_dir: Path, excludes_file: Optional[Path] = None):
+        self.worktree = Path(worktree)
+        self._root = os.fsencode(self.worktree)
+        self._libc = _load_libc()
+        self._ignore = IgnoreMatcher(self.worktree, git_dir, excludes_file=excludes_file)
+        self._lock = threading.Lock()
+        self._fd = -1
+        self._wds: Dict[int, bytes] = {}
+        self._dirs: Dict[bytes, int] = {}
+        self._tracked_dirs: Set[bytes] = set()
+        self._delta = WatchDelta(full=True)
+        self._generation = next(_generations)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.failed: Optional[str] = None
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self, tracked_dirs: Iterable[bytes] = ()) -> None:
+        """Watch the worktree and start the draining thread"""
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise WatchUnavailable(f"inotify_init1 failed: {os.strerror(ctypes.get_errno())}")
+        self._fd = fd
+        with self._lock:
+            self._tracked_dirs = set(tracked_dirs)
+            self._ignore.begin_pass()
+            self._watch_tree(b"")
+        if self.failed:
+            self.close()
+            raise WatchUnavailable(self.failed)
+        self._thread = threading.Thread(target=self._run, name="git-mcp-watch", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the thread and release the inotify descriptor"""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        with self._lock:
+            if self._fd >= 0:
+                os.close(self._fd)
+                self._fd = -1
+            self._wds.clear()
+            self._dirs.clear()
+
+    @property
+    def alive(self) -> bool:
+        return self._fd >= 0 and self.failed is None
+
+    def _run(self) -> None:
+        poller = select.poll()
+        poller.register(self._fd, select.POLLIN)
+        while not self._stop.is_set():
+            try:
+                ready = poller.poll(500)
+            except OSError:
+                break
+            if ready:
+                with self._lock:
+                    self._drain()
+
+    # -- watches -----------------------------------------------------------
+
+    def track(self, tracked_dirs: Iterable[bytes]) -> None:
+        """Make sure directories holding tracked files are watched, even if ignored"""
+        with self._lock:
+            self._tracked_dirs = set(tracked_dirs)
+            for rel in sorted(self._tracked_dirs - set(self._dirs)):
+                parent = rel.rpartition(b"/")[0]
+                if parent in self._dirs:
+                    self._watch_tree(rel)
+
+    def _add_watch(self, rel: bytes) -> bool:
+        path = self._root + b"/" + rel if rel else self._root
+        wd = self._libc.inotify_add_watch(self._fd, path, _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                self.failed = "inotify watch limit reached (fs.inotify.max_user_watches)"
+            return False
+        old = self._wds.get(wd)
+        if old is not None and old != rel:
+            self._dirs.pop(old, None)
+        self._wds[wd] = rel
+        self._dirs[rel] = wd
+        return True
+
+    def _watch_tree(self, rel: bytes) -> None:
+        """Watch ``rel`` and every directory below it that is not ignored"""
+        stack = [rel]
+        while stack and not self.failed:
+            current = stack.pop()
+            if not self._add_watch(current):
+                continue
+            full = self._root + b"/" + current if current else self._root
+            try:
+                with os.scandir(full) as it:
+                    children = [e.name for e in it if e.is_dir(follow_symlinks=False)]
+            except OSError:
+                continue
+            for name in children:
+                if name == b".git":
+                    continue
+                child = current + b"/" + name if current else name
+                if os.path.lexists(self._root + b"/" + child + b"/.git"):
+                    continue
+                if child not in self._tracked_dirs and self._ignore.is_ignored(os.fsdecode(child), True):
+                    continue
+                stack.append(child)
+
+    def _unwatch_tree(self, rel: bytes) -> None:
+        """Forget watches for ``rel`` and below (the directory moved away)"""
+        prefix = rel + b"/"
+        for path in [p for p in self._dirs if p == rel or p.startswith(prefix)]:
+            wd = self._dirs.pop(path)
+            self._wds.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    # -- events ------------------------------------------------------------
+
+    def _drain(self) -> None:
+        """Read and apply every queued event; caller holds the lock"""
+        if self._fd < 0:
+            return
+        self._ignore.begin_pass()
+        while True:
+            try:
+                buf = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                return
+            except OSError as e:
+                self.failed = f"inotify read failed: {e}"
+                return
+            pos = 0
+            while pos < len(buf):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(buf, pos)
+                name = buf[pos + _EVENT_HEADER.size:pos + _EVENT_HEADER.size + length].rstrip(b"\0")
+                pos += _EVENT_HEADER.size + length
+                self._apply(wd, mask, name)
+
+    def _apply(self, wd: int, mask: int, name: bytes) -> None:
+        self._generation = next(_generations)
+        delta = self._delta
+        if mask & IN_Q_OVERFLOW:
+            delta.full = True
+            return
+        if mask & IN_IGNORED:
+            rel = self._wds.pop(wd, None)
+            if rel is not None and self._dirs.get(rel) == wd:
+                del self._dirs[rel]
+            return
+        base = self._wds.get(wd)
+        if base is None or not name:
+            return
+        rel = base + b"/" + name if base else name
+        delta.paths.add(rel)
+        if name == b".gitignore":
+            # Ignore rules changed: watched directories and untracked files may differ
+            delta.full = True
+            return
+        if not mask & _ENTRY_EVENTS:
+            return
+        is_dir = bool(mask & IN_ISDIR)
+        if rel in self._tracked_dirs or not self._ignore.is_ignored(os.fsdecode(rel), is_dir):
+            delta.structure = True
+        if is_dir and mask & (IN_DELETE | IN_MOVED_FROM):
+            self._unwatch_tree(rel)
+        elif is_dir and mask & (IN_CREATE | IN_MOVED_TO):
+            if not os.path.lexists(self._root + b"/" + rel + b"/.git") and (
+                    rel in self._tracked_dirs or not self._ignore.is_ignored(os.fsdecode(rel), True)):
+                self._watch_tree(rel)
+
+    def generation(self) -> Optional[int]:
+        """A value that changes on every event, without consuming the delta; None if the watcher stopped working"""
+        with self._lock:
+            self._drain()
+            return self._generation if self.alive else None
+
+    def take(self) -> Optional[WatchDelta]:
+        """Return the changes since the previous call, or None if the watcher stopped working"""
+        with self._lock:
+            self._drain()
+            if not self.alive:
+                return None
+            delta = self._delta
+            self._delta = WatchDelta()
+            if delta.full:
+                self._ignore.begin_pass()
+                self._watch_tree(b"")
+                if not self.alive:
+                    return None
+            return delta
+
+
+def create_watcher(worktree: Path, git_dir: Path, excludes_file: Optional[Path] = None,
+                   tracked_dirs: Iterable[bytes] = ()) -> Optional[WorktreeWatcher]:
+    """Start a watcher for ``worktree``; None when inotify is unavailable"""
+    try:
+        watcher = WorktreeWatcher(worktree, git_dir, excludes_file)
+        watcher.start(tracked_dirs)
+    except (WatchUnavailable, OSError) as e:
+        print(f"git-mcp: file watcher disabled: {e}", file=sys.stderr)
+        return None
+    return watcher
@@ -0,0 +1,145 @@
+"""Workspace mode: discover submodules, nested and sibling repositories and query them concurrently"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from git_mcp.config import ConfigUnsupported, parse_config
+from git_mcp.repo import RepoContext, get_repo_context
+from git_mcp.runner import DEFAULT_MAX_PROCS
+
+# Upper bound on repositories queried in one workspace call
+MAX_REPOS = int(os.getenv("GIT_MCP_WORKSPACE_MAX_REPOS", "64"))
+
+# How deep below the root worktree nested repositories are looked for
+MAX_DEPTH = int(os.getenv("GIT_MCP_WORKSPACE_DEPTH", "3"))
+
+# Directories that never hold repositories worth reporting and are expensive to walk
+_SKIP_DIRS = {".git", "node_modules", ".venv", "venv", "__pycache__", ".tox", ".mypy_cache"}
+
+
+@dataclass
+class WorkspaceRepo:
+    """A repository that is part of the workspace"""
+
+    path: Path
+    name: str
+    kind: str  # "root", "submodule", "nested" or "sibling"
+
+
+def submodule_paths(worktree: Path) -> List[str]:
+    """Return the submodule paths declared in ``.gitmodules``"""
+    values: Dict[str, str] = {}
+    try:
+        parse_config((worktree / ".gitmodules").read_text(encoding="utf-8", errors="replace"), values)
+    except (OSError, ConfigUnsupported):
+        return []
+    return [value.strip("/") for key, value in values.items() if key.startswith("submodule.") and key.endswith(".path")]
+
+
+def _is_repo(path: Path) -> bool:
+    return os.path.lexists(path / ".git")
+
+
+def discover_workspace(root: RepoContext, siblings: bool = True, max_depth: int = MAX_DEPTH) -> List[WorkspaceRepo]:
+    """Find the repositories around ``root``: itself, submodules, nested and sibling repos"""
+    repos = [WorkspaceRepo(root.worktree, ".", "root")]
+    seen = {root.worktree.resolve()}
+
+    def add(path: Path, kind: str) -> None:
+        resolved = path.resolve()
+        if resolved in seen or len(repos) >= MAX_REPOS:
+            return
+        seen.add(resolved)
+        name = os.path.relpath(path, root.worktree)
+        repos.append(WorkspaceRepo(path, name, kind))
+
+    # Submodules are reported even when deeper than max_depth
+    declared = set()
+    pending = [root.worktree]
+    while pending:
+        worktree = pending.pop()
+        for rel in submodule_paths(worktree):
+            path = worktree / rel
+            if _is_repo(path):
+                declared.add(path.resolve())
+                add(path, "submodule")
+                pending.append(path)
+
+    level = [root.worktree]
+    for _ in range(max_depth):
+        next_level = []
+        for directory in level:
+            try:
+                with os.scandir(directory) as it:
+                    children = sorted(e.name for e in it if e.is_dir(follow_symlinks=False) and e.name not in _SKIP_DIRS)
+            except OSError:
+                continue
+            for name in children:
+                path = directory / name
+                if _is_repo(path) and path.resolve() not in declared:
+                    add(path, "nested")
+                next_level.append(path)
+        level = next_level
+
+    if siblings:
+        parent = root.worktree.parent
+        try:
+            with os.scandir(parent) as it:
+                names = sorted(e.name for e in it if e.is_dir(follow_symlinks=False))
+        except OSError:
+            names = []
+        for name in names:
+            path = parent / name
+            if path != root.worktree and _is_repo(path):
+                add(path, "sibling")
+    return repos
+
+
+async def fan_out(
+    repos: List[WorkspaceRepo],
+    query: Callable[[RepoContext], Awaitable[Any]],
+    max_workers: int = DEFAULT_MAX_PROCS,
+) -> Dict[str, Any]:
+    """Run ``query`` for every repository, at most ``max_workers`` at a time.
+
+    Each entry records the repository, its result or error and how long it
+    took; one failing repository does not fail the whole call.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+    started = time.perf_counter()
+
+    async def one(repo: WorkspaceRepo) -> Dict[str, Any]:
+        async with semaphore:
+            began = time.perf_counter()
+            entry: Dict[str, Any] = {"repo": repo.name, "kind": repo.kind}
+            try:
+                ctx = get_repo_context(repo.path)
+                if ctx is None:
+                    raise RuntimeError("Not a git repository")
+                entry["branch"] = ctx.current_branch() or None
+                entry["result"] = await query(ctx)
+            except Exception as e:
+                entry["error"] = str(e)
+            entry["ms"] = round((time.perf_counter() - began) * 1000, 2)
+            return entry
+
+    results = await asyncio.gather(*(one(repo) for repo in repos))
+    return {
+        "repos": list(results),
+        "total_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def workspace_root(ctx: RepoContext) -> Optional[RepoContext]:
+    """Return the outermost repository when ``ctx`` is itself a submodule, else ``ctx``"""
+    current = ctx
+    while True:
+        parent = get_repo_context(current.worktree.parent)
+        if parent is None or current.worktree.resolve() not in {
+                (parent.worktree / rel).resolve() for rel in submodule_paths(parent.worktree)}:
+            return current
+        current = parent
@@ -0,0 +1,78 @@
+"""Benchmark: plumbing commit pipeline vs `git status` + `git add -A` + `git commit`.
+
+Usage:
+    uv run python scripts/bench_commit.py [--synthetic N] [--iterations K]
+
+A throwaway repository with N committed files is created; each iteration
+modifies a few files and commits them with both approaches.
+"""
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Allow importing git_mcp when run as script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from git_mcp.commit import create_commit
+from git_mcp.repo import RepoContext
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from bench_status import make_synthetic_repo  # noqa: E402
+
+
+def touch_files(root: Path, files: int, round_no: int) -> None:
+    for i in range(0, files, max(1, files // 5)):
+        (root / f"d{i % 100:02d}" / f"e{i % 7}" / f"f{i}.txt").write_text(f"round {round_no} {i}\n")
+    (root / f"new{round_no}.txt").write_text("new\n")
+
+
+def cli_commit(root: Path, message: str) -> None:
+    def git(*args: str) -> None:
+        subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+    git("status", "--porcelain")
+    git("add", "-A")
+    git("-c", "user.name=bench", "-c", "user.email=bench@example.com", "commit", "-m", message)
+
+
+async def run(root: Path, files: int, iterations: int) -> None:
+    subprocess.run(["git", "config", "user.name", "bench"], cwd=root, check=True)
+    subprocess.run(["git", "config", "user.email", "bench@example.com"], cwd=root, check=True)
+    ctx = RepoContext.discover(root)
+    cli_samples, pipeline_samples = [], []
+    last_timings = {}
+    for i in range(iterations):
+        touch_files(root, files, 2 * i)
+        start = time.perf_counter()
+        cli_commit(root, f"cli {i}")
+        cli_samples.append(time.perf_counter() - start)
+
+        touch_files(root, files, 2 * i + 1)
+        start = time.perf_counter()
+        result = await create_commit(ctx, f"pipeline {i}")
+        pipeline_samples.append(time.perf_counter() - start)
+        last_timings = result.timings
+
+    print(f"Repository: {root}  ({files} tracked files)")
+    print(f"status + add -A + commit : median {statistics.median(cli_samples) * 1000:8.2f} ms")
+    print(f"commit pipeline          : median {statistics.median(pipeline_samples) * 1000:8.2f} ms")
+    print("last pipeline stages     : " + ", ".join(f"{k} {v * 1000:.1f}ms" for k, v in last_timings.items()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--synthetic", type=int, default=20000, help="Create a synthetic repo with N files")
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_synthetic_repo(Path(tmp), args.synthetic)
+        asyncio.run(run(Path(tmp), args.synthetic, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark: in-process status engine vs `git status --porcelain`.
+
+Usage:
+    uv run python scripts/bench_status.py [--repo PATH] [--synthetic N] [--iterations K] [--watch]
+
+With --synthetic, a throwaway repository with N committed files (spread over
+nested directories) is created in a temporary directory and a handful of
+files are modified, so both paths have real work to do. --watch enables the
+inotify watcher, so warm calls only re-check paths that changed.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Allow importing git_mcp when run as script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from git_mcp.status import StatusEngine, StatusUnsupported
+
+
+def make_synthetic_repo(root: Path, files: int) -> None:
+    """Create a repository with ``files`` committed files and a few changes"""
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    for i in range(files):
+        d = root / f"d{i % 100:02d}" / f"e{i % 7}"
+        d.mkdir(parents=True, exist_ok=True)
+        (d / f"f{i}.txt").write_text(f"file {i}\n")
+    subprocess.run(["git", "add", "-A"], cwd=root, check=True)
+    subprocess.run(
+        ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com",
+         "commit", "-qm", "synthetic"],
+        cwd=root, check=True,
+    )
+    time.sleep(2.1)  # move past the racy-timestamp window
+    for i in range(0, files, max(1, files // 10)):
+        (root / f"d{i % 100:02d}" / f"e{i % 7}" / f"f{i}.txt").write_text(f"changed {i}\n")
+    (root / "untracked.txt").write_text("new\n")
+
+
+def time_calls(fn, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def fmt(samples: list) -> str:
+    return f"median {statistics.median(samples) * 1000:8.2f} ms   min {min(samples) * 1000:8.2f} ms"
+
+
+def run(repo: Path, iterations: int, watch: bool = False) -> None:
+    def cli() -> str:
+        return subprocess.run(
+            ["git", "--no-optional-locks", "status", "--porcelain"], cwd=repo, capture_output=True, check=True, text=True
+        ).stdout
+
+    engine = StatusEngine(repo, repo / ".git", watch=watch)
+    start = time.perf_counter()
+    try:
+        first = engine.porcelain()
+    except StatusUnsupported as e:
+        print(f"Engine falls back to the CLI for this repository: {e}")
+        return
+    cold = time.perf_counter() - start
+
+    expected = cli()
+    tracked = len(engine._index_paths)
+    print(f"Repository: {repo}  ({tracked} tracked files, {len(first.splitlines())} status lines)")
+    print(f"Outputs match: {first == expected}")
+    print(f"git status --porcelain : {fmt(time_calls(cli, iterations))}")
+    print(f"engine (cold)          : {cold * 1000:8.2f} ms   hashed {engine.hashed} files")
+    hashed_before = engine.hashed
+    print(f"engine (warm)          : {fmt(time_calls(engine.porcelain, iterations))}"
+          f"   re-hashed {engine.hashed - hashed_before} files"
+          + (f", {engine.incremental} incremental calls" if watch else ""))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repo", type=Path, default=None, help="Repository to benchmark (default: cwd)")
+    parser.add_argument("--synthetic", type=int, default=0, help="Create a synthetic repo with N files")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--watch", action="store_true", help="Use the inotify watcher")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        with tempfile.TemporaryDirectory() as tmp:
+            make_synthetic_repo(Path(tmp), args.synthetic)
+            run(Path(tmp), args.iterations, args.watch)
+    else:
+        run((args.repo or Path(os.getcwd())).resolve(), args.iterations, args.watch)
+
+
+if __name__ == "__main__":
+    main()
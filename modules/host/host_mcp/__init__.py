@@ -0,0 +1,3 @@
+"""MCP Host - Serves several modules' MCP tools from one process"""
+
+__version__ = "0.1.0"
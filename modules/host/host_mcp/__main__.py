@@ -0,0 +1,7 @@
+"""Entry point for the MCP host"""
+
+from host_mcp.server import main
+import asyncio
+
+if __name__ == "__main__":
+    asyncio.run(main())
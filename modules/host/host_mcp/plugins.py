@@ -0,0 +1,129 @@
+"""Plugin loading and the namespaced tool registry.
+
+A plugin is a module's ``tools`` module (``git_mcp.tools``,
+``bridge.tools``): it provides ``get_tools()`` and an async
+``handle_tool_call(name, arguments)``, the same two functions its own
+stdio server is built on. Each plugin gets a namespace; its tools are
+exposed as ``<namespace>_<tool>`` unless the name already starts with
+that prefix (``git_status`` stays ``git_status``).
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from mcp.types import TextContent, Tool
+
+# The modules directory this package was installed from (modules/host/host_mcp -> modules)
+MODULES_DIR = Path(__file__).resolve().parent.parent.parent
+
+# namespace=module pairs, comma separated
+DEFAULT_PLUGINS = "git=git_mcp.tools,autotask=bridge.tools"
+
+# Source directories of the default plugins, relative to MODULES_DIR
+DEFAULT_PATHS = ("git", "autotask/bridge")
+
+
+class PluginError(RuntimeError):
+    """Raised when a plugin cannot be loaded or its tool names clash"""
+
+
+@dataclass
+class Plugin:
+    namespace: str
+    module: str
+    get_tools: Callable[[], List[Tool]]
+    handle_tool_call: Callable[[str, Dict[str, Any]], Awaitable[List[TextContent]]]
+
+
+def parse_plugins(spec: str) -> List[Tuple[str, str]]:
+    """``"git=git_mcp.tools,autotask=bridge.tools"`` -> [(namespace, module), ...]"""
+    plugins = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        namespace, sep, module = item.partition("=")
+        if not sep or not namespace.strip() or not module.strip():
+            raise PluginError(f"Invalid plugin entry {item!r}; expected namespace=package.tools")
+        plugins.append((namespace.strip(), module.strip()))
+    namespaces = [n for n, _ in plugins]
+    if len(set(namespaces)) != len(namespaces):
+        raise PluginError(f"Duplicate plugin namespaces in {spec!r}")
+    return plugins
+
+
+def plugin_paths(spec: Optional[str] = None) -> List[Path]:
+    """Directories to import plugins from: ``MCP_HOST_PATH`` (os.pathsep separated) or the default modules"""
+    if spec:
+        return [Path(p).expanduser().resolve() for p in spec.split(os.pathsep) if p]
+    return [MODULES_DIR / p for p in DEFAULT_PATHS]
+
+
+def load_plugin(namespace: str, module: str) -> Plugin:
+    try:
+        loaded = importlib.import_module(module)
+    except Exception as e:
+        raise PluginError(f"Cannot import {module} for {namespace!r}: {e}") from e
+    get_tools = getattr(loaded, "get_tools", None)
+    handle_tool_call = getattr(loaded, "handle_tool_call", None)
+    if not callable(get_tools) or not callable(handle_tool_call):
+        raise PluginError(f"{module} does not provide get_tools() and handle_tool_call()")
+    return Plugin(namespace, module, get_tools, handle_tool_call)
+
+
+def load_plugins(spec: str, paths: List[Path]) -> Tuple[List[Plugin], List[str]]:
+    """Import every plugin in ``spec``; returns the loaded plugins and an error per plugin that failed"""
+    for path in reversed(paths):
+        if path.is_dir() and str(path) not in sys.path:
+            sys.path.insert(0, str(path))
+    plugins, errors = [], []
+    for namespace, module in parse_plugins(spec):
+        try:
+            plugins.append(load_plugin(namespace, module))
+        except PluginError as e:
+            errors.append(str(e))
+    return plugins, errors
+
+
+class ToolRegistry:
+    """Every plugin's tools under namespaced names, and dispatch of calls to the owning plugin"""
+
+    def __init__(self, plugins: List[Plugin]):
+        self.plugins = plugins
+        # Exposed name -> (plugin, the plugin's own tool name); filled with the tool list
+        self._routes: Dict[str, Tuple[Plugin, str]] = {}
+        self._tools: Optional[List[Tool]] = None
+
+    @staticmethod
+    def exposed_name(namespace: str, tool: str) -> str:
+        prefix = f"{namespace}_"
+        return tool if tool.startswith(prefix) else prefix + tool
+
+    def tools(self) -> List[Tool]:
+        """All tools, renamed into their namespaces (built once)"""
+        if self._tools is None:
+            tools, routes = [], {}
+            for plugin in self.plugins:
+                for tool in plugin.get_tools():
+                    name = self.exposed_name(plugin.namespace, tool.name)
+                    if name in routes:
+                        other = routes[name][0]
+                        raise PluginError(f"Tool {name!r} is provided by both {other.module} and {plugin.module}")
+                    routes[name] = (plugin, tool.name)
+                    tools.append(tool.model_copy(update={"name": name}))
+            self._tools, self._routes = tools, routes
+        return self._tools
+
+    async def call(self, name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+        self.tools()
+        route = self._routes.get(name)
+        if route is None:
+            return [TextContent(type="text", text=f"Unknown tool: {name}")]
+        plugin, tool = route
+        return await plugin.handle_tool_call(tool, arguments)
@@ -0,0 +1,55 @@
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from mcp.server import Server
+from mcp.server.stdio import stdio_server
+from mcp.types import CallToolResult
+from host_mcp.plugins import DEFAULT_PLUGINS, ToolRegistry, load_plugins, plugin_paths
+
+# Worker threads shared by every plugin's asyncio.to_thread / run_in_executor(None) calls
+HOST_THREADS = int(os.getenv("MCP_HOST_THREADS", "0")) or min(32, (os.cpu_count() or 1) + 4)
+
+def build_server(registry: ToolRegistry) -> Server:
+    """An MCP server exposing the registry's tools"""
+    server = Server("mcp-host")
+
+    @server.list_tools()
+    async def list_tools() -> list:
+        """List the tools of every loaded plugin"""
+        return registry.tools()
+
+    @server.call_tool()
+    async def call_tool(name: str, arguments: dict) -> CallToolResult:
+        """Route a tool call to the plugin that owns it"""
+        contents = await registry.call(name, arguments)
+        return CallToolResult(
+            content=contents
+        )
+
+    return server
+
+async def main():
+    """Load the plugins and serve them all over one stdio connection"""
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=HOST_THREADS, thread_name_prefix="mcp-host")
+    )
+    plugins, errors = load_plugins(
+        os.getenv("MCP_HOST_PLUGINS", DEFAULT_PLUGINS),
+        plugin_paths(os.getenv("MCP_HOST_PATH")),
+    )
+    # A plugin that fails to load is left out rather than taking the others down
+    for error in errors:
+        print(f"mcp-host: {error}", file=sys.stderr)
+    registry = ToolRegistry(plugins)
+    registry.tools()  # clashing tool names fail here rather than on the first list_tools
+    server = build_server(registry)
+    async with stdio_server() as (read_stream, write_stream):
+        await server.run(
+            read_stream,
+            write_stream,
+            server.create_initialization_options()
+        )
+
+if __name__ == "__main__":
+    asyncio.run(main())
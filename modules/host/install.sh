@@ -0,0 +1,33 @@
+#!/bin/bash
+
+# Host module installation script
+# Points the host MCP config at this module and replaces the separate
+# git and autotask servers with it
+
+PROJECT_ROOT="$1"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# Calculate relative path from project root to this module
+RELATIVE_PATH=$(realpath --relative-to="$PROJECT_ROOT" "$SCRIPT_DIR" 2>/dev/null || \
+                python3 -c "import os; print(os.path.relpath('$SCRIPT_DIR', '$PROJECT_ROOT'))" 2>/dev/null || \
+                echo ".cursor/cursor_workflow/modules/host")
+
+echo "   📍 MCP host path: $RELATIVE_PATH"
+
+# Update mcp.json if jq is available: set the path (args[2] is the --directory
+# value), keep the autotask server's environment, drop the servers the host replaces
+MCP_CONFIG="$PROJECT_ROOT/.cursor/mcp.json"
+if [ -f "$MCP_CONFIG" ] && command -v jq &> /dev/null; then
+    jq --arg path "$RELATIVE_PATH" \
+       'if .mcpServers.host then
+            .mcpServers.host.args[2] = $path
+            | .mcpServers.host.env = ((.mcpServers.host.env // {}) + (.mcpServers.autotask.env // {}))
+            | del(.mcpServers.git, .mcpServers.autotask)
+        else . end' \
+       "$MCP_CONFIG" > "$MCP_CONFIG.tmp" && mv "$MCP_CONFIG.tmp" "$MCP_CONFIG"
+    echo "   ✅ Updated MCP config: host replaces the git and autotask servers"
+else
+    echo "   ⚠️  Please manually update .cursor/mcp.json:"
+    echo "      Set mcpServers.host.args[2] to: $RELATIVE_PATH"
+    echo "      and remove mcpServers.git and mcpServers.autotask"
+fi
@@ -0,0 +1,119 @@
+"""Benchmark: one host process vs a server per module, startup time and resident memory.
+
+Usage:
+    uv run python scripts/bench_host.py [--iterations K] [--python PATH]
+
+For each layout, spawns the servers the way Cursor does (all at once), sends
+initialize, the initialized notification and tools/list to each over stdio,
+and measures the time from spawn until every server has listed its tools,
+then the resident memory (VmRSS, Linux only) of every process at that
+point. "separate" is ``python -m git_mcp`` plus ``python -m bridge``;
+"host" is ``python -m host_mcp`` loading both as plugins. Then one tool
+call (git_branch) is timed on the warm server. Bytecode caches are warmed
+by one untimed run first.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MODULES = ROOT.parent
+
+LAYOUTS = {
+    "separate": [("git_mcp", MODULES / "git"), ("bridge", MODULES / "autotask" / "bridge")],
+    "host": [("host_mcp", ROOT)],
+}
+
+REQUESTS = [
+    {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "bench-host", "version": "0"},
+    }},
+    {"jsonrpc": "2.0", "method": "notifications/initialized"},
+    {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+]
+
+
+def rss_kb(pid: int) -> int:
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def read_reply(proc: subprocess.Popen, request_id: int) -> dict:
+    for line in proc.stdout:
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            if "error" in message:
+                raise RuntimeError(f"request {request_id} failed: {message['error']}")
+            return message["result"]
+    raise RuntimeError(f"server exited with {proc.wait()} before answering request {request_id}")
+
+
+def start_once(python: str, layout: str) -> tuple:
+    """Spawn a layout; returns (seconds until all listed their tools, total RSS in KB, tool count, call seconds)"""
+    start = time.perf_counter()
+    procs = []
+    for module, cwd in LAYOUTS[layout]:
+        env = dict(os.environ, PYTHONPATH=str(cwd))
+        procs.append(subprocess.Popen(
+            [python, "-m", module], cwd=cwd, env=env,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        ))
+    try:
+        for proc in procs:
+            proc.stdin.write("".join(json.dumps(r) + "\n" for r in REQUESTS))
+            proc.stdin.flush()
+        tools = sum(len(read_reply(proc, 2)["tools"]) for proc in procs)
+        listed = time.perf_counter() - start
+        rss = sum(rss_kb(proc.pid) for proc in procs)
+        # A tool call on the process that serves git
+        proc = procs[0]
+        call = {"jsonrpc": "2.0", "id": 3, "method": "tools/call",
+                "params": {"name": "git_branch", "arguments": {}}}
+        called = time.perf_counter()
+        proc.stdin.write(json.dumps(call) + "\n")
+        proc.stdin.flush()
+        read_reply(proc, 3)
+        return listed, rss, tools, time.perf_counter() - called
+    finally:
+        for proc in procs:
+            proc.kill()
+            proc.wait()
+
+
+def fmt(samples: list) -> str:
+    return f"median {statistics.median(samples) * 1000:8.1f} ms   min {min(samples) * 1000:8.1f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--python", default=sys.executable, help="Interpreter to start the servers with")
+    args = parser.parse_args()
+
+    for layout in LAYOUTS:
+        start_once(args.python, layout)  # warm the bytecode cache
+    print(f"{args.iterations} cold starts per layout ({args.python}, {os.cpu_count()} CPUs)")
+    for layout, servers in LAYOUTS.items():
+        runs = [start_once(args.python, layout) for _ in range(args.iterations)]
+        rss = statistics.median(r[1] for r in runs)
+        print(f"{layout:>8}: {len(servers)} process(es), {runs[0][2]} tools")
+        print(f"          spawn -> all tools/list : {fmt([r[0] for r in runs])}")
+        print(f"          resident memory         : {rss / 1024:8.1f} MB" if rss else
+              "          resident memory         : n/a (no /proc)")
+        print(f"          first git_branch call   : {fmt([r[3] for r in runs])}")
+
+
+if __name__ == "__main__":
+    main()